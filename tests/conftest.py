@@ -0,0 +1,71 @@
+import random
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from uap_backend.cruds.base import BaseCRUD
+
+_OPERATORS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lte": lambda value, bound: value <= bound,
+}
+
+
+class FakeBackend:
+    """In-memory stand-in for HTTPClient serving one collection
+
+    Supports the ``<field>__gt/__gte/__lte`` range filters, ``sort_by`` (rows with
+    equal sort keys come back in random order) and a ``page_cap`` on ``limit``.
+    Other endpoints answer with the payload set in ``responses``. Once
+    ``fail_after`` list requests were served, the next ones raise.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], page_cap: int = 200, seed: int = 0):
+        self.rows = rows
+        self.page_cap = page_cap
+        self.random = random.Random(seed)
+        self.calls: List[Dict[str, Any]] = []
+        self.responses: Dict[str, Any] = {}
+        self.fail_after: Optional[int] = None
+
+    def _matches(self, row: Dict[str, Any], params: Dict[str, Any]) -> bool:
+        for name, bound in params.items():
+            field, _, operator = name.rpartition("__")
+            if operator in _OPERATORS and not _OPERATORS[operator](row.get(field), bound):
+                return False
+        return True
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        if endpoint in self.responses:
+            return self.responses[endpoint]
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise ConnectionError("backend went away")
+        params = dict(params or {})
+        self.calls.append(params)
+        rows = [row for row in self.rows if self._matches(row, params)]
+        self.random.shuffle(rows)
+        if "sort_by" in params:
+            rows.sort(key=lambda row: row[params["sort_by"]])
+        limit = min(int(params.get("limit", self.page_cap)), self.page_cap)
+        return {"items": [dict(row) for row in rows[:limit]]}
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def make_service():
+    """Build a BaseCRUD subclass whose client is a FakeBackend over ``rows``"""
+    services = []
+
+    def build(rows: List[Dict[str, Any]], page_cap: int = 200, **attributes) -> BaseCRUD:
+        service_class = type("ItemsCRUDService", (BaseCRUD,), attributes)
+        service = service_class("/items/")
+        service._client = FakeBackend(rows, page_cap)
+        services.append(service_class)
+        return service
+
+    yield build
+    for service_class in services:
+        BaseCRUD._instances.pop(service_class, None)
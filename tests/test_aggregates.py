@@ -0,0 +1,152 @@
+import asyncio
+import json
+from typing import Optional
+
+from conftest import FakeBackend
+from pydantic import BaseModel
+
+from uap_backend.cruds.balances import BalanceCRUDService
+from uap_backend.cruds.base import BaseCRUD
+from uap_backend.cruds.transactions import TransactionCRUDService
+from uap_backend.replica.aggregates import MaterializedAggregates
+from uap_backend.webhooks.registry import WebhookRegistry
+
+
+class BalanceOut(BaseModel):
+    id: int
+    user_id: int
+    amount: float
+    identifier: Optional[str] = None
+
+
+class TransactionOut(BaseModel):
+    id: int
+    user_id: int
+    amount: float
+    transaction_type: str
+
+
+class Balances(BalanceCRUDService):
+    @classmethod
+    def _response_model(cls):
+        return BalanceOut
+
+
+class Transactions(TransactionCRUDService):
+    @classmethod
+    def _response_model(cls):
+        return TransactionOut
+
+
+def _services(balances, transactions):
+    balance_service, transaction_service = Balances(), Transactions()
+    balance_service._client = FakeBackend(balances)
+    transaction_service._client = FakeBackend(transactions)
+    return balance_service, transaction_service
+
+
+def _handler(aggregates, scope):
+    return next(handler for name, handler in aggregates._handlers if name == scope)
+
+
+def test_bootstrap_event_reconcile():
+    balances = [
+        {"id": 1, "user_id": 1, "amount": 10.5, "identifier": "main"},
+        {"id": 2, "user_id": 1, "amount": 4.5, "identifier": "bonus"},
+        {"id": 3, "user_id": 2, "amount": 1.0, "identifier": "main"},
+    ]
+    transactions = [
+        {"id": 1, "user_id": 1, "amount": 15.0, "transaction_type": "deposit"},
+        {"id": 2, "user_id": 2, "amount": 1.0, "transaction_type": "deposit"},
+    ]
+    balance_service, transaction_service = _services(balances, transactions)
+    aggregates = MaterializedAggregates(balance_service, transaction_service, reconcile_interval=0)
+    create_handler = None
+
+    async def run():
+        nonlocal create_handler
+        await aggregates.start()
+        create_handler = _handler(aggregates, "transaction.create")
+        try:
+            # The first answer comes from the API and is kept as the template
+            balance_service.client.responses["/user/1/total"] = {"user_id": 1, "total": 15.0}
+            assert await balance_service.get_user_total(1) == {"user_id": 1, "total": 15.0}
+            assert await balance_service.get_user_total(2) == {"user_id": 2, "total": 1.0}
+
+            # The event and the API agree, so reconciliation finds nothing to fix
+            transaction = {"id": 3, "user_id": 2, "amount": 2.5, "transaction_type": "withdrawal"}
+            transactions.append(transaction)
+            await create_handler(transaction)
+            assert await aggregates.reconcile() == 0
+
+            transaction_service.client.responses["/1/summary"] = {
+                "count": 1,
+                "total": 15.0,
+                "by_type": {"deposit": {"count": 1, "total": 15.0}},
+            }
+            await transaction_service.get_user_summary(1)
+            summary = await transaction_service.get_user_summary(2)
+            assert summary == {
+                "count": 2,
+                "total": 3.5,
+                "by_type": {
+                    "deposit": {"count": 1, "total": 1.0},
+                    "withdrawal": {"count": 1, "total": 2.5},
+                },
+            }
+
+            # A change whose event was missed is picked up by reconciliation
+            balances[2] = {**balances[2], "amount": 7.0}
+            assert await aggregates.reconcile() == 1
+            assert aggregates.user_total(2) == {"user_id": 2, "total": 7.0}
+        finally:
+            await aggregates.stop()
+
+    try:
+        asyncio.run(run())
+    finally:
+        BaseCRUD._instances.pop(Balances, None)
+        BaseCRUD._instances.pop(Transactions, None)
+
+    registered = [info.handler for infos in WebhookRegistry._handlers.values() for info in infos]
+    assert create_handler not in registered
+
+
+def test_remote_responses_untouched_and_local_follows_their_schema():
+    balance_service, transaction_service = _services([], [])
+    balance_service.client.responses["/user/1/total"] = {"total": "15.00", "currency": "UAH"}
+    summary = {"count": 1, "total": 15, "by_type": {"deposit": {"count": 1, "total": 15}}}
+    transaction_service.client.responses["/1/summary"] = summary
+    aggregates = MaterializedAggregates(balance_service, transaction_service, reconcile_interval=0)
+    aggregates.apply("balance.upsert", {"id": 1, "user_id": 1, "amount": 15.0})
+    aggregates.apply(
+        "transaction.upsert",
+        {"id": 1, "user_id": 1, "amount": 15.0, "transaction_type": "deposit"},
+    )
+
+    async def run():
+        # Nothing is attached yet, so responses pass through as the API sent them
+        assert await transaction_service.get_user_summary(1) is summary
+
+        balance_service.aggregates = transaction_service.aggregates = aggregates
+        aggregates.ready = True
+        assert await balance_service.get_user_total(1) == {"total": "15.00", "currency": "UAH"}
+        assert await transaction_service.get_user_summary(1) == summary
+
+        aggregates.apply(
+            "transaction.upsert",
+            {"id": 2, "user_id": 1, "amount": 0.5, "transaction_type": "deposit"},
+        )
+        # The view cannot compute "currency", so totals keep coming from the API
+        balance_service.client.responses["/user/1/total"] = {"total": "16.00", "currency": "UAH"}
+        assert await balance_service.get_user_total(1) == {"total": "16.00", "currency": "UAH"}
+        return await transaction_service.get_user_summary(1)
+
+    try:
+        local = asyncio.run(run())
+    finally:
+        BaseCRUD._instances.pop(Balances, None)
+        BaseCRUD._instances.pop(Transactions, None)
+
+    assert local == {"count": 2, "total": 15.5, "by_type": {"deposit": {"count": 2, "total": 15.5}}}
+    assert json.loads(json.dumps(local)) == local
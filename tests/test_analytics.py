@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from uap_backend.analytics import load_transactions
+
+
+def test_load_transactions_reads_past_page_cap(make_service):
+    pytest.importorskip("numpy")
+    rows = [
+        {
+            "id": i,
+            "amount": 1.0,
+            "transaction_type": "deposit",
+            "user_id": i % 7,
+            "service_id": None,
+            "created_at": "2026-01-01T00:00:00",
+        }
+        for i in range(1, 1001)
+    ]
+    service = make_service(rows, page_cap=200)
+
+    frame = asyncio.run(load_transactions(service, chunk_size=500))
+
+    assert len(frame) == 1000
+    assert len(service.client.calls) > 1
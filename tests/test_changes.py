@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+
+from uap_backend.cruds.checkpoints import FileCheckpointStore
+
+
+def _changes(service, store, **kwargs):
+    async def run():
+        return [item async for item in service.changes_since("sync", store=store, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_changes_since_resumes_within_ties(make_service, tmp_path):
+    rows = [{"id": i, "updated_at": "2026-01-01T00:00:00"} for i in range(1, 451)]
+    service = make_service(rows, page_cap=200)
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+
+    first = _changes(service, store, page_size=200)
+    assert sorted(item["id"] for item in first) == list(range(1, 451))
+    assert len(asyncio.run(store.load("items:sync"))) < 120
+
+    rows.append({"id": 451, "updated_at": "2026-01-01T00:00:00"})
+    rows.append({"id": 452, "updated_at": "2026-01-02T00:00:00"})
+    assert [item["id"] for item in _changes(service, store, page_size=200)] == [451, 452]
+    assert _changes(service, store, page_size=200) == []
+
+
+def test_changes_since_seed_is_inclusive(make_service, tmp_path):
+    rows = [
+        {"id": 1, "updated_at": "2026-01-01T00:00:00"},
+        {"id": 2, "updated_at": "2026-01-02T00:00:00"},
+        {"id": 3, "updated_at": "2026-01-02T00:00:00"},
+        {"id": 4, "updated_at": "2026-01-03T00:00:00"},
+    ]
+    service = make_service(rows)
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+
+    items = _changes(service, store, since=datetime(2026, 1, 2))
+
+    assert [item["id"] for item in items] == [2, 3, 4]
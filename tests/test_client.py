@@ -0,0 +1,93 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from uap_backend.core.client import HTTPClient
+from uap_backend.core.config import settings
+from uap_backend.core.deadline import deadline_scope
+from uap_backend.core.errors import APIServerError, DeadlineExceededError
+from uap_backend.core.transport import StreamingResponse, Transport, TransportResponse
+
+
+class ScriptedTransport(Transport):
+    """Answers every request with ``body``, waiting ``delay`` seconds per chunk"""
+
+    def __init__(self, body: bytes, delay: float = 0.0, status: int = 200):
+        super().__init__({})
+        self.body = body
+        self.delay = delay
+        self.status = status
+        self.calls = []
+
+    async def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        await asyncio.sleep(self.delay)
+        return TransportResponse(self.status, {}, self.body)
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+
+        async def chunks():
+            for start in range(0, len(self.body), 8):
+                await asyncio.sleep(self.delay)
+                yield self.body[start : start + 8]
+
+        async def read():
+            return self.body
+
+        yield StreamingResponse(self.status, {}, chunks(), read)
+
+    async def close(self):
+        pass
+
+
+ITEMS = json.dumps({"items": [{"id": i} for i in range(5)]}).encode()
+
+
+def _stream(client, **kwargs):
+    async def run():
+        return [item async for item in client.stream_list("/items", **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_stream_list_passes_caller_headers():
+    transport = ScriptedTransport(ITEMS)
+    client = HTTPClient(base_url="http://api/", transport=transport)
+
+    items = _stream(client, headers={"X-Trace": "abc"})
+
+    assert [item["id"] for item in items] == list(range(5))
+    assert transport.calls[0][2]["headers"] == {"X-Trace": "abc"}
+
+
+def test_stream_list_honours_deadline_scope():
+    client = HTTPClient(base_url="http://api/", transport=ScriptedTransport(ITEMS, delay=0.05))
+
+    async def run():
+        with deadline_scope(0.1):
+            return [item async for item in client.stream_list("/items")]
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+
+
+def test_no_retry_when_round_trip_exceeds_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_DELAY", 0.01)
+    transport = ScriptedTransport(b"{}", delay=0.1)
+    client = HTTPClient(base_url="http://api/", transport=transport)
+    assert not client.limiter.adaptive
+
+    async def run():
+        await client.get("/warmup")
+        transport.status = 503
+        await client.get("/items", deadline=0.15)
+
+    with pytest.raises(APIServerError):
+        asyncio.run(run())
+    assert client.limiter.expected_rtt > 0
+    # The backoff fits in the 50ms left, the backoff plus a 100ms round trip does not
+    assert len(transport.calls) == 2
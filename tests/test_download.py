@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+import pytest
+
+from uap_backend.core.errors import TransferError
+from uap_backend.core.transport import StreamingResponse, Transport, TransportResponse
+from uap_backend.transfers.download import FileDownloader
+
+BODY = b"world data " * 1000
+
+
+class PlainTransport(Transport):
+    """Server ignoring Range headers, sending ``body`` with the given headers"""
+
+    def __init__(self, body, headers):
+        super().__init__({})
+        self.body = body
+        self.headers = headers
+
+    async def request(self, method, url, **kwargs):
+        return TransportResponse(200, self.headers, self.body)
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        async def chunks():
+            for start in range(0, len(self.body), 4096):
+                yield self.body[start : start + 4096]
+
+        async def read():
+            return self.body
+
+        yield StreamingResponse(200, self.headers, chunks(), read)
+
+    async def close(self):
+        pass
+
+
+class FileRecords:
+    def __init__(self, record):
+        self.record = record
+
+    async def download(self, file_id):
+        return self.record
+
+
+def _download(tmp_path, body, headers, record):
+    downloader = FileDownloader(FileRecords(record), transport=PlainTransport(body, headers))
+    path = tmp_path / "world.bin"
+    asyncio.run(downloader.download(1, path))
+    return path
+
+
+def test_sequential_download_checks_sha256(tmp_path):
+    record = {"download_url": "https://files/1", "sha256": hashlib.sha256(BODY).hexdigest()}
+
+    path = _download(tmp_path, BODY, {"Content-Length": str(len(BODY))}, record)
+
+    assert path.read_bytes() == BODY
+
+
+def test_sequential_download_rejects_corrupt_body(tmp_path):
+    record = {"download_url": "https://files/1", "sha256": hashlib.sha256(BODY).hexdigest()}
+    corrupt = BODY[:-1] + b"?"
+
+    with pytest.raises(TransferError, match="sha256 mismatch"):
+        _download(tmp_path, corrupt, {"Content-Length": str(len(corrupt))}, record)
+    assert not (tmp_path / "world.bin").exists()
+
+
+def test_sequential_download_rejects_short_body(tmp_path):
+    record = {"download_url": "https://files/1"}
+
+    with pytest.raises(TransferError, match="bytes"):
+        _download(tmp_path, BODY[:100], {"Content-Length": str(len(BODY))}, record)
+    assert not (tmp_path / "world.bin").exists()
+
+
+def test_sequential_download_checks_md5_etag(tmp_path):
+    etag = f'"{hashlib.md5(BODY).hexdigest()}"'
+
+    with pytest.raises(TransferError, match="md5 mismatch"):
+        _download(tmp_path, BODY + b"!", {"ETag": etag}, {"download_url": "https://files/1"})
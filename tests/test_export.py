@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import json
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from uap_backend.core.errors import SerializationError
+from uap_backend.cruds.checkpoints import FileCheckpointStore
+from uap_backend.cruds.export import CSVWriter, NDJSONWriter, ParquetWriter, schema_from_model
+
+
+class Row(BaseModel):
+    id: int
+    amount: float
+    note: Optional[str] = None
+
+
+def _rows(count):
+    return [{"id": i, "updated_at": "2026-01-01", "amount": i / 2} for i in range(1, count + 1)]
+
+
+def test_ndjson_writer(tmp_path):
+    path = str(tmp_path / "out.ndjson")
+    writer = NDJSONWriter(path)
+    writer.open()
+    writer.write([{"id": 1, "tags": ["a"]}, Row(id=2, amount=1.5)])
+    writer.close()
+
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == [
+            {"id": 1, "tags": ["a"]},
+            {"id": 2, "amount": 1.5},
+        ]
+
+
+def test_csv_writer_header_and_nested_values(tmp_path):
+    path = str(tmp_path / "out.csv")
+    writer = CSVWriter(path)
+    writer.open()
+    writer.write([{"id": 1, "meta": {"a": 1}}])
+    writer.write([{"id": 2, "meta": None, "extra": "dropped"}])
+    writer.close()
+
+    with open(path, newline="") as f:
+        assert list(csv.reader(f)) == [["id", "meta"], ["1", '{"a":1}'], ["2", ""]]
+
+
+def test_export_resumes_after_failure(make_service, tmp_path):
+    service = make_service(_rows(50))
+    store = FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    path = str(tmp_path / "items.ndjson")
+
+    service.client.fail_after = 3
+    with pytest.raises(ConnectionError):
+        asyncio.run(service.export(path, checkpoint="nightly", store=store, page_size=10))
+    saved = json.loads(asyncio.run(store.load("export:items:nightly")))
+    assert 0 < saved["rows"] < 50
+
+    # Bytes written after the last checkpoint are dropped on resume
+    with open(path, "ab") as f:
+        f.write(b'{"id": 999}\n{"partial')
+
+    service.client.fail_after = None
+    stats = asyncio.run(service.export(path, checkpoint="nightly", store=store, page_size=10))
+
+    with open(path) as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert ids == list(range(1, 51))
+    assert stats.rows == 50 and stats.resumed_rows == saved["rows"]
+    assert asyncio.run(store.load("export:items:nightly")) is None
+
+
+def test_parquet_schema_from_model_keeps_values(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    path = str(tmp_path / "out.parquet")
+    writer = ParquetWriter(path, row_group_size=2, schema=schema_from_model(Row))
+    writer.open()
+    writer.write([{"id": 1, "amount": 1}, {"id": 2, "amount": 2}])
+    writer.write([{"id": 3, "amount": 1.5, "note": 7}])
+    writer.close()
+
+    table = parquet.read_table(path)
+    assert table.schema.field("amount").type == pyarrow.float64()
+    assert table.column("amount").to_pylist() == [1.0, 2.0, 1.5]
+    assert table.column("note").to_pylist() == [None, None, "7"]
+
+
+def test_parquet_inferred_schema_fails_instead_of_truncating(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    writer = ParquetWriter(str(tmp_path / "out.parquet"), row_group_size=1)
+    writer.open()
+    writer.write([{"id": 1, "amount": 1}])
+    with pytest.raises(SerializationError, match="amount"):
+        writer.write([{"id": 2, "amount": 1.5}])
+
+
+def test_parquet_mixed_column_fails(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    writer = ParquetWriter(str(tmp_path / "out.parquet"), row_group_size=2)
+    writer.open()
+    with pytest.raises(SerializationError, match="amount"):
+        writer.write([{"id": 1, "amount": 1}, {"id": 2, "amount": "n/a"}])
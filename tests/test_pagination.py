@@ -0,0 +1,77 @@
+import asyncio
+
+from uap_backend.cruds.pagination import Cursor
+
+
+def _collect(service, **kwargs):
+    async def run():
+        return [item async for item in service.iter_all(**kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_walk_by_id(make_service):
+    rows = [{"id": i, "updated_at": "2026-01-01"} for i in range(1, 251)]
+    service = make_service(rows)
+
+    items = _collect(service, page_size=100)
+
+    assert [item["id"] for item in items] == list(range(1, 251))
+
+
+def test_many_ties_above_page_cap(make_service):
+    tied = [{"id": i, "updated_at": "2026-01-01T00:00:00"} for i in range(1, 501)]
+    later = [{"id": 501 + i, "updated_at": f"2026-01-02T00:00:0{i}"} for i in range(5)]
+    service = make_service(tied + later, page_cap=200, cursor_field="updated_at")
+
+    pages = []
+
+    async def run():
+        async for page in service.iter_pages(page_size=200):
+            pages.append(page)
+
+    asyncio.run(run())
+    ids = [item["id"] for page in pages for item in page.items]
+
+    assert sorted(ids) == list(range(1, 506))
+    assert len(ids) == len(set(ids))
+    assert all(call["limit"] <= 200 for call in service.client.calls)
+    # The token holds one position whatever the number of ties
+    assert max(len(page.cursor) for page in pages) < 120
+
+
+def test_ties_split_across_small_pages(make_service):
+    rows = [{"id": i, "updated_at": f"2026-01-0{1 + i % 3}"} for i in range(1, 61)]
+    service = make_service(rows, page_cap=200, cursor_field="updated_at")
+
+    items = _collect(service, page_size=7)
+
+    assert [(item["updated_at"], item["id"]) for item in items] == sorted(
+        (row["updated_at"], row["id"]) for row in rows
+    )
+
+
+def test_cursor_round_trip():
+    cursor = Cursor("updated_at", "2026-01-01", 42)
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+def test_page_size_above_page_cap_by_id(make_service):
+    rows = [{"id": i, "updated_at": "2026-01-01"} for i in range(1, 1001)]
+    service = make_service(rows, page_cap=200)
+
+    items = _collect(service, page_size=500)
+
+    assert [item["id"] for item in items] == list(range(1, 1001))
+
+
+def test_page_size_above_page_cap_with_ties(make_service):
+    rows = [{"id": i, "updated_at": f"2026-01-{1 + i % 4:02d}"} for i in range(1, 1001)]
+    service = make_service(rows, page_cap=200, cursor_field="updated_at")
+
+    items = _collect(service, page_size=500)
+
+    assert [(item["updated_at"], item["id"]) for item in items] == sorted(
+        (row["updated_at"], row["id"]) for row in rows
+    )
@@ -0,0 +1,12 @@
+import asyncio
+
+from uap_backend.replica import CollectionReplica
+
+
+def test_bootstrap_reads_past_page_cap(make_service):
+    rows = [{"id": i, "name": f"item-{i}"} for i in range(1, 751)]
+    service = make_service(rows, page_cap=200)
+    replica = CollectionReplica(service, page_size=500, reconcile_interval=0)
+
+    assert asyncio.run(replica.bootstrap()) == 750
+    assert replica.get("750") == {"id": 750, "name": "item-750"}
@@ -0,0 +1,69 @@
+import asyncio
+
+from uap_backend.replica.roles import RoleMembershipIndex
+from uap_backend.webhooks.registry import WebhookRegistry
+
+
+class FakeRoles:
+    """Role service whose membership lists can change while they are being read"""
+
+    def __init__(self, members):
+        self.members = members
+        self.membership = None
+        self.during_fetch = None
+
+    async def iter_all(self, **kwargs):
+        for role_id in sorted(self.members):
+            yield {"id": role_id}
+
+    async def get_users_by_role(self, role_id, **kwargs):
+        users = [{"id": user_id} for user_id in sorted(self.members[role_id])]
+        if self.during_fetch is not None:
+            callback, self.during_fetch = self.during_fetch, None
+            callback()
+        return users
+
+
+def test_reconcile_keeps_events_received_while_fetching():
+    roles = FakeRoles({1: {10, 11}, 2: {11}})
+    index = RoleMembershipIndex(roles, reconcile_interval=0)
+    asyncio.run(index.bootstrap())
+    assert index.members(any_of=[1]) == [10, 11]
+
+    def grant():
+        # The API has already answered for role 1 when user 12 gets it
+        roles.members[1].add(12)
+        index.apply("user.update", {"id": 12, "roles": [1]})
+
+    roles.members[2].add(10)
+    roles.during_fetch = grant
+    asyncio.run(index.reconcile())
+
+    assert index.members(any_of=[1]) == [10, 11, 12]
+    assert index.members(any_of=[2]) == [10, 11]
+
+
+def test_stop_removes_handlers():
+    index = RoleMembershipIndex(FakeRoles({}), reconcile_interval=0)
+    before = {scope: len(handlers) for scope, handlers in WebhookRegistry._handlers.items()}
+
+    for _ in range(3):
+        asyncio.run(index.start())
+        asyncio.run(index.stop())
+
+    after = {scope: len(handlers) for scope, handlers in WebhookRegistry._handlers.items()}
+    assert after == before
+
+
+def test_bootstrap_reads_every_role_past_page_cap(make_service):
+    roles = make_service([{"id": role_id} for role_id in range(1, 301)], page_cap=100)
+    roles.membership = None
+
+    async def get_users_by_role(role_id, **kwargs):
+        return [{"id": role_id}]
+
+    roles.get_users_by_role = get_users_by_role
+    index = RoleMembershipIndex(roles, page_size=250, reconcile_interval=0)
+
+    assert asyncio.run(index.bootstrap()) == 300
+    assert index.has_role(300, 300)
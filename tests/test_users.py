@@ -0,0 +1,47 @@
+import asyncio
+
+from uap_backend.cruds.base import BaseCRUD
+from uap_backend.cruds.users import UserCRUDService
+from uap_backend.replica import CollectionReplica
+from uap_backend.replica.users import UserIndex
+
+USERS = [
+    {"id": 1, "minecraft_nickname": "Steve", "created_at": "2026-01-02"},
+    {"id": 2, "minecraft_nickname": "Stevie", "created_at": "2026-01-01"},
+    {"id": 3, "minecraft_nickname": "Alex", "created_at": "2026-01-03"},
+]
+
+
+class SearchBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, endpoint, params=None, **kwargs):
+        self.calls += 1
+        query = params["query"].lower()
+        items = [user for user in USERS if query in user["minecraft_nickname"].lower()]
+        items.sort(key=lambda user: user["created_at"])
+        return {"items": items, "total": len(items)}
+
+
+def test_search_by_nickname_keeps_response_and_matches_locally():
+    service = UserCRUDService()
+    backend = service._client = SearchBackend()
+    try:
+        replica = CollectionReplica(service, store=UserIndex())
+        for user in USERS:
+            replica.store.upsert(user)
+        replica.ready = True
+        service.replica = replica
+
+        # The replica waits for one API response to learn its envelope
+        remote = asyncio.run(service.search_by_nickname("tev"))
+        local = asyncio.run(service.search_by_nickname("tev"))
+        similar = asyncio.run(service.search_by_nickname("stev", similar=0.1))
+    finally:
+        BaseCRUD._instances.pop(UserCRUDService, None)
+
+    assert backend.calls == 1
+    assert remote == local
+    assert [user["id"] for user in local["items"]] == [2, 1] and local["total"] == 2
+    assert [user["id"] for user in similar["items"]] == [2, 1]
@@ -0,0 +1,45 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from uap_backend.core.config import settings
+from uap_backend.webhooks.handlers import WebhookManager
+from uap_backend.webhooks.registry import WebhookRegistry
+
+
+class Widget(BaseModel):
+    id: int
+    size: int
+
+
+def test_batch_reports_events_rejected_by_validation():
+    received = []
+
+    async def on_widget(payload):
+        received.append(payload.id)
+
+    WebhookRegistry.register_handler("widget.create", Widget)(on_widget)
+    try:
+        client = TestClient(WebhookManager(FastAPI()).app)
+        events = [
+            {"scope": "widget.create", "payload": {"id": 1, "size": 3}},
+            {"scope": "widget.create", "payload": {"id": 2, "size": "large"}},
+        ]
+        response = client.post(
+            "/webhook",
+            content="\n".join(json.dumps(event) for event in events),
+            headers={
+                "Authorization": f"Bearer {settings.CALLBACK_SECRET}",
+                "Content-Type": "application/x-ndjson",
+            },
+        )
+    finally:
+        WebhookRegistry.unregister_handler("widget.create", on_widget)
+
+    body = response.json()
+    assert received == [1]
+    assert body["success"] is False
+    assert [result["success"] for result in body["data"]] == [True, False]
+    assert "Widget" in body["data"][1]["error"] and "size" in body["data"][1]["error"]
@@ -5,10 +5,21 @@ Provides convenient access to all API resources through CRUD services with
 improved architecture following backend patterns.
 """
 
-from .core import HTTPClient, settings
+from .analytics import TransactionFrame, iter_transaction_frames, load_transactions
+from .cache import CacheBackend, CacheEntry, MemoryCache, SQLiteCache
+from .core import HTTPClient, Priority, deadline_scope, priority_lane, settings
 from .core.errors import *
 from .cruds import *
-from .logger import get_logger
+from .logger import configure_logging, get_logger, shutdown_logging
+from .replica import (
+    CollectionReplica,
+    IndexedStore,
+    MaterializedAggregates,
+    ReplicaStore,
+    RoleMembershipIndex,
+    UserIndex,
+)
+from .transfers import FileDownloader, FileUploader, TransferProgress
 from .webhooks import (
     WebhookManager,
     WebhookRegistry,
@@ -26,8 +37,24 @@ __all__ = [
     # Core
     "HTTPClient",
     "settings", 
+    "Priority",
+    "priority_lane",
+    "deadline_scope",
     "get_logger",
-    
+    "configure_logging",
+    "shutdown_logging",
+
+    # Caching
+    "CacheBackend",
+    "CacheEntry",
+    "MemoryCache",
+    "SQLiteCache",
+
+    # Analytics
+    "TransactionFrame",
+    "iter_transaction_frames",
+    "load_transactions",
+
     # Errors
     "CRUDNotFoundError",
     "CRUDValidationError", 
@@ -36,12 +63,20 @@ __all__ = [
     "APIPermissionError",
     "APIRateLimitError",
     "APIServerError",
+    "DeadlineExceededError",
+    "TransferError",
     "SerializationError",
     "ConfigurationError",
     "WebhookValidationError",
-    
+
     # CRUD Services
     "BaseCRUD",
+    "Cursor",
+    "CursorPage",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "SQLiteCheckpointStore",
+    "ExportStats",
     "ApplicationCRUDService",
     "PunishmentsCRUDService", 
     "UserCRUDService",
@@ -52,7 +87,20 @@ __all__ = [
     "PurchasesCRUDService",
     "ServicesCRUDService",
     "TransactionCRUDService",
-    
+
+    # Replicas
+    "CollectionReplica",
+    "IndexedStore",
+    "MaterializedAggregates",
+    "ReplicaStore",
+    "RoleMembershipIndex",
+    "UserIndex",
+
+    # Transfers
+    "FileDownloader",
+    "FileUploader",
+    "TransferProgress",
+
     # Webhooks
     "WebhookRegistry",
     "WebhookManager",
@@ -0,0 +1,19 @@
+"""
+Vectorized analytics over streamed API collections.
+
+Requires numpy; the module imports without it and raises ImportError on use.
+"""
+
+from .transactions import (
+    TransactionFrame,
+    TransactionFrameBuilder,
+    iter_transaction_frames,
+    load_transactions,
+)
+
+__all__ = [
+    "TransactionFrame",
+    "TransactionFrameBuilder",
+    "iter_transaction_frames",
+    "load_transactions",
+]
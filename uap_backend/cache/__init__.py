@@ -0,0 +1,26 @@
+"""Response caches used by HTTPClient for CRUD reads"""
+
+from typing import Optional
+
+from uap_backend.core.config import settings
+
+from .base import CacheBackend, CacheEntry
+from .memory import MemoryCache
+from .sqlite import SQLiteCache
+
+__all__ = [
+    "CacheBackend",
+    "CacheEntry",
+    "MemoryCache",
+    "SQLiteCache",
+    "build_cache_backend",
+]
+
+
+def build_cache_backend() -> Optional[CacheBackend]:
+    """Create the cache backend selected by CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCache(settings.CACHE_PATH, max_bytes=settings.CACHE_MAX_BYTES)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(max_bytes=settings.CACHE_MAX_BYTES)
+    return None
@@ -0,0 +1,55 @@
+"""Response cache interface shared by cache backends"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body with its freshness and validator metadata"""
+
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class CacheBackend(ABC):
+    """Key/value store for response bodies"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, fresh or stale"""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting older ones if the size limit is exceeded"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove an entry"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all entries"""
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Remove all entries whose key starts with ``prefix``
+
+        Backends that cannot match prefixes fall back to dropping everything.
+        """
+        await self.clear()
+
+    async def close(self) -> None:
+        """Release backend resources"""
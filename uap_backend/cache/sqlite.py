@@ -0,0 +1,161 @@
+"""SQLite response cache shared between worker processes"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from uap_backend.logger import get_logger
+
+from .base import CacheBackend, CacheEntry
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at);
+"""
+
+
+class SQLiteCache(CacheBackend):
+    """Persistent cache in a WAL-mode SQLite file
+
+    WAL mode lets several worker processes on the same host read concurrently
+    while one writes, so process-per-core deployments share a warm cache across
+    restarts. Entries are evicted least-recently-used once ``max_bytes`` is exceeded.
+    """
+
+    # Access time is only rewritten when older than this, to keep reads read-only
+    TOUCH_INTERVAL = 60.0
+    # Total size is re-checked every N writes rather than on each one
+    EVICTION_CHECK_EVERY = 32
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Opened on first use, in a worker thread, so construction never blocks the loop
+        self._conn: Optional[sqlite3.Connection] = None
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM response_cache WHERE key = ?", (key,))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM response_cache WHERE substr(key, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM response_cache", ())
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use; callers hold the lock"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, query: str, args: tuple) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(query, args)
+            conn.commit()
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT body, etag, last_modified, stored_at, expires_at, accessed_at "
+                "FROM response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            body, etag, last_modified, stored_at, expires_at, accessed_at = row
+            now = time.time()
+            if now - accessed_at > self.TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+
+        return CacheEntry(
+            body=bytes(body),
+            expires_at=expires_at,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=stored_at,
+        )
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, body, etag, last_modified, stored_at, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at,
+                    entry.expires_at,
+                    time.time(),
+                    len(entry.body),
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_CHECK_EVERY == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response_cache"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        rows = self._conn.execute(
+            "SELECT key, size FROM response_cache ORDER BY accessed_at"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+
+        self._conn.executemany("DELETE FROM response_cache WHERE key = ?", doomed)
+        logger.debug("Evicted %s cache entries from %s", len(doomed), self.path)
@@ -2,7 +2,26 @@
 
 from .client import HTTPClient
 from .config import settings
-from .errors import APIConnectionError, CRUDNotFoundError, CRUDValidationError
+from .deadline import deadline_scope, remaining_time
+from .errors import (
+    APIConnectionError,
+    CRUDNotFoundError,
+    CRUDValidationError,
+    DeadlineExceededError,
+    TransferError,
+)
+from .hedging import HedgeBudget, LatencyTracker
+from .jsonstream import JSONArrayScanner
+from .limiter import AdaptiveLimiter, Priority, current_priority, priority_lane
+from .metrics import ClientMetrics, RequestStats
+from .transport import (
+    AiohttpTransport,
+    HttpxTransport,
+    StreamingResponse,
+    Transport,
+    TransportError,
+    TransportResponse,
+)
 
 __all__ = [
     "HTTPClient",
@@ -10,4 +29,23 @@ __all__ = [
     "CRUDNotFoundError",
     "CRUDValidationError",
     "APIConnectionError",
+    "DeadlineExceededError",
+    "TransferError",
+    "deadline_scope",
+    "remaining_time",
+    "ClientMetrics",
+    "RequestStats",
+    "LatencyTracker",
+    "HedgeBudget",
+    "Transport",
+    "TransportError",
+    "TransportResponse",
+    "StreamingResponse",
+    "JSONArrayScanner",
+    "AdaptiveLimiter",
+    "Priority",
+    "priority_lane",
+    "current_priority",
+    "AiohttpTransport",
+    "HttpxTransport",
 ]
@@ -1,15 +1,38 @@
 """HTTP Client for UAProject API"""
 
 import asyncio
-import logging
-from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional, Union
+import hashlib
+import json
+import time
+from contextlib import AsyncExitStack
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import urljoin
 
-import aiohttp
 from pydantic import BaseModel
 
+from uap_backend.cache import CacheBackend, CacheEntry, build_cache_backend
+from uap_backend.logger import get_logger
+
+from .compression import (
+    accept_encoding_header,
+    decode_leftover_zstd,
+    decode_leftover_zstd_stream,
+    maybe_compress,
+)
 from .config import settings
+from .deadline import resolve_deadline
 from .errors import (
     APIAuthenticationError,
     APIConnectionError,
@@ -17,47 +40,55 @@ from .errors import (
     APIRateLimitError,
     APIServerError,
     ConfigurationError,
+    DeadlineExceededError,
 )
+from .hedging import HedgeBudget, LatencyTracker, hedged
+from .jsonstream import iter_array_items
+from .limiter import AdaptiveLimiter, Priority, build_limiter
+from .metrics import ClientMetrics, RequestStats
+from .transport import Transport, TransportError, TransportResponse, build_transport
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+retry_logger = get_logger(f"{__name__}.retry", sample_every=settings.LOG_RETRY_SAMPLE_EVERY)
 
 
 class HTTPClient:
     """Enhanced HTTP client with retry logic and proper error handling"""
 
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache: Optional[CacheBackend] = None,
+        transport: Optional[Transport] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
         self.base_url = base_url or settings.FULL_API_URL
         self.api_key = api_key or settings.BACKEND_API_KEY
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache = cache if cache is not None else build_cache_backend()
+        self._owns_cache = cache is None
+        self.metrics = ClientMetrics()
+        self.stats_hooks: List[Callable[[RequestStats], None]] = []
+        self.limiter = limiter or build_limiter()
+        self.latency = LatencyTracker()
+        self.hedge_budget = HedgeBudget(settings.HEDGE_BUDGET_RATIO)
 
         if not self.api_key:
             raise ConfigurationError("BACKEND_API_KEY is required")
 
-    @property
-    def session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT)
-            connector = aiohttp.TCPConnector(
-                limit=settings.MAX_CONNECTIONS,
-                keepalive_timeout=settings.KEEPALIVE_TIMEOUT,
-            )
-
-            self._session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=connector,
-                headers=self._get_default_headers(),
-            )
-        return self._session
+        self.transport = transport or build_transport(self._get_default_headers())
 
     def _get_default_headers(self) -> Dict[str, str]:
         """Get default headers for requests"""
-        return {
+        headers = {
             "User-Agent": settings.USER_AGENT,
             "Content-Type": "application/json",
             "Accept": "application/json",
             settings.API_KEY_HEADER: f"{settings.BEARER_TOKEN_PREFIX} {self.api_key}",
         }
+        if settings.RESPONSE_COMPRESSION:
+            headers["Accept-Encoding"] = accept_encoding_header()
+        return headers
 
     async def _make_request(
         self,
@@ -66,93 +97,371 @@ class HTTPClient:
         data: Optional[Union[Dict[str, Any], BaseModel]] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        cache_ttl: Optional[float] = None,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        hedge: Optional[bool] = None,
         **kwargs,
     ) -> Dict[str, Any]:
-        """Make HTTP request with retry logic"""
+        """Make HTTP request with retry logic
+
+        GET responses are kept in the response cache: they are served directly for
+        ``cache_ttl`` seconds, then revalidated with conditional request headers.
+        Each attempt waits for a limiter slot in the ``priority`` lane, defaulting
+        to the lane set with ``priority_lane``.
+
+        ``deadline`` (seconds) and any enclosing ``deadline_scope`` bound the whole
+        call: each attempt gets the remaining budget as its timeout, and no retry
+        is made unless the backoff plus the expected latency still fits.
+
+        With ``hedge`` (default HEDGE_REQUESTS) a GET still pending after the
+        observed p95 latency is sent a second time and the first answer wins.
+        """
         url = urljoin(self.base_url, endpoint.lstrip("/"))
+        request_headers = dict(headers) if headers else {}
 
-        # Prepare request data
-        request_headers = headers or {}
-        request_data = None
+        cache_key, cached = await self._lookup_cached(method, url, params, request_headers)
+        if cached is not None and cached.is_fresh:
+            return self._decode_body(cached.body)
 
-        if data is not None:
-            if isinstance(data, BaseModel):
-                request_data = data.model_dump(exclude_unset=True, exclude_none=True)
-            else:
-                request_data = data
+        if isinstance(data, BaseModel):
+            data = data.model_dump(exclude_unset=True, exclude_none=True)
+        request_body, raw_size = self._encode_body(data, request_headers)
+
+        deadline_at = resolve_deadline(deadline)
+        hedge = method == "GET" and (settings.HEDGE_REQUESTS if hedge is None else hedge)
 
         # Retry logic
         last_exception = None
         for attempt in range(settings.MAX_RETRIES + 1):
             try:
-                async with self.session.request(
-                    method=method,
-                    url=url,
-                    json=request_data,
-                    params=params,
+                response, started = await self._attempt(
+                    method,
+                    url,
+                    endpoint,
+                    priority,
+                    deadline_at,
+                    hedge,
                     headers=request_headers,
+                    params=params,
+                    content=request_body,
                     **kwargs,
-                ) as response:
-                    return await self._handle_response(response, endpoint)
-
-            except aiohttp.ClientError as e:
-                last_exception = APIConnectionError(
-                    message=str(e),
-                    endpoint=endpoint,
+                )
+                self._record_stats(
+                    method, endpoint, response, started, request_headers, request_body, raw_size
+                )
+                return await self._complete(
+                    method, url, endpoint, response, cache_key, cached, cache_ttl
                 )
 
-                if attempt < settings.MAX_RETRIES:
-                    delay = self._calculate_retry_delay(attempt)
-                    logger.warning(f"Request failed, retrying in {delay}s: {e}")
+            except (TransportError, APIRateLimitError, APIServerError) as e:
+                # These errors are retryable
+                last_exception, delay = self._retry_plan(e, attempt, endpoint, deadline_at)
+                if attempt < settings.MAX_RETRIES and self._can_retry(deadline_at, delay):
+                    retry_logger.warning("Request failed, retrying in %ss: %s", delay, e)
                     await asyncio.sleep(delay)
                 else:
                     break
 
-            except (APIRateLimitError, APIServerError) as e:
-                # These errors are retryable
-                last_exception = e
-
-                if attempt < settings.MAX_RETRIES:
-                    if isinstance(e, APIRateLimitError) and e.retry_after:
-                        delay = min(e.retry_after, settings.MAX_RETRY_DELAY)
-                    else:
-                        delay = self._calculate_retry_delay(attempt)
+        # If we get here, all retries failed
+        raise last_exception or APIConnectionError("All retries failed", endpoint)
 
-                    logger.warning(f"API error, retrying in {delay}s: {e}")
-                    await asyncio.sleep(delay)
+    async def _attempt(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        priority: Optional[Priority],
+        deadline_at: Optional[float],
+        hedge: bool,
+        **kwargs,
+    ) -> Tuple[TransportResponse, float]:
+        """Send one attempt through a limiter slot, returning the response and its start time"""
+        try:
+            async with self.limiter.acquire(
+                priority, timeout=self._remaining_budget(deadline_at, endpoint)
+            ) as permit:
+                attempt_timeout = self._remaining_budget(deadline_at, endpoint)
+                if attempt_timeout is not None:
+                    kwargs["timeout"] = min(attempt_timeout, settings.REQUEST_TIMEOUT)
+                started = time.monotonic()
+                try:
+                    response = await self._send(method, url, hedge, **kwargs)
+                except TransportError:
+                    permit.dropped()
+                    raise
+                if response.status == 429 or response.status >= 500:
+                    permit.dropped()
                 else:
-                    break
+                    permit.success()
+                    if method == "GET":
+                        self.latency.record(time.monotonic() - started)
+        except TimeoutError as e:
+            # Only the limiter wait is bounded this way; transports raise TransportError
+            raise DeadlineExceededError(
+                endpoint, "Deadline exceeded while waiting for a connection slot"
+            ) from e
+
+        if response.headers.get("Content-Encoding") == "zstd":
+            response.body = decode_leftover_zstd(response.body)
+        return response, started
+
+    def _retry_plan(
+        self,
+        error: Exception,
+        attempt: int,
+        endpoint: str,
+        deadline_at: Optional[float],
+    ) -> Tuple[Exception, float]:
+        """Error to raise once retries run out, and the backoff before the next attempt"""
+        if isinstance(error, TransportError):
+            if deadline_at is not None and time.monotonic() >= deadline_at:
+                raise DeadlineExceededError(endpoint) from error
+            error = APIConnectionError(message=str(error), endpoint=endpoint)
+        elif isinstance(error, APIRateLimitError) and error.retry_after:
+            return error, min(error.retry_after, settings.MAX_RETRY_DELAY)
+        return error, self._calculate_retry_delay(attempt)
+
+    async def _complete(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        response: TransportResponse,
+        cache_key: Optional[str],
+        cached: Optional[CacheEntry],
+        cache_ttl: Optional[float],
+    ) -> Dict[str, Any]:
+        """Decode the response and bring the response cache up to date"""
+        if response.status == 304 and cached is not None:
+            await self._refresh_cached(cache_key, cached, response.headers, cache_ttl)
+            return self._decode_body(cached.body)
+
+        response_data = self._handle_response(response, endpoint)
+        if cache_key is not None and response.status == 200:
+            await self._store_cached(cache_key, response.body, response.headers, cache_ttl)
+        elif method != "GET":
+            await self._invalidate_cached(url)
+        return response_data
+
+    async def _send(self, method: str, url: str, hedge: bool, **kwargs) -> TransportResponse:
+        """Send one attempt, hedging it once the p95 latency has passed"""
+        if not hedge:
+            return await self.transport.request(method, url, **kwargs)
+
+        self.hedge_budget.deposit()
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self.transport.request(method, url, **kwargs)
+
+        response, from_hedge = await hedged(
+            lambda: self.transport.request(method, url, **kwargs), delay, self._allow_hedge
+        )
+        if from_hedge:
+            self.metrics.hedges_won += 1
+        return response
+
+    def _hedge_delay(self) -> Optional[float]:
+        if len(self.latency) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(settings.HEDGE_PERCENTILE)
+
+    def _allow_hedge(self) -> bool:
+        if not self.hedge_budget.try_spend():
+            return False
+        self.metrics.hedges_sent += 1
+        logger.debug("Hedging slow request after p%.0f latency", settings.HEDGE_PERCENTILE * 100)
+        return True
+
+    @staticmethod
+    def _remaining_budget(deadline_at: Optional[float], endpoint: str) -> Optional[float]:
+        """Seconds left until the deadline; raises once it has passed"""
+        if deadline_at is None:
+            return None
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError(endpoint)
+        return remaining
+
+    def _can_retry(self, deadline_at: Optional[float], delay: float) -> bool:
+        """Whether the backoff plus a typical round trip still fits in the deadline"""
+        if deadline_at is None:
+            return True
+        remaining = deadline_at - time.monotonic()
+        if delay + self.limiter.expected_rtt < remaining:
+            return True
+        retry_logger.info("Not retrying, only %.3fs left before the deadline", remaining)
+        return False
+
+    @staticmethod
+    def _encode_body(
+        request_data: Any, request_headers: Dict[str, str]
+    ) -> tuple[Optional[bytes], int]:
+        """Serialize the JSON body, compressing it above the configured size threshold"""
+        if request_data is None:
+            return None, 0
+
+        body = json.dumps(request_data).encode()
+        compressed = maybe_compress(
+            body, settings.REQUEST_COMPRESSION, settings.REQUEST_COMPRESSION_MIN_SIZE
+        )
+        if compressed is None:
+            return body, len(body)
 
-            except (APIAuthenticationError, APIPermissionError):
-                # These errors are not retryable
-                raise
+        request_headers["Content-Encoding"] = settings.REQUEST_COMPRESSION
+        return compressed, len(body)
 
-        # If we get here, all retries failed
-        raise last_exception or APIConnectionError("All retries failed", endpoint)
+    def _record_stats(
+        self,
+        method: str,
+        endpoint: str,
+        response: TransportResponse,
+        started: float,
+        request_headers: Dict[str, str],
+        request_body: Optional[bytes],
+        raw_size: int,
+    ) -> None:
+        response_encoding = response.headers.get("Content-Encoding")
+        wire_size = response.wire_size if response.wire_size is not None else len(response.body)
+
+        stats = RequestStats(
+            method=method,
+            endpoint=endpoint,
+            status=response.status,
+            elapsed=time.monotonic() - started,
+            request_bytes=raw_size,
+            request_wire_bytes=len(request_body) if request_body is not None else 0,
+            request_encoding=request_headers.get("Content-Encoding"),
+            response_bytes=len(response.body),
+            response_wire_bytes=wire_size,
+            response_encoding=response_encoding,
+            http_version=response.http_version,
+        )
+        self.metrics.record(stats)
+        logger.debug(
+            "%s %s -> %s in %.3fs, request %s/%s bytes, response %s/%s bytes (%s)",
+            method,
+            endpoint,
+            stats.status,
+            stats.elapsed,
+            stats.request_wire_bytes,
+            stats.request_bytes,
+            stats.response_wire_bytes,
+            stats.response_bytes,
+            response_encoding or "identity",
+        )
+        for hook in self.stats_hooks:
+            try:
+                hook(stats)
+            except Exception as e:
+                logger.warning("Request stats hook failed: %s", e)
 
     def _calculate_retry_delay(self, attempt: int) -> float:
         """Calculate exponential backoff delay"""
         delay = settings.RETRY_DELAY * (settings.RETRY_BACKOFF_FACTOR**attempt)
         return min(delay, settings.MAX_RETRY_DELAY)
 
-    async def _handle_response(
-        self, response: aiohttp.ClientResponse, endpoint: str
-    ) -> Dict[str, Any]:
-        """Handle HTTP response and convert to appropriate exception if needed"""
+    def _cache_key(self, url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build a cache key scoped to the URL, query and API key"""
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{self._cache_prefix(url)}{query}"
+
+    def _cache_prefix(self, url: str) -> str:
+        """Common start of the cache keys of every query on a URL"""
+        key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
+        return f"{key_hash}:{url}?"
+
+    async def _lookup_cached(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        request_headers: Dict[str, str],
+    ) -> Tuple[Optional[str], Optional[CacheEntry]]:
+        """Cache key and cached entry of a GET, adding revalidation headers for stale ones"""
+        if self.cache is None or method != "GET":
+            return None, None
+
+        cache_key = self._cache_key(url, params)
+        cached = await self.cache.get(cache_key)
+        if cached is not None and not cached.is_fresh:
+            self._add_conditional_headers(request_headers, cached)
+        return cache_key, cached
+
+    async def _invalidate_cached(self, url: str) -> None:
+        """Drop cached reads of a written URL and of the collection it belongs to"""
+        if self.cache is None:
+            return
+        try:
+            for target in (url, url.rstrip("/").rpartition("/")[0]):
+                await self.cache.delete_prefix(self._cache_prefix(target))
+        except Exception as e:
+            logger.warning("Failed to invalidate cached responses: %s", e)
+
+    @staticmethod
+    def _add_conditional_headers(headers: Dict[str, str], cached: CacheEntry) -> None:
+        """Ask the server to answer 304 if the cached body is still current"""
+        if cached.etag is not None:
+            headers.setdefault("If-None-Match", cached.etag)
+        if cached.last_modified is not None:
+            headers.setdefault("If-Modified-Since", cached.last_modified)
+
+    async def _store_cached(
+        self, cache_key: str, body: bytes, headers: Mapping[str, str], ttl: Optional[float]
+    ) -> None:
+        entry = CacheEntry(
+            body=body,
+            expires_at=time.time() + (ttl or 0.0),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        # Without a TTL an entry is only useful for revalidation
+        if not ttl and not entry.has_validators:
+            return
+        try:
+            await self.cache.set(cache_key, entry)
+        except Exception as e:
+            logger.warning("Failed to store response in cache: %s", e)
+
+    async def _refresh_cached(
+        self,
+        cache_key: str,
+        cached: CacheEntry,
+        headers: Mapping[str, str],
+        ttl: Optional[float],
+    ) -> None:
+        """Extend a revalidated entry, picking up any updated validators"""
+        cached.expires_at = time.time() + (ttl or 0.0)
+        cached.etag = headers.get("ETag", cached.etag)
+        cached.last_modified = headers.get("Last-Modified", cached.last_modified)
+        if ttl:
+            try:
+                await self.cache.set(cache_key, cached)
+            except Exception as e:
+                logger.warning("Failed to refresh cached response: %s", e)
+
+    @staticmethod
+    def _decode_body(body: bytes) -> Any:
+        if not body:
+            return {}
         try:
-            response_data = await response.json()
-        except Exception:
-            response_data = {"detail": await response.text()}
+            return json.loads(body)
+        except ValueError:
+            return {"detail": body.decode(errors="replace")}
+
+    def _handle_response(self, response: TransportResponse, endpoint: str) -> Dict[str, Any]:
+        """Handle HTTP response and convert to appropriate exception if needed"""
+        response_data = self._decode_body(response.body)
 
         if response.status in (200, 201):
             return response_data
         if response.status == 204:
             return {}
+        if not isinstance(response_data, dict):
+            response_data = {"detail": response_data}
         self._raise_for_status(response, endpoint, response_data)
 
-    def _raise_for_status(
-        self, response: aiohttp.ClientResponse, endpoint: str, response_data: dict
-    ):
+    def _raise_for_status(self, response: TransportResponse, endpoint: str, response_data: dict):
         if response.status == 401:
             raise APIAuthenticationError(
                 endpoint, response_data.get("detail", "Authentication failed")
@@ -185,10 +494,87 @@ class HTTPClient:
 
     # HTTP Methods
     async def get(
-        self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache_ttl: Optional[float] = None,
+        **kwargs,
     ) -> Dict[str, Any]:
-        """GET request"""
-        return await self._make_request("GET", endpoint, params=params, **kwargs)
+        """GET request, optionally served from the response cache for ``cache_ttl`` seconds"""
+        return await self._make_request(
+            "GET", endpoint, params=params, cache_ttl=cache_ttl, **kwargs
+        )
+
+    async def stream_list(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        model: Optional[Type[BaseModel]] = None,
+        keys: Sequence[str] = ("items", "data"),
+        priority: Optional[Priority] = None,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """GET a list endpoint and yield its items one at a time as they arrive
+
+        Items are taken from a top-level array or from the ``items``/``data`` array of
+        a paginated object. With ``model`` each item is validated straight from its
+        raw JSON bytes. Streams are not retried once started. They hold a limiter
+        slot in their lane only until the response headers arrive, so requests made
+        while iterating never wait on the stream's own slot. ``deadline`` and any
+        enclosing ``deadline_scope`` bound opening the stream and every read.
+        """
+        url = urljoin(self.base_url, endpoint.lstrip("/"))
+        request_headers = dict(headers) if headers else {}
+        deadline_at = resolve_deadline(deadline)
+
+        try:
+            async with AsyncExitStack() as stack:
+                async with self.limiter.acquire(
+                    priority, timeout=self._remaining_budget(deadline_at, endpoint)
+                ):
+                    async with asyncio.timeout(self._remaining_budget(deadline_at, endpoint)):
+                        response = await stack.enter_async_context(
+                            self.transport.stream(
+                                "GET", url, headers=request_headers, params=params, **kwargs
+                            )
+                        )
+
+                if response.status != 200:
+                    body = await response.read()
+                    self._handle_response(
+                        TransportResponse(response.status, response.headers, body), endpoint
+                    )
+                    return
+
+                chunks = self._read_until(response.chunks, deadline_at, endpoint)
+                if response.headers.get("Content-Encoding") == "zstd":
+                    chunks = decode_leftover_zstd_stream(chunks)
+                async for raw in iter_array_items(chunks, tuple(keys)):
+                    yield model.model_validate_json(raw) if model else json.loads(raw)
+        except TimeoutError as e:
+            raise DeadlineExceededError(endpoint, "Deadline exceeded while streaming") from e
+        except TransportError as e:
+            raise APIConnectionError(message=str(e), endpoint=endpoint)
+
+    async def _read_until(
+        self, chunks: AsyncIterator[bytes], deadline_at: Optional[float], endpoint: str
+    ) -> AsyncIterator[bytes]:
+        """Chunks of a stream, each read bounded by what is left of the deadline"""
+        if deadline_at is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        iterator = chunks.__aiter__()
+        while True:
+            try:
+                async with asyncio.timeout(self._remaining_budget(deadline_at, endpoint)):
+                    chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            yield chunk
 
     async def post(
         self, endpoint: str, data: Optional[Union[Dict[str, Any], BaseModel]] = None, **kwargs
@@ -212,19 +598,11 @@ class HTTPClient:
         """DELETE request"""
         return await self._make_request("DELETE", endpoint, **kwargs)
 
-    @asynccontextmanager
-    async def _session_context(self):
-        """Async context manager for session lifecycle"""
-        try:
-            yield self.session
-        finally:
-            pass  # Session will be closed by close() method
-
     async def close(self):
-        """Close the HTTP session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+        """Close the HTTP transport and the response cache this client created"""
+        await self.transport.close()
+        if self.cache is not None and self._owns_cache:
+            await self.cache.close()
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,87 @@
+"""Content-encoding negotiation and request body compression"""
+
+import gzip
+import zlib
+from typing import AsyncIterator, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can decode, best first"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.extend(["gzip", "deflate"])
+    return encodings
+
+
+def accept_encoding_header() -> str:
+    return ", ".join(available_encodings())
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a request body with the given content-encoding"""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(body, quality=5)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def maybe_compress(body: bytes, encoding: str, min_size: int) -> Optional[bytes]:
+    """Compress body if it is large enough and compression actually helps"""
+    if encoding == "none" or len(body) < min_size:
+        return None
+    compressed = compress(body, encoding)
+    return compressed if len(compressed) < len(body) else None
+
+
+def decode_leftover_zstd(body: bytes) -> bytes:
+    """Decode a zstd body the transport did not decompress itself"""
+    if zstandard is not None and body.startswith(ZSTD_MAGIC):
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+async def decode_leftover_zstd_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Decode a zstd chunk stream the transport did not decompress itself"""
+    head = b""
+    async for chunk in chunks:
+        head += chunk
+        if len(head) >= len(ZSTD_MAGIC):
+            break
+
+    if zstandard is None or not head.startswith(ZSTD_MAGIC):
+        if head:
+            yield head
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    decoder = zstandard.ZstdDecompressor().decompressobj()
+    if data := decoder.decompress(head):
+        yield data
+    async for chunk in chunks:
+        if data := decoder.decompress(chunk):
+            yield data
@@ -30,12 +30,51 @@ class UAProjectAPISettings(BaseSettings):
     REQUEST_TIMEOUT: float = 30.0
     MAX_CONNECTIONS: int = 100
     KEEPALIVE_TIMEOUT: int = 30
+    HTTP_TRANSPORT: Literal["aiohttp", "httpx"] = "aiohttp"
+    HTTP2_MAX_CONNECTIONS: int = 4
+    STREAM_CHUNK_SIZE: int = 64 * 1024
+
+    # Adaptive Concurrency
+    CONCURRENCY_ADAPTIVE: bool = False
+    # None starts from MAX_CONNECTIONS
+    CONCURRENCY_INITIAL_LIMIT: Optional[int] = None
+    CONCURRENCY_MIN_LIMIT: int = 2
+    CONCURRENCY_RTT_TOLERANCE: float = 1.5
+    CONCURRENCY_BACKOFF_RATIO: float = 0.9
+    CONCURRENCY_HIGH_PRIORITY_RESERVED: float = 0.2
+
+    # Hedged Requests
+    HEDGE_REQUESTS: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_BUDGET_RATIO: float = 0.05
+    HEDGE_MIN_SAMPLES: int = 20
 
     # Library Constants
     USER_AGENT: str = "UAProject-PyLibrary/1.0"
     BEARER_TOKEN_PREFIX: str = "Bearer"
     API_KEY_HEADER: str = "Authorization"
 
+    # Compression
+    RESPONSE_COMPRESSION: bool = True
+    REQUEST_COMPRESSION: Literal["none", "gzip", "deflate", "br", "zstd"] = "none"
+    REQUEST_COMPRESSION_MIN_SIZE: int = 1024
+
+    # Response Cache
+    CACHE_BACKEND: Literal["none", "memory", "sqlite"] = "none"
+    CACHE_PATH: str = ".uap_cache.sqlite3"
+    CACHE_TTL: float = 0.0
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Change Feed Checkpoints
+    CHECKPOINT_BACKEND: Literal["file", "sqlite"] = "file"
+    CHECKPOINT_PATH: str = ".uap_checkpoints.json"
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "%(levelname)s:     %(message)s"
+    LOG_ASYNC: bool = True
+    LOG_RETRY_SAMPLE_EVERY: int = 1
+
     # Webhook Headers
     WEBHOOK_SIGNATURE_HEADER: str = "X-Webhook-Signature"
     WEBHOOK_EVENT_HEADER: str = "X-Webhook-Event"
@@ -46,6 +85,26 @@ class UAProjectAPISettings(BaseSettings):
     WEBHOOK_ENDPOINT_URL: Optional[str] = None
     WEBHOOK_SECRET: Optional[str] = None
     WEBHOOK_VERIFY_SIGNATURE: bool = False
+    WEBHOOK_TIMESTAMP_TOLERANCE: int = 300
+    WEBHOOK_BATCH_SIZE: int = 100
+
+    # Local Replicas
+    REPLICA_PAGE_SIZE: int = 100
+    REPLICA_RECONCILE_INTERVAL: float = 300.0
+
+    # Analytics
+    ANALYTICS_CHUNK_SIZE: int = 50_000
+
+    # Bulk Export
+    EXPORT_PAGE_SIZE: int = 500
+    EXPORT_QUEUE_SIZE: int = 4
+    EXPORT_ROW_GROUP_SIZE: int = 50_000
+    EXPORT_PROGRESS_INTERVAL: float = 10.0
+
+    # File Transfers
+    TRANSFER_PART_SIZE: int = 8 * 1024 * 1024
+    TRANSFER_CONCURRENCY: int = 4
+    TRANSFER_PART_TIMEOUT: float = 300.0
 
     # Webhook Retry Configuration
     WEBHOOK_MAX_RETRIES: int = 3
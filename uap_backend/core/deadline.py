@@ -0,0 +1,39 @@
+"""Deadlines shared by every request made within one logical operation"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar("uap_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """Bound every request made inside the block, retries included, to ``seconds``
+
+    Nested scopes can only tighten the enclosing deadline.
+    """
+    deadline_at = resolve_deadline(seconds)
+    token = _current_deadline.set(deadline_at)
+    try:
+        yield deadline_at
+    finally:
+        _current_deadline.reset(token)
+
+
+def resolve_deadline(seconds: Optional[float] = None) -> Optional[float]:
+    """Monotonic deadline from a per-call budget and the enclosing scope, if any"""
+    deadline_at = _current_deadline.get()
+    if seconds is not None:
+        call_deadline = time.monotonic() + seconds
+        deadline_at = call_deadline if deadline_at is None else min(deadline_at, call_deadline)
+    return deadline_at
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, None when there is none"""
+    deadline_at = _current_deadline.get()
+    if deadline_at is None:
+        return None
+    return max(deadline_at - time.monotonic(), 0.0)
@@ -84,6 +84,21 @@ class APIServerError(APIConnectionError):
         super().__init__(message, endpoint, status_code)
 
 
+class DeadlineExceededError(APIConnectionError):
+    """Raised when a call runs out of its deadline budget"""
+
+    def __init__(self, endpoint: str, message: str = "Deadline exceeded"):
+        super().__init__(message, endpoint)
+
+
+class TransferError(APIConnectionError):
+    """Raised when part of a file transfer fails for good"""
+
+    def __init__(self, url: str, message: str, status_code: Optional[int] = None):
+        # Presigned query strings are credentials, keep them out of messages
+        super().__init__(message, url.split("?", 1)[0], status_code)
+
+
 class SerializationError(Exception):
     """Raised when serialization/deserialization fails"""
 
@@ -0,0 +1,87 @@
+"""Latency tracking and hedged request helpers"""
+
+import asyncio
+from bisect import insort
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with percentile lookups"""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._sorted: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        if self._sorted is not None:
+            if len(self._samples) == self._samples.maxlen:
+                self._sorted = None
+            else:
+                insort(self._sorted, latency)
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency below which ``q`` (0..1) of the recent samples fall"""
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(int(q * len(self._sorted)), len(self._sorted) - 1)
+        return self._sorted[index]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to a fraction of the requests made"""
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+
+    def deposit(self) -> None:
+        """Credit one eligible request"""
+        self._tokens = min(self._tokens + self.ratio, self.burst)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+async def hedged(
+    send: Callable[[], Awaitable[T]],
+    delay: float,
+    allow_hedge: Callable[[], bool],
+) -> Tuple[T, bool]:
+    """Run ``send``; if it is still pending after ``delay`` start a second copy
+
+    The first copy to succeed wins and the other is cancelled. Returns the result
+    and whether it came from the hedge. If every copy fails, the primary's error
+    is raised.
+    """
+    primary = asyncio.ensure_future(send())
+    pending = {primary}
+    hedge: Optional[asyncio.Future] = None
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done and allow_hedge():
+            hedge = asyncio.ensure_future(send())
+            pending.add(hedge)
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), task is hedge
+        return primary.result(), False
+    finally:
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
@@ -0,0 +1,169 @@
+"""Incremental extraction of array items from a streamed JSON document"""
+
+import re
+from typing import AsyncIterator, Iterable, List, Tuple
+
+from .errors import SerializationError
+
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+_COLON = 0x3A
+_COMMA = 0x2C
+_OPENERS = (0x5B, 0x7B)  # [ {
+_CLOSERS = (0x5D, 0x7D)  # ] }
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class JSONArrayScanner:
+    """Push parser yielding the raw bytes of each item of one JSON array
+
+    The array is either the top-level value or the value of one of ``keys`` in a
+    top-level object (e.g. ``{"items": [...], "total": 10}``). Only the bytes of
+    the item currently being scanned are buffered, so memory stays proportional
+    to a single item regardless of the document size.
+    """
+
+    def __init__(self, keys: Iterable[str] = ("items", "data")):
+        self._keys = {f'"{key}"'.encode() for key in keys}
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._in_array = False
+        self._found = False
+        self._done = False
+        self._item = bytearray()
+        self._item_depth = 0
+        # Last string token seen at depth 1, used to detect the wanted key
+        self._token = bytearray()
+        self._expect_array = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def found(self) -> bool:
+        """Whether the start of the target array was seen"""
+        return self._found
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Consume a chunk, returning the raw bytes of every item completed in it"""
+        items: List[bytes] = []
+        pos = 0
+        size = len(chunk)
+        while pos < size and not self._done:
+            if self._in_array:
+                pos = self._scan_item(chunk, pos, items)
+            else:
+                self._feed_outer_byte(chunk[pos])
+                pos += 1
+        return items
+
+    def _scan_item(self, chunk: bytes, pos: int, items: List[bytes]) -> int:
+        """Copy item bytes up to the next structural byte, returning the new position"""
+        if self._in_string:
+            return self._scan_item_string(chunk, pos)
+
+        match = _STRUCTURAL.search(chunk, pos)
+        if match is None:
+            self._item += chunk[pos:]
+            return len(chunk)
+
+        end = match.start()
+        byte = chunk[end]
+        if self._item_depth == 0 and (byte == _COMMA or byte in _CLOSERS):
+            self._item += chunk[pos:end]
+            self._flush_item(items)
+            if byte != _COMMA:
+                self._in_array = False
+                self._done = True
+            return end + 1
+
+        self._item += chunk[pos : end + 1]
+        if byte == _QUOTE:
+            self._in_string = True
+        elif byte in _OPENERS:
+            self._item_depth += 1
+        elif byte in _CLOSERS:
+            self._item_depth -= 1
+        return end + 1
+
+    def _scan_item_string(self, chunk: bytes, pos: int) -> int:
+        """Copy string bytes up to the closing quote or the next escape"""
+        if self._escaped:
+            self._item.append(chunk[pos])
+            self._escaped = False
+            return pos + 1
+
+        match = _STRING_SPECIAL.search(chunk, pos)
+        if match is None:
+            self._item += chunk[pos:]
+            return len(chunk)
+
+        end = match.start()
+        self._item += chunk[pos : end + 1]
+        if chunk[end] == _BACKSLASH:
+            self._escaped = True
+        else:
+            self._in_string = False
+        return end + 1
+
+    def _flush_item(self, items: List[bytes]) -> None:
+        if self._item.strip():
+            items.append(bytes(self._item))
+        self._item.clear()
+
+    def _feed_outer_byte(self, byte: int) -> None:
+        """Track structure outside the target array to find where it starts"""
+        if self._in_string:
+            self._feed_outer_string_byte(byte)
+        elif byte == _QUOTE:
+            self._in_string = True
+            if self._depth == 1:
+                self._token = bytearray(b'"')
+        elif byte == _COLON and self._depth == 1:
+            self._expect_array = bytes(self._token) in self._keys
+        elif byte == 0x5B and (self._depth == 0 or (self._depth == 1 and self._expect_array)):
+            self._in_array = True
+            self._found = True
+            self._item_depth = 0
+        elif byte in _OPENERS:
+            self._depth += 1
+            self._expect_array = False
+        elif byte in _CLOSERS:
+            self._depth -= 1
+        elif byte == _COMMA and self._depth == 1:
+            self._expect_array = False
+
+    def _feed_outer_string_byte(self, byte: int) -> None:
+        if self._depth == 1:
+            self._token.append(byte)
+        if self._escaped:
+            self._escaped = False
+        elif byte == _BACKSLASH:
+            self._escaped = True
+        elif byte == _QUOTE:
+            self._in_string = False
+
+
+async def iter_array_items(
+    chunks: AsyncIterator[bytes], keys: Tuple[str, ...] = ("items", "data")
+) -> AsyncIterator[bytes]:
+    """Yield raw item bytes of the list found in a streamed JSON document
+
+    Raises SerializationError when the document holds no such list or ends
+    before the list is closed, so a cut-off response never passes for a short one.
+    """
+    scanner = JSONArrayScanner(keys)
+    async for chunk in chunks:
+        for item in scanner.feed(chunk):
+            yield item
+        if scanner.done:
+            return
+
+    if scanner.found:
+        raise SerializationError("JSON stream ended before the end of the list")
+    raise SerializationError(
+        f"JSON stream has no top-level array or {'/'.join(keys)} array to stream"
+    )
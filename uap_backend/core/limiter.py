@@ -0,0 +1,280 @@
+"""Adaptive concurrency limiting for outbound requests"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Iterator, Mapping, Optional
+
+from uap_backend.logger import get_logger
+
+from .config import settings
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes, lower values are scheduled first"""
+
+    HIGH = 0  # interactive commands
+    NORMAL = 1
+    LOW = 2  # background syncs and exports
+
+
+DEFAULT_LANE_WEIGHTS: Mapping[Priority, int] = {
+    Priority.HIGH: 8,
+    Priority.NORMAL: 3,
+    Priority.LOW: 1,
+}
+
+_current_priority: ContextVar[Optional[Priority]] = ContextVar("uap_priority", default=None)
+
+
+def current_priority() -> Priority:
+    """Priority of the lane the current task runs in"""
+    priority = _current_priority.get()
+    return priority if priority is not None else Priority.NORMAL
+
+
+@contextmanager
+def priority_lane(priority: Priority) -> Iterator[None]:
+    """Run every request made inside the block (and tasks it spawns) in one lane"""
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class LimiterPermit:
+    """A granted in-flight slot; the caller reports how the request went"""
+
+    __slots__ = ("priority", "started", "outcome")
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self.started = time.monotonic()
+        self.outcome: Optional[str] = None
+
+    def success(self) -> None:
+        """The server answered normally, the RTT is a valid sample"""
+        self.outcome = "success"
+
+    def dropped(self) -> None:
+        """The request failed in a way that signals overload (5xx, 429, timeout)"""
+        self.outcome = "dropped"
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter that tracks backend latency (gradient style)
+
+    A long-term RTT average is compared with recent samples. While they agree the
+    limit grows by about ``sqrt(limit)`` per sample; when recent latency climbs
+    above ``tolerance`` times the baseline the limit shrinks proportionally, and
+    every overload signal multiplies it by ``backoff_ratio``.
+
+    Each priority is a lane. Queued lanes share freed slots weighted-fair by
+    ``weights`` (stride scheduling), and ``reserved_fraction`` of the limit can
+    only be used by the HIGH lane so interactive calls never wait behind a sync.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 2,
+        max_limit: int = 100,
+        tolerance: float = 1.5,
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        adaptive: bool = True,
+        weights: Optional[Mapping[Priority, int]] = None,
+        reserved_fraction: float = 0.2,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.adaptive = adaptive
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._long_alpha = 2.0 / (long_window + 1)
+        self._long_rtt: Optional[float] = None
+        self._short_rtt: Optional[float] = None
+        self.reserved_fraction = reserved_fraction
+        self._inflight = 0
+        self._inflight_by_lane: Dict[Priority, int] = dict.fromkeys(Priority, 0)
+        self._waiters: Dict[Priority, Deque[asyncio.Future]] = {
+            priority: deque() for priority in Priority
+        }
+        weights = weights or DEFAULT_LANE_WEIGHTS
+        self._stride = {priority: 1.0 / max(weights.get(priority, 1), 1) for priority in Priority}
+        self._pass: Dict[Priority, float] = dict.fromkeys(Priority, 0.0)
+        self._virtual_time = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def expected_rtt(self) -> float:
+        """Recent smoothed round-trip time, 0 before the first sample"""
+        return self._short_rtt or 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @property
+    def reserved(self) -> int:
+        """Slots only the HIGH lane may use"""
+        return min(self.limit - 1, math.ceil(self.limit * self.reserved_fraction))
+
+    @asynccontextmanager
+    async def acquire(
+        self, priority: Optional[Priority] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[LimiterPermit]:
+        """Wait for an in-flight slot and hold it for the duration of the block
+
+        Without an explicit priority the lane of the current context is used.
+        Raises TimeoutError if no slot frees up within ``timeout`` seconds.
+        """
+        priority = Priority(priority) if priority is not None else current_priority()
+        async with asyncio.timeout(timeout):
+            await self._wait_for_slot(priority)
+        permit = LimiterPermit(priority)
+        try:
+            yield permit
+        finally:
+            self._release(permit)
+
+    def _can_admit(self, priority: Priority) -> bool:
+        if self._inflight >= self.limit:
+            return False
+        if priority == Priority.HIGH:
+            return True
+        shared_inflight = self._inflight - self._inflight_by_lane[Priority.HIGH]
+        return shared_inflight < self.limit - self.reserved
+
+    def _admit(self, priority: Priority) -> None:
+        self._inflight += 1
+        self._inflight_by_lane[priority] += 1
+        self._virtual_time = max(self._virtual_time, self._pass[priority])
+        self._pass[priority] += self._stride[priority]
+
+    async def _wait_for_slot(self, priority: Priority) -> None:
+        if not self._waiters[priority] and self._can_admit(priority):
+            self._admit(priority)
+            return
+
+        if not self._waiters[priority]:
+            # An idle lane must not bank credit while it had nothing to send
+            self._pass[priority] = max(self._pass[priority], self._virtual_time)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation landed
+                self._inflight -= 1
+                self._inflight_by_lane[priority] -= 1
+                self._wake_waiters()
+            elif future in self._waiters[priority]:
+                self._waiters[priority].remove(future)
+            raise
+
+    def _wake_waiters(self) -> None:
+        while True:
+            lanes = [
+                priority
+                for priority in Priority
+                if self._waiters[priority] and self._can_admit(priority)
+            ]
+            if not lanes:
+                return
+
+            priority = min(lanes, key=lambda lane: (self._pass[lane], lane))
+            future = self._waiters[priority].popleft()
+            if future.done():
+                continue
+            self._admit(priority)
+            future.set_result(None)
+
+    def _release(self, permit: LimiterPermit) -> None:
+        self._inflight -= 1
+        self._inflight_by_lane[permit.priority] -= 1
+        if permit.outcome == "success":
+            self._on_sample(time.monotonic() - permit.started)
+        elif permit.outcome == "dropped":
+            self._on_drop()
+        self._wake_waiters()
+
+    def _on_sample(self, rtt: float) -> None:
+        if rtt <= 0:
+            return
+
+        if self._long_rtt is None:
+            self._long_rtt = self._short_rtt = rtt
+            return
+
+        # Tracked with a fixed limit too, expected_rtt feeds the deadline checks
+        self._short_rtt = 0.5 * self._short_rtt + 0.5 * rtt
+        self._long_rtt += self._long_alpha * (rtt - self._long_rtt)
+        # Let the baseline recover quickly once a latency spike is over
+        if self._long_rtt > 2 * self._short_rtt:
+            self._long_rtt *= 0.95
+        if not self.adaptive:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / self._short_rtt))
+        # Only grow when the current limit is actually being used
+        if gradient == 1.0 and self._inflight + 1 < self._limit / 2:
+            return
+
+        target = self._limit * gradient + math.sqrt(self._limit)
+        self._set_limit(self._limit * (1 - self.smoothing) + target * self.smoothing)
+
+    def _on_drop(self) -> None:
+        if self.adaptive:
+            self._set_limit(self._limit * self.backoff_ratio)
+
+    def _set_limit(self, value: float) -> None:
+        previous = self.limit
+        self._limit = min(max(value, self.min_limit), self.max_limit)
+        if self.limit != previous:
+            logger.debug(
+                "Concurrency limit %s -> %s (in flight %s, queued %s)",
+                previous,
+                self.limit,
+                self._inflight,
+                self.queued,
+            )
+
+
+def build_limiter() -> AdaptiveLimiter:
+    """Create the limiter configured by the CONCURRENCY_* settings"""
+    if not settings.CONCURRENCY_ADAPTIVE:
+        return AdaptiveLimiter(
+            initial_limit=settings.MAX_CONNECTIONS,
+            max_limit=settings.MAX_CONNECTIONS,
+            adaptive=False,
+            reserved_fraction=settings.CONCURRENCY_HIGH_PRIORITY_RESERVED,
+        )
+
+    return AdaptiveLimiter(
+        initial_limit=settings.CONCURRENCY_INITIAL_LIMIT or settings.MAX_CONNECTIONS,
+        min_limit=settings.CONCURRENCY_MIN_LIMIT,
+        max_limit=settings.MAX_CONNECTIONS,
+        tolerance=settings.CONCURRENCY_RTT_TOLERANCE,
+        backoff_ratio=settings.CONCURRENCY_BACKOFF_RATIO,
+        reserved_fraction=settings.CONCURRENCY_HIGH_PRIORITY_RESERVED,
+    )
@@ -0,0 +1,65 @@
+"""Per-request statistics and cumulative client metrics"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RequestStats:
+    """Statistics for a single HTTP exchange"""
+
+    method: str
+    endpoint: str
+    status: int
+    elapsed: float
+    request_bytes: int = 0
+    request_wire_bytes: int = 0
+    request_encoding: Optional[str] = None
+    response_bytes: int = 0
+    response_wire_bytes: int = 0
+    response_encoding: Optional[str] = None
+    http_version: str = "1.1"
+
+    @property
+    def request_ratio(self) -> float:
+        """Wire size relative to the uncompressed request body (1.0 = uncompressed)"""
+        return self.request_wire_bytes / self.request_bytes if self.request_bytes else 1.0
+
+    @property
+    def response_ratio(self) -> float:
+        """Wire size relative to the decoded response body (1.0 = uncompressed)"""
+        return self.response_wire_bytes / self.response_bytes if self.response_bytes else 1.0
+
+
+@dataclass
+class ClientMetrics:
+    """Cumulative counters for an HTTPClient"""
+
+    requests: int = 0
+    request_bytes: int = 0
+    request_wire_bytes: int = 0
+    response_bytes: int = 0
+    response_wire_bytes: int = 0
+    hedges_sent: int = 0
+    hedges_won: int = 0
+
+    def record(self, stats: RequestStats) -> None:
+        self.requests += 1
+        self.request_bytes += stats.request_bytes
+        self.request_wire_bytes += stats.request_wire_bytes
+        self.response_bytes += stats.response_bytes
+        self.response_wire_bytes += stats.response_wire_bytes
+
+    @property
+    def hedge_rate(self) -> float:
+        """Hedged requests as a fraction of all requests"""
+        return self.hedges_sent / self.requests if self.requests else 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return (
+            self.request_bytes
+            - self.request_wire_bytes
+            + self.response_bytes
+            - self.response_wire_bytes
+        )
@@ -0,0 +1,302 @@
+"""Pluggable HTTP transports used by HTTPClient"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+)
+
+import aiohttp
+
+from .config import settings
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def _iter_view(view: memoryview) -> Iterator[bytes]:
+    for start in range(0, len(view), settings.STREAM_CHUNK_SIZE):
+        yield bytes(view[start : start + settings.STREAM_CHUNK_SIZE])
+
+
+class TransportError(Exception):
+    """Raised when a request fails before an HTTP response is received"""
+
+
+@dataclass
+class TransportResponse:
+    """Fully read HTTP response, independent of the transport library"""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    wire_size: Optional[int] = None
+    http_version: str = "1.1"
+
+
+@dataclass
+class StreamingResponse:
+    """HTTP response whose body is consumed incrementally"""
+
+    status: int
+    headers: Mapping[str, str]
+    chunks: AsyncIterator[bytes]
+    read: Callable[[], Awaitable[bytes]]
+
+
+class Transport(ABC):
+    """Sends a single HTTP request; retries and error mapping stay in HTTPClient"""
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None):
+        self.default_headers = default_headers or {}
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> TransportResponse:
+        """Send a request and read the whole (decoded) response body"""
+
+    @abstractmethod
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        **kwargs,
+    ) -> AsyncContextManager[StreamingResponse]:
+        """Send a request and expose the response body as a chunk iterator
+
+        The overall timeout does not apply; each read is bounded by REQUEST_TIMEOUT.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release pooled connections"""
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 transport over an aiohttp connection pool"""
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None):
+        super().__init__(default_headers)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Get or create aiohttp session"""
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT)
+            connector = aiohttp.TCPConnector(
+                limit=settings.MAX_CONNECTIONS,
+                keepalive_timeout=settings.KEEPALIVE_TIMEOUT,
+            )
+
+            self._session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers=self.default_headers,
+            )
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> TransportResponse:
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with self.session.request(
+                method=method,
+                url=url,
+                data=content,
+                params=params,
+                headers=headers,
+                **kwargs,
+            ) as response:
+                body = b"" if response.status == 304 else await response.read()
+                wire_size = response.content_length
+                if not response.headers.get("Content-Encoding"):
+                    wire_size = len(body)
+                return TransportResponse(
+                    status=response.status,
+                    headers=response.headers,
+                    body=body,
+                    wire_size=wire_size,
+                    http_version=f"{response.version.major}.{response.version.minor}",
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransportError(str(e) or e.__class__.__name__) from e
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamingResponse]:
+        kwargs.setdefault(
+            "timeout", aiohttp.ClientTimeout(total=None, sock_read=settings.REQUEST_TIMEOUT)
+        )
+        try:
+            async with self.session.request(
+                method=method,
+                url=url,
+                data=content,
+                params=params,
+                headers=headers,
+                **kwargs,
+            ) as response:
+                yield StreamingResponse(
+                    status=response.status,
+                    headers=response.headers,
+                    chunks=response.content.iter_chunked(settings.STREAM_CHUNK_SIZE),
+                    read=response.read,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransportError(str(e) or e.__class__.__name__) from e
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
+
+class HttpxTransport(Transport):
+    """HTTP/2 transport multiplexing requests over a few httpx connections"""
+
+    def __init__(self, default_headers: Optional[Dict[str, str]] = None, http2: bool = True):
+        if httpx is None:
+            raise ImportError("HttpxTransport requires httpx[http2] to be installed")
+        super().__init__(default_headers)
+        self.http2 = http2
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=self.default_headers,
+                timeout=settings.REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP2_MAX_CONNECTIONS,
+                    keepalive_expiry=settings.KEEPALIVE_TIMEOUT,
+                ),
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> TransportResponse:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if isinstance(content, memoryview):
+            # Stream zero-copy views (e.g. of an mmap) instead of copying them whole
+            headers = {**(headers or {}), "Content-Length": str(len(content))}
+            content = _iter_view(content)
+
+        try:
+            response = await self.client.request(
+                method,
+                url,
+                content=content,
+                params=params,
+                headers=headers,
+                **kwargs,
+            )
+        except httpx.TransportError as e:
+            raise TransportError(str(e) or e.__class__.__name__) from e
+
+        body = response.content
+        wire_size = response.num_bytes_downloaded
+        return TransportResponse(
+            status=response.status_code,
+            headers=response.headers,
+            body=body,
+            wire_size=wire_size,
+            http_version=response.http_version.removeprefix("HTTP/"),
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamingResponse]:
+        try:
+            async with self.client.stream(
+                method,
+                url,
+                content=content,
+                params=params,
+                headers=headers,
+                **kwargs,
+            ) as response:
+                yield StreamingResponse(
+                    status=response.status_code,
+                    headers=response.headers,
+                    chunks=response.aiter_bytes(settings.STREAM_CHUNK_SIZE),
+                    read=response.aread,
+                )
+        except httpx.TransportError as e:
+            raise TransportError(str(e) or e.__class__.__name__) from e
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            self._client = None
+
+
+def build_transport(default_headers: Dict[str, str]) -> Transport:
+    """Create the transport selected by HTTP_TRANSPORT"""
+    if settings.HTTP_TRANSPORT == "httpx":
+        return HttpxTransport(default_headers)
+    return AiohttpTransport(default_headers)
@@ -3,7 +3,10 @@
 from .applications import ApplicationCRUDService
 from .balances import BalanceCRUDService
 from .base import BaseCRUD
+from .checkpoints import CheckpointStore, FileCheckpointStore, SQLiteCheckpointStore
+from .export import CSVWriter, ExportStats, ExportWriter, NDJSONWriter, ParquetWriter
 from .files import FileCRUDService
+from .pagination import Cursor, CursorPage
 from .punishments import PunishmentsCRUDService
 from .purchases import PurchasesCRUDService
 from .roles import RoleCRUDService
@@ -15,6 +18,16 @@ from .webhooks import WebhookCRUDService
 __all__ = [
     # Base CRUD
     "BaseCRUD",
+    "Cursor",
+    "CursorPage",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "SQLiteCheckpointStore",
+    "ExportStats",
+    "ExportWriter",
+    "NDJSONWriter",
+    "CSVWriter",
+    "ParquetWriter",
     # Main CRUD Services
     "ApplicationCRUDService",
     "PunishmentsCRUDService",
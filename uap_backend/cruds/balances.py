@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from uaproject_backend_schemas.models.balance import Balance
 
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
         BalanceSchemaResponse,
         BalanceSchemaUpdate,
     )
+
+    from uap_backend.replica.aggregates import MaterializedAggregates
 else:
     BalanceSchemaCreate = Balance.schemas.create
     BalanceSchemaResponse = Balance.schemas.response
@@ -21,13 +23,27 @@ else:
 class BalanceCRUDService(
     BaseCRUD[BalanceSchemaResponse, BalanceSchemaCreate, BalanceSchemaUpdate, BalanceFilter]
 ):
+    # Materialized totals, attached by MaterializedAggregates.start()
+    aggregates: Optional["MaterializedAggregates"] = None
+
     def __init__(self):
         super().__init__("/balances", "balance")
 
     async def get_by_identifier(self, identifier: str, **kwargs) -> BalanceSchemaResponse:
         """Get balance by identifier"""
+        if self.replica is not None and self.replica.can_lookup("identifier") and not kwargs:
+            balance = self.replica.lookup_one("identifier", identifier)
+            if balance is not None:
+                return balance
         return await self._request("GET", f"/identifier/{identifier}", **kwargs)
 
-    async def get_user_total(self, user_id: int, **kwargs) -> BalanceSchemaResponse:
-        """Get total balance for user"""
-        return await self._request("GET", f"/user/{user_id}/total", **kwargs)
+    async def get_user_total(self, user_id: int, **kwargs) -> Dict[str, Any]:
+        """Get total balance for user, answered by the materialized view when running"""
+        if self.aggregates is not None and self.aggregates.ready and not kwargs:
+            total = self.aggregates.user_total(user_id)
+            if total is not None:
+                return total
+        response = await self._request("GET", f"/user/{user_id}/total", **kwargs)
+        if self.aggregates is not None and not kwargs:
+            self.aggregates.observe("user_total", response)
+        return response
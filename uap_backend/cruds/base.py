@@ -1,19 +1,56 @@
-"""Enhanced BaseCRUD following backend patterns without caching"""
-
-import logging
-from typing import Any, Dict, Generic, List, Optional, Type, Union
+"""Enhanced BaseCRUD following backend patterns with optional response caching"""
+
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
 
+from pydantic import BaseModel
 from uaproject_backend_schemas.base import (
     CreateSchemaType,
     FilterSchemaType,
     ModelType,
+    SortOrder,
     UpdateSchemaType,
 )
 
 from uap_backend.core.client import HTTPClient
-from uap_backend.core.errors import CRUDNotFoundError, CRUDValidationError
+from uap_backend.core.config import settings
+from uap_backend.core.deadline import deadline_scope
+from uap_backend.core.errors import (
+    CRUDNotFoundError,
+    CRUDValidationError,
+    DeadlineExceededError,
+)
+from uap_backend.core.limiter import Priority
+from uap_backend.logger import get_logger
+
+from .checkpoints import CheckpointStore, default_checkpoint_store
+from .export import ExportStats, ExportWriter, build_writer, detect_format
+from .pagination import Cursor, CursorPage, group_ties
+from .projection import normalize_fields, partial_model
 
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from uap_backend.replica import CollectionReplica
+
+logger = get_logger(__name__)
 
 
 class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSchemaType]):
@@ -22,6 +59,21 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
     # Singleton pattern - use class type as key (like backend)
     _instances: Dict[Type, "BaseCRUD"] = {}
 
+    # Seconds reads stay fresh in the response cache, None falls back to CACHE_TTL
+    cache_ttl: Optional[float] = None
+
+    # Lane for this service's requests, None uses the lane of the calling context
+    priority: Optional[Priority] = None
+
+    # Hedge slow single-object reads, None falls back to HEDGE_REQUESTS
+    hedge: Optional[bool] = None
+
+    # Default sort key for cursor pagination; non-unique keys are tie-broken by id
+    cursor_field: str = "id"
+
+    # Modification timestamp followed by changes_since()
+    updated_field: str = "updated_at"
+
     def __new__(cls, *args, **kwargs):
         """Singleton pattern implementation like backend BaseCRUD"""
         if cls in cls._instances:
@@ -39,9 +91,10 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         self.endpoint = endpoint.rstrip("/")
         self.model_name = model_name or self.__class__.__name__.replace("CRUDService", "").lower()
         self._client: Optional[HTTPClient] = None
+        self.replica: Optional["CollectionReplica"] = None
         self._initialized = True
 
-        logger.debug(f"Initialized {self.__class__.__name__} for endpoint: {self.endpoint}")
+        logger.debug("Initialized %s for endpoint: %s", self.__class__.__name__, self.endpoint)
 
     @property
     def client(self) -> HTTPClient:
@@ -50,6 +103,33 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
             self._client = HTTPClient()
         return self._client
 
+    def _get_cache_ttl(self) -> float:
+        return self.cache_ttl if self.cache_ttl is not None else settings.CACHE_TTL
+
+    def _get_priority(self, priority: Optional[Priority] = None) -> Optional[Priority]:
+        return priority if priority is not None else self.priority
+
+    @classmethod
+    def _response_model(cls) -> Optional[Type[BaseModel]]:
+        """Response schema taken from the BaseCRUD[...] parameters of the service"""
+        for klass in cls.__mro__:
+            for base in getattr(klass, "__orig_bases__", ()):
+                if get_origin(base) is BaseCRUD:
+                    model = get_args(base)[0]
+                    if isinstance(model, type) and issubclass(model, BaseModel):
+                        return model
+        return None
+
+    def _projection(
+        self, fields: Optional[Iterable[str]]
+    ) -> Tuple[Optional[Tuple[str, ...]], Optional[Type[BaseModel]]]:
+        """Normalized field names and the partial model validating them"""
+        fields = normalize_fields(fields)
+        if fields is None:
+            return None, None
+        model = self._response_model()
+        return fields, partial_model(model, fields) if model is not None else None
+
     def _build_endpoint(self, path: str = "") -> str:
         """Build full endpoint path"""
         if path.startswith("/"):
@@ -90,27 +170,76 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
             raise CRUDValidationError(f"Invalid data type: {type(data)}")
 
     # CRUD Operations
-    async def get(self, obj_id: Union[int, str], **kwargs) -> Dict[str, Any]:
-        """Get single object by ID"""
+    async def get(
+        self,
+        obj_id: Union[int, str],
+        priority: Optional[Priority] = None,
+        fields: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> Union[Dict[str, Any], BaseModel]:
+        """Get single object by ID
+
+        With ``fields`` only those attributes are requested and the result is a
+        partial response model instead of a dict.
+        """
+        fields, model = self._projection(fields)
+
+        if self.replica is not None and self.replica.ready and not kwargs:
+            record = self.replica.get(obj_id)
+            if record is not None:
+                return model.model_validate(record) if model is not None else record
+
         endpoint = self._build_endpoint(str(obj_id))
+        kwargs.setdefault("cache_ttl", self._get_cache_ttl())
+        kwargs.setdefault("hedge", self.hedge)
+        if fields is not None:
+            kwargs["params"] = {**kwargs.get("params", {}), "fields": ",".join(fields)}
 
         try:
-            return await self.client.get(endpoint, **kwargs)
+            response = await self.client.get(
+                endpoint, priority=self._get_priority(priority), **kwargs
+            )
+            return model.model_validate(response) if model is not None else response
         except Exception as e:
             if "404" in str(e) or "not found" in str(e).lower():
                 raise CRUDNotFoundError(self.model_name, obj_id)
             raise
 
     async def get_many(
-        self, filters: Optional[FilterSchemaType] = None, skip: int = 0, limit: int = 50, **kwargs
-    ) -> List[Dict[str, Any]]:
-        """Get multiple objects with filtering and pagination"""
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        skip: int = 0,
+        limit: int = 50,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        fields: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> List[Union[Dict[str, Any], BaseModel]]:
+        """Get multiple objects with filtering and pagination
+
+        With ``fields`` the items are partial response models holding only those.
+        """
+        fields, model = self._projection(fields)
+        if fields is not None:
+            kwargs["fields"] = ",".join(fields)
         params = self._prepare_filters(filters, skip=skip, limit=limit, **kwargs)
         endpoint = self._build_endpoint()
 
-        response = await self.client.get(endpoint, params=params)
-
-        # Handle different response formats
+        response = await self.client.get(
+            endpoint,
+            params=params,
+            cache_ttl=self._get_cache_ttl(),
+            priority=self._get_priority(priority),
+            deadline=deadline,
+        )
+        items = self._extract_items(response)
+        if model is not None:
+            return [model.model_validate(item) for item in items]
+        return items
+
+    @staticmethod
+    def _extract_items(response: Any) -> List[Dict[str, Any]]:
+        """Normalize the list response formats used by the backend"""
         if isinstance(response, list):
             return response
         elif isinstance(response, dict):
@@ -119,12 +248,348 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         else:
             return []
 
+    async def get_page(
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        order_by: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        fields: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> CursorPage:
+        """Get the page after ``cursor`` using keyset pagination
+
+        Rows are ordered by ``order_by`` (default ``cursor_field``) with ties broken
+        by id, and selected with ``<field>__gt`` range filters instead of an offset,
+        so every page costs the same and concurrent writes cannot shift rows between
+        pages. Pages may hold fewer than ``limit`` rows (the backend can cap it), so
+        ``has_more`` only turns False once nothing is left after the cursor.
+        """
+        position = Cursor.decode(cursor) if cursor else Cursor(order_by or self.cursor_field)
+        if order_by and order_by != position.field:
+            raise CRUDValidationError("Cursor was created for a different sort field", "cursor")
+
+        if fields is not None:
+            # The cursor needs the sort key and id of every row
+            fields = [*normalize_fields(fields), position.field, position.key]
+        fields, model = self._projection(fields)
+        if fields is not None:
+            kwargs["fields"] = ",".join(fields)
+
+        if position.is_unique:
+            items = await self._keyset_query(
+                filters, position.after_params(), position.field, limit, priority, kwargs
+            )
+            # Backends may cap ``limit``, so only an empty page ends the walk
+            has_more = bool(items)
+        else:
+            items, has_more = await self._tied_page(filters, position, limit, priority, kwargs)
+
+        return CursorPage(
+            items=[model.model_validate(item) for item in items] if model is not None else items,
+            cursor=position.advance(items).encode(),
+            has_more=has_more,
+        )
+
+    async def _keyset_query(
+        self,
+        filters: Optional[FilterSchemaType],
+        range_params: Dict[str, Any],
+        sort_by: str,
+        limit: int,
+        priority: Optional[Priority],
+        kwargs: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        params = self._prepare_filters(
+            filters, limit=limit, sort_by=sort_by, order=SortOrder.ASC, **range_params, **kwargs
+        )
+        response = await self.client.get(
+            self._build_endpoint(), params=params, priority=self._get_priority(priority)
+        )
+        return self._extract_items(response)
+
+    async def _tied_page(
+        self,
+        filters: Optional[FilterSchemaType],
+        position: Cursor,
+        limit: int,
+        priority: Optional[Priority],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Next page ordered by ``(field, id)`` when ``field`` is not unique
+
+        The rest of the cursor's group of ties is read first, sorted by id. Once it
+        is exhausted, the rows past the cursor value are read; only complete groups
+        are taken from those, since a page (capped by ``limit`` or by the backend)
+        can end in the middle of a group. A page made of a single group is walked
+        by id from its start instead.
+        """
+        if position.value is not None:
+            items = await self._keyset_query(
+                filters, position.tie_params(), position.key, limit, priority, kwargs
+            )
+            if items:
+                return items[:limit], True
+
+        rows = await self._keyset_query(
+            filters, position.after_params(), position.field, limit, priority, kwargs
+        )
+        if not rows:
+            return [], False
+
+        groups = group_ties(rows, position.field, position.key)
+        complete = [row for group in groups[:-1] for row in group]
+        if complete:
+            return complete, True
+        start = Cursor(position.field, groups[-1][0].get(position.field), None, position.key)
+        group = await self._keyset_query(
+            filters, start.tie_params(), position.key, limit, priority, kwargs
+        )
+        return group[:limit], True
+
+    async def iter_pages(
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        order_by: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[CursorPage]:
+        """Walk the whole collection page by page, resumable from any page's cursor"""
+        while True:
+            page = await self.get_page(
+                filters, cursor=cursor, limit=page_size, order_by=order_by, **kwargs
+            )
+            if page.items:
+                yield page
+            if not page.has_more:
+                return
+            cursor = page.cursor
+
+    async def iter_all(
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        order_by: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every object matching ``filters`` using keyset pagination"""
+        async for page in self.iter_pages(
+            filters, cursor=cursor, page_size=page_size, order_by=order_by, **kwargs
+        ):
+            for item in page.items:
+                yield item
+
+    async def changes_since(
+        self,
+        checkpoint: str,
+        filters: Optional[FilterSchemaType] = None,
+        since: Optional[datetime] = None,
+        store: Optional[CheckpointStore] = None,
+        page_size: int = 100,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield objects changed after the named checkpoint, advancing it as they are read
+
+        The high-water mark on ``(updated_field, id)`` is saved after each page has
+        been fully consumed, so an interrupted job re-reads at most one page and
+        objects sharing a timestamp are neither skipped nor repeated. ``since``
+        seeds a checkpoint that has never been saved and includes objects updated
+        exactly at ``since``; otherwise the first run reads everything.
+        """
+        store = store or default_checkpoint_store()
+        name = f"{self.model_name}:{checkpoint}"
+
+        cursor = await store.load(name)
+        if cursor is None and since is not None:
+            cursor = Cursor(self.updated_field, since.isoformat()).encode()
+
+        while True:
+            page = await self.get_page(
+                filters, cursor=cursor, limit=page_size, order_by=self.updated_field, **kwargs
+            )
+            for item in page.items:
+                yield item
+
+            if page.items:
+                cursor = page.cursor
+                await store.save(name, cursor)
+            if not page.has_more:
+                return
+
+    async def stream_many(
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        priority: Optional[Priority] = None,
+        fields: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> AsyncIterator[Union[Dict[str, Any], BaseModel]]:
+        """Yield objects one by one while the list response is still downloading
+
+        With ``fields`` each item is validated into a partial model straight from
+        its raw JSON bytes.
+        """
+        fields, model = self._projection(fields)
+        if fields is not None:
+            kwargs["fields"] = ",".join(fields)
+        params = self._prepare_filters(filters, skip=skip, limit=limit, **kwargs)
+        async for item in self._stream(
+            params=params, priority=self._get_priority(priority), model=model
+        ):
+            yield item
+
+    async def export(
+        self,
+        path: str,
+        format: Optional[str] = None,
+        filters: Optional[FilterSchemaType] = None,
+        fields: Optional[Iterable[str]] = None,
+        checkpoint: Optional[str] = None,
+        store: Optional[CheckpointStore] = None,
+        page_size: Optional[int] = None,
+        writer: Optional[ExportWriter] = None,
+        progress: Optional[Callable[[ExportStats], Any]] = None,
+        **kwargs,
+    ) -> ExportStats:
+        """Write every object matching ``filters`` to ``path`` as NDJSON, CSV or Parquet
+
+        Pages are fetched with keyset pagination into a bounded queue while the
+        previous ones are serialized in a worker thread, so network and disk
+        overlap and memory stays at a few pages. With ``checkpoint`` the file is
+        synced and the position saved after every page; a rerun with the same
+        name truncates the partial page and continues. Progress is logged every
+        EXPORT_PROGRESS_INTERVAL seconds and passed to ``progress``.
+
+        Example:
+            stats = await TransactionCRUDService().export("tx.csv", checkpoint="monthly")
+        """
+        format = format or detect_format(path)
+        fields = normalize_fields(fields)
+        writer = writer or build_writer(format, path, fields, model=self._response_model())
+        page_size = page_size or settings.EXPORT_PAGE_SIZE
+        kwargs.setdefault("priority", Priority.LOW)
+
+        store = (store or default_checkpoint_store()) if checkpoint else None
+        name = f"export:{self.model_name}:{checkpoint}"
+        state = await self._load_export_state(store, name, writer, format, path)
+
+        stats = ExportStats()
+        if state is not None:
+            stats.rows = stats.resumed_rows = state["rows"]
+            logger.info(
+                "Resuming export of %s to %s after %s rows", self.model_name, path, stats.rows
+            )
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EXPORT_QUEUE_SIZE)
+        pages = self.iter_pages(
+            filters,
+            cursor=state["cursor"] if state is not None else None,
+            page_size=page_size,
+            fields=fields,
+            **kwargs,
+        )
+
+        await asyncio.to_thread(writer.open, state.get("writer") if state is not None else None)
+        producer = asyncio.create_task(self._produce_pages(pages, queue))
+        try:
+            await self._write_pages(queue, writer, stats, store, name, progress)
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+            await asyncio.to_thread(writer.close)
+
+        stats.bytes = writer.tell()
+        if store is not None:
+            await store.delete(name)
+        logger.info(
+            "Exported %s rows of %s to %s in %.1fs (%.0f rows/s)",
+            stats.rows,
+            self.model_name,
+            path,
+            stats.elapsed,
+            stats.rows_per_second,
+        )
+        if progress is not None:
+            progress(stats)
+        return stats
+
+    @staticmethod
+    async def _load_export_state(
+        store: Optional[CheckpointStore],
+        name: str,
+        writer: ExportWriter,
+        format: str,
+        path: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Position saved by an interrupted export, None to start from scratch"""
+        saved = await store.load(name) if store is not None else None
+        if not saved:
+            return None
+        if not writer.resumable:
+            logger.warning("%s exports cannot be resumed, restarting %s", format, path)
+            return None
+        return json.loads(saved)
+
+    @staticmethod
+    async def _produce_pages(pages: AsyncIterator[CursorPage], queue: asyncio.Queue) -> None:
+        try:
+            async for page in pages:
+                await queue.put(page)
+            await queue.put(None)
+        except Exception as e:
+            # Handed to the consumer so it fails instead of waiting forever
+            await queue.put(e)
+
+    async def _write_pages(
+        self,
+        queue: asyncio.Queue,
+        writer: ExportWriter,
+        stats: ExportStats,
+        store: Optional[CheckpointStore],
+        name: str,
+        progress: Optional[Callable[[ExportStats], Any]],
+    ) -> None:
+        """Serialize queued pages, checkpointing after each one when ``store`` is set"""
+        last_report = time.monotonic()
+        while (page := await queue.get()) is not None:
+            if isinstance(page, Exception):
+                raise page
+            await asyncio.to_thread(writer.write, page.items)
+            stats.rows += len(page.items)
+            stats.pages += 1
+
+            if store is not None:
+                await asyncio.to_thread(writer.sync)
+                position = {"cursor": page.cursor, "rows": stats.rows, "writer": writer.state()}
+                await store.save(name, json.dumps(position))
+
+            if time.monotonic() - last_report >= settings.EXPORT_PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                stats.bytes = writer.tell()
+                logger.info(
+                    "Exporting %s: %s rows, %.0f rows/s",
+                    self.model_name,
+                    stats.rows,
+                    stats.rows_per_second,
+                )
+                if progress is not None:
+                    progress(stats)
+
     async def create(
         self, data: Union[CreateSchemaType, Dict[str, Any]], **kwargs
     ) -> Dict[str, Any]:
         """Create new object"""
         endpoint = self._build_endpoint()
         prepared_data = self._prepare_data(data)
+        kwargs.setdefault("priority", self.priority)
 
         return await self.client.post(endpoint, data=prepared_data, **kwargs)
 
@@ -134,6 +599,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         """Update existing object"""
         endpoint = self._build_endpoint(str(obj_id))
         prepared_data = self._prepare_data(data)
+        kwargs.setdefault("priority", self.priority)
 
         try:
             return await self.client.patch(endpoint, data=prepared_data, **kwargs)
@@ -145,6 +611,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
     async def delete(self, obj_id: Union[int, str], **kwargs) -> bool:
         """Delete object by ID"""
         endpoint = self._build_endpoint(str(obj_id))
+        kwargs.setdefault("priority", self.priority)
 
         try:
             await self.client.delete(endpoint, **kwargs)
@@ -163,20 +630,39 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         except CRUDNotFoundError:
             return False
 
-    async def count(self, filters: Optional[FilterSchemaType] = None, **kwargs) -> int:
-        """Count objects matching filters"""
+    async def count(
+        self,
+        filters: Optional[FilterSchemaType] = None,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ) -> int:
+        """Count objects matching filters
+
+        ``deadline`` bounds the count request and the fallback listing together.
+        """
         params = self._prepare_filters(filters, **kwargs)
         endpoint = self._build_endpoint("count")
 
-        try:
-            response = await self.client.get(endpoint, params=params)
-            if isinstance(response, dict):
-                return response.get("count", 0)
-            return int(response)
-        except Exception:
-            # Fallback: get all and count
-            items = await self.get_many(filters=filters, limit=1000, **kwargs)
-            return len(items)
+        # One absolute deadline for both calls, so the fallback gets no fresh budget
+        with deadline_scope(deadline) if deadline is not None else nullcontext():
+            try:
+                response = await self.client.get(
+                    endpoint,
+                    params=params,
+                    priority=self._get_priority(priority),
+                )
+                if isinstance(response, dict):
+                    return response.get("count", 0)
+                return int(response)
+            except DeadlineExceededError:
+                raise
+            except Exception:
+                # Fallback: get all and count
+                items = await self.get_many(
+                    filters=filters, limit=1000, priority=priority, **kwargs
+                )
+                return len(items)
 
     # Advanced operations
     async def bulk_create(
@@ -185,6 +671,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         """Create multiple objects"""
         endpoint = self._build_endpoint("bulk")
         prepared_data = [self._prepare_data(data) for data in data_list]
+        kwargs.setdefault("priority", self.priority)
 
         return await self.client.post(endpoint, data={"items": prepared_data}, **kwargs)
 
@@ -195,12 +682,14 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
     ) -> List[Dict[str, Any]]:
         """Update multiple objects"""
         endpoint = self._build_endpoint("bulk")
+        kwargs.setdefault("priority", self.priority)
 
         return await self.client.patch(endpoint, data={"items": updates}, **kwargs)
 
     async def bulk_delete(self, obj_ids: List[Union[int, str]], **kwargs) -> bool:
         """Delete multiple objects"""
         endpoint = self._build_endpoint("bulk")
+        kwargs.setdefault("priority", self.priority)
 
         await self.client.delete(endpoint, data={"ids": obj_ids}, **kwargs)
         return True
@@ -216,6 +705,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
     ) -> Dict[str, Any]:
         """Make custom request to specific endpoint"""
         endpoint = self._build_endpoint(path)
+        kwargs.setdefault("priority", self.priority)
 
         if method.upper() == "GET":
             return await self.client.get(endpoint, params=params, **kwargs)
@@ -230,6 +720,15 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType, FilterSche
         else:
             raise CRUDValidationError(f"Unsupported HTTP method: {method}")
 
+    async def _stream(
+        self, path: str = "", params: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> AsyncIterator[Any]:
+        """Stream the items of a list endpoint without buffering the whole response"""
+        endpoint = self._build_endpoint(path)
+        kwargs.setdefault("priority", self.priority)
+        async for item in self.client.stream_list(endpoint, params=params, **kwargs):
+            yield item
+
     # Resource cleanup
     async def close(self):
         """Close HTTP client"""
@@ -0,0 +1,127 @@
+"""Persisted high-water marks for incremental change feeds"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional
+
+from uap_backend.core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class CheckpointStore(ABC):
+    """Durable mapping of checkpoint names to cursor tokens"""
+
+    @abstractmethod
+    async def load(self, name: str) -> Optional[str]:
+        """Return the saved token, None if the checkpoint was never saved"""
+
+    @abstractmethod
+    async def save(self, name: str, token: str) -> None:
+        """Persist the token; must be durable once this returns"""
+
+    async def delete(self, name: str) -> None:
+        """Forget a checkpoint so the next run starts from scratch"""
+
+    async def close(self) -> None:
+        """Release resources held by the store"""
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoints kept in one JSON file, replaced atomically on every save"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    async def load(self, name: str) -> Optional[str]:
+        return (await asyncio.to_thread(self._read)).get(name)
+
+    async def save(self, name: str, token: str) -> None:
+        await asyncio.to_thread(self._update, name, token)
+
+    async def delete(self, name: str) -> None:
+        await asyncio.to_thread(self._update, name, None)
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _update(self, name: str, token: Optional[str]) -> None:
+        with self._lock:
+            checkpoints = self._read()
+            if token is None:
+                checkpoints.pop(name, None)
+            else:
+                checkpoints[name] = token
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoints, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoints kept in a SQLite table, safe to share between processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    async def load(self, name: str) -> Optional[str]:
+        return await asyncio.to_thread(self._load, name)
+
+    async def save(self, name: str, token: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO checkpoints (name, token, updated_at) VALUES (?, ?, ?)",
+            (name, token, time.time()),
+        )
+
+    async def delete(self, name: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM checkpoints WHERE name = ?", (name,))
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT token FROM checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _execute(self, query: str, args: tuple) -> None:
+        with self._lock:
+            self._conn.execute(query, args)
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def default_checkpoint_store() -> CheckpointStore:
+    """Process-wide checkpoint store selected by CHECKPOINT_BACKEND"""
+    if settings.CHECKPOINT_BACKEND == "sqlite":
+        return SQLiteCheckpointStore(settings.CHECKPOINT_PATH)
+    return FileCheckpointStore(settings.CHECKPOINT_PATH)
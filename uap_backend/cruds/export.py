@@ -0,0 +1,315 @@
+"""Writers and progress tracking for streaming collection exports"""
+
+import csv
+import io
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from types import UnionType
+from typing import Any, Dict, List, Optional, Sequence, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from uap_backend.core.config import settings
+from uap_backend.core.errors import SerializationError
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+_SUFFIX_FORMATS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+
+def detect_format(path: str) -> str:
+    """Export format implied by the file extension"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in _SUFFIX_FORMATS:
+        raise ValueError(f"Cannot infer export format from '{path}', pass format explicitly")
+    return _SUFFIX_FORMATS[suffix]
+
+
+def _as_dict(item: Any) -> Dict[str, Any]:
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json", exclude_unset=True)
+    return item
+
+
+def _flat(value: Any) -> Any:
+    """Scalar cell value; nested objects and lists are stored as JSON text"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    return value
+
+
+@dataclass
+class ExportStats:
+    """Progress of a running export"""
+
+    rows: int = 0
+    pages: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+    # Rows already exported by the run this one resumed
+    resumed_rows: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return (self.rows - self.resumed_rows) / elapsed if elapsed > 0 else 0.0
+
+
+class ExportWriter(ABC):
+    """Serializes pages of records into one output file
+
+    ``write`` runs in a worker thread. A resumable writer can reopen its file at
+    a byte offset recorded by ``state()`` after a page was synced.
+    """
+
+    resumable = True
+
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None):
+        self.path = path
+        self.fields = list(fields) if fields else None
+
+    @abstractmethod
+    def open(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """Create the file, or reopen it where ``state`` says the last synced page ended"""
+
+    @abstractmethod
+    def write(self, records: List[Any]) -> None:
+        """Append one page of records"""
+
+    def state(self) -> Dict[str, Any]:
+        """What open() needs to resume after everything written so far"""
+        return {}
+
+    def tell(self) -> int:
+        """Bytes written so far"""
+        return 0
+
+    def sync(self) -> None:
+        """Make everything written so far durable"""
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+class _TextWriter(ExportWriter):
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None):
+        super().__init__(path, fields)
+        self._file: Optional[io.BufferedWriter] = None
+
+    def open(self, state: Optional[Dict[str, Any]] = None) -> None:
+        if state is None:
+            self._file = open(self.path, "wb")
+            return
+        self._file = open(self.path, "r+b")
+        # Drop whatever was written after the last checkpoint
+        self._file.truncate(state["offset"])
+        self._file.seek(state["offset"])
+
+    def state(self) -> Dict[str, Any]:
+        return {"offset": self.tell()}
+
+    def tell(self) -> int:
+        return self._file.tell() if self._file is not None else os.path.getsize(self.path)
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class NDJSONWriter(_TextWriter):
+    """One JSON object per line"""
+
+    def write(self, records: List[Any]) -> None:
+        lines = [
+            json.dumps(_as_dict(record), separators=(",", ":"), default=str)
+            for record in records
+        ]
+        if lines:
+            self._file.write(("\n".join(lines) + "\n").encode())
+
+
+class CSVWriter(_TextWriter):
+    """Comma-separated rows; columns are ``fields`` or the keys of the first record"""
+
+    def open(self, state: Optional[Dict[str, Any]] = None) -> None:
+        super().open(state)
+        if state is not None:
+            self.fields = state.get("columns") or self.fields
+
+    def state(self) -> Dict[str, Any]:
+        return {**super().state(), "columns": self.fields}
+
+    def write(self, records: List[Any]) -> None:
+        rows = [_as_dict(record) for record in records]
+        if not rows:
+            return
+
+        if self.fields is None:
+            self.fields = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fields, extrasaction="ignore")
+        if self.tell() == 0:
+            writer.writeheader()
+        writer.writerows({key: _flat(value) for key, value in row.items()} for row in rows)
+        self._file.write(buffer.getvalue().encode())
+
+
+class ParquetWriter(ExportWriter):
+    """Columnar Parquet file, written in row groups of ``row_group_size`` rows
+
+    Column types come from ``schema``; exports derive it from the service's
+    response model with ``schema_from_model``. Without one they are inferred
+    from the first row group (columns that are null there become strings).
+    Every value is then cast safely to its column type, so one that does not fit
+    (1.5 in an integer column, text in a number column) raises
+    SerializationError instead of being truncated. Parquet files cannot be
+    appended to, so this writer is not resumable.
+    """
+
+    resumable = False
+
+    def __init__(
+        self,
+        path: str,
+        fields: Optional[Sequence[str]] = None,
+        row_group_size: Optional[int] = None,
+        schema: Optional["pyarrow.Schema"] = None,
+    ):
+        if pyarrow is None:
+            raise ImportError("Parquet exports require pyarrow to be installed")
+        super().__init__(path, schema.names if schema is not None and not fields else fields)
+        self.row_group_size = row_group_size or settings.EXPORT_ROW_GROUP_SIZE
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer: Optional["pyarrow.parquet.ParquetWriter"] = None
+        self._schema = schema
+
+    def open(self, state: Optional[Dict[str, Any]] = None) -> None:
+        self._buffer = []
+
+    def write(self, records: List[Any]) -> None:
+        for record in records:
+            row = _as_dict(record)
+            if self.fields is None:
+                self.fields = list(row)
+            self._buffer.append({key: _flat(row.get(key)) for key in self.fields})
+        if len(self._buffer) >= self.row_group_size:
+            self._write_buffer()
+
+    def _column(
+        self, name: str, arrow_type: Optional["pyarrow.DataType"] = None
+    ) -> "pyarrow.Array":
+        """Buffered values of one column, cast to ``arrow_type`` without loss"""
+        values = [row.get(name) for row in self._buffer]
+        if arrow_type is not None and pyarrow.types.is_string(arrow_type):
+            values = [value if value is None else str(value) for value in values]
+        try:
+            array = pyarrow.array(values)
+            return array if arrow_type is None else array.cast(arrow_type, safe=True)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as e:
+            raise SerializationError(
+                f"Column '{name}' of {self.path} does not fit "
+                f"{arrow_type or 'a single type'}: {e}",
+                name,
+            )
+
+    def _infer_schema(self) -> "pyarrow.Schema":
+        columns = [(name, self._column(name).type) for name in self.fields]
+        return pyarrow.schema(
+            [
+                pyarrow.field(name, pyarrow.string() if pyarrow.types.is_null(type_) else type_)
+                for name, type_ in columns
+            ]
+        )
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        if self._schema is None:
+            self._schema = self._infer_schema()
+
+        arrays = [self._column(column.name, column.type) for column in self._schema]
+        table = pyarrow.Table.from_arrays(arrays, schema=self._schema)
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._buffer = []
+
+    def tell(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def close(self) -> None:
+        self._write_buffer()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _arrow_type(annotation: Any) -> "pyarrow.DataType":
+    """Column type of a field, as found in ``model_dump(mode="json")`` output"""
+    if get_origin(annotation) in (Union, UnionType):
+        members = [member for member in get_args(annotation) if member is not type(None)]
+        return _arrow_type(members[0]) if len(members) == 1 else pyarrow.string()
+    if isinstance(annotation, type):
+        # bool first, it is a subclass of int
+        for python_type, arrow_type in (
+            (bool, pyarrow.bool_()),
+            (int, pyarrow.int64()),
+            (float, pyarrow.float64()),
+        ):
+            if issubclass(annotation, python_type):
+                return arrow_type
+    # Strings, and what JSON mode renders as text: Decimal, dates, UUIDs, nested objects
+    return pyarrow.string()
+
+
+def schema_from_model(
+    model: Type[BaseModel], fields: Optional[Sequence[str]] = None
+) -> Optional["pyarrow.Schema"]:
+    """Parquet schema of ``fields`` (all by default) of a response model, None when
+    the model does not declare them"""
+    names = list(fields) if fields else list(model.model_fields)
+    if pyarrow is None or not names or not set(names) <= model.model_fields.keys():
+        return None
+    return pyarrow.schema(
+        [pyarrow.field(name, _arrow_type(model.model_fields[name].annotation)) for name in names]
+    )
+
+
+def build_writer(
+    format: str,
+    path: str,
+    fields: Optional[Sequence[str]] = None,
+    model: Optional[Type[BaseModel]] = None,
+) -> ExportWriter:
+    """Writer for one of EXPORT_FORMATS; ``model`` types the columns of Parquet files"""
+    if format == "ndjson":
+        return NDJSONWriter(path, fields)
+    if format == "csv":
+        return CSVWriter(path, fields)
+    if format == "parquet":
+        schema = schema_from_model(model, fields) if model is not None else None
+        return ParquetWriter(path, fields, schema=schema)
+    raise ValueError(f"Unknown export format '{format}', expected one of {list(EXPORT_FORMATS)}")
@@ -1,10 +1,13 @@
 """File CRUD Service based on OpenAPI analysis"""
 
-from typing import TYPE_CHECKING, List
+import os
+from typing import TYPE_CHECKING, Any, List, Optional, Union
 
 from uaproject_backend_schemas.models.file import File
 
 from uap_backend.cruds.base import BaseCRUD
+from uap_backend.transfers import FileDownloader, FileUploader
+from uap_backend.transfers.base import ProgressCallback
 
 if TYPE_CHECKING:
     from uaproject_backend_schemas.models.file import (
@@ -49,3 +52,25 @@ class FileCRUDService(BaseCRUD[FileSchemaResponse, FileSchemaCreate, FileSchemaU
     async def confirm_upload(self, file_id: int, **kwargs) -> FileSchemaResponse:
         """Confirm file upload completion"""
         return await self._request("POST", f"/{file_id}/confirm", **kwargs)
+
+    async def upload_file(
+        self,
+        path: Union[str, os.PathLike],
+        upload_request: Union[FileSchemaCreate, Any],
+        progress: Optional[ProgressCallback] = None,
+        **kwargs,
+    ) -> FileSchemaResponse:
+        """Upload a local file in parallel checksummed parts and confirm it"""
+        async with FileUploader(self, **kwargs) as uploader:
+            return await uploader.upload(path, upload_request, progress=progress)
+
+    async def download_file(
+        self,
+        file_id: int,
+        path: Union[str, os.PathLike],
+        progress: Optional[ProgressCallback] = None,
+        **kwargs,
+    ) -> str:
+        """Download a file with parallel Range requests, resuming an interrupted attempt"""
+        async with FileDownloader(self, **kwargs) as downloader:
+            return await downloader.download(file_id, path, progress=progress)
@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination helpers for BaseCRUD"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Sequence
+
+from uap_backend.core.errors import CRUDValidationError
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position in a keyset walk ordered by ``(field, key)``
+
+    ``value`` is the sort key of the last row returned and ``last_id`` its id.
+    When ``field`` is not unique the walk continues with the rows tying with
+    ``value`` whose id is greater than ``last_id``, then with the rows past
+    ``value``, so the token stays the same size however many rows tie. Without
+    ``last_id`` every row equal to ``value`` is still ahead.
+    """
+
+    field: str
+    value: Any = None
+    last_id: Any = None
+    key: str = "id"
+
+    @property
+    def is_unique(self) -> bool:
+        return self.field == self.key
+
+    def encode(self) -> str:
+        """Opaque, URL-safe token that can be persisted and resumed from"""
+        payload = {"f": self.field, "v": self.value, "i": self.last_id, "k": self.key}
+        raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            return cls(payload["f"], payload["v"], payload.get("i"), payload.get("k", "id"))
+        except (ValueError, KeyError, TypeError) as e:
+            raise CRUDValidationError(f"Invalid pagination cursor: {e}", "cursor")
+
+    def tie_params(self) -> Dict[str, Any]:
+        """Range filter selecting the rows equal to ``value`` with an id past ``last_id``"""
+        params = {f"{self.field}__gte": self.value, f"{self.field}__lte": self.value}
+        if self.last_id is not None:
+            params[f"{self.key}__gt"] = self.last_id
+        return params
+
+    def after_params(self) -> Dict[str, Any]:
+        """Range filter selecting the rows whose sort key is past ``value``"""
+        if self.value is None:
+            return {}
+        return {f"{self.field}__gt": self.value}
+
+    def advance(self, records: Sequence[Dict[str, Any]]) -> "Cursor":
+        """Cursor positioned after the last of ``records``"""
+        if not records:
+            return self
+        last = records[-1]
+        return Cursor(self.field, last.get(self.field), last.get(self.key), self.key)
+
+
+def group_ties(
+    records: Sequence[Dict[str, Any]], field: str, key: str = "id"
+) -> List[List[Dict[str, Any]]]:
+    """Split rows sorted by ``field`` into runs of equal values, each ordered by ``key``
+
+    Backends only sort by one field, so rows sharing a value arrive in any order.
+    """
+    return [
+        sorted(group, key=lambda record: record.get(key))
+        for _, group in groupby(records, key=lambda record: record.get(field))
+    ]
+
+
+@dataclass
+class CursorPage:
+    """One page of a keyset walk"""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    # Token positioned after this page; keep it to resume or to pick up new rows later
+    cursor: Optional[str] = None
+    has_more: bool = False
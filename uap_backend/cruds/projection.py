@@ -0,0 +1,40 @@
+"""Sparse fieldsets: normalized field lists and partial response models"""
+
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from uap_backend.core.errors import CRUDValidationError
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Deduplicated, sorted field names so equal projections share cache keys"""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    normalized = tuple(sorted({name.strip() for name in fields if name.strip()}))
+    if not normalized:
+        raise CRUDValidationError("At least one field must be requested", "fields")
+    return normalized
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Model with only ``fields`` of ``model``, keeping their types and defaults"""
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise CRUDValidationError(
+            f"Unknown fields for {model.__name__}: {', '.join(unknown)}", "fields"
+        )
+
+    definitions = {
+        name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields
+    }
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=model.model_config,
+        __module__=model.__module__,
+        **definitions,
+    )
@@ -1,6 +1,6 @@
 """Role CRUD Service based on OpenAPI analysis"""
 
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
 from uaproject_backend_schemas.models.role import Role
 from uaproject_backend_schemas.models.user import User
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
         RoleSchemaUpdate,
     )
     from uaproject_backend_schemas.models.user import UserSchemaResponse
+
+    from uap_backend.replica.roles import RoleMembershipIndex
 else:
     UserSchemaResponse = User.schemas.response
     RoleSchemaCreate = Role.schemas.create
@@ -26,6 +28,9 @@ else:
 class RoleCRUDService(BaseCRUD[RoleSchemaResponse, RoleSchemaCreate, RoleSchemaUpdate, RoleFilter]):
     """CRUD service for role management"""
 
+    # Local membership bitmaps, attached by RoleMembershipIndex.start()
+    membership: Optional["RoleMembershipIndex"] = None
+
     def __init__(self):
         super().__init__("/roles", "role")
 
@@ -34,12 +39,71 @@ class RoleCRUDService(BaseCRUD[RoleSchemaResponse, RoleSchemaCreate, RoleSchemaU
         return await self._request("GET", "/assignable", **kwargs)
 
     async def get_users_by_role(self, role_id: int, **kwargs) -> List[UserSchemaResponse]:
-        """Get users with specific role"""
+        """Get users with specific role, served locally when the membership
+        index and a users replica are running"""
+        if (
+            self.membership is not None
+            and self.membership.has_role_data(role_id)
+            and not kwargs
+        ):
+            users = self.membership.resolve_users(self.membership.members(any_of=[role_id]))
+            if users is not None:
+                return users
         return await self._request("GET", f"/{role_id}/users", **kwargs)
 
     async def get_users_by_roles(
         self, role_ids: List[int], **kwargs
     ) -> Dict[str, List[UserSchemaResponse]]:
         """Get users grouped by roles"""
+        if (
+            self.membership is not None
+            and all(self.membership.has_role_data(role_id) for role_id in role_ids)
+            and not kwargs
+        ):
+            grouped = {}
+            for role_id in role_ids:
+                users = self.membership.resolve_users(self.membership.members(any_of=[role_id]))
+                if users is None:
+                    break
+                grouped[str(role_id)] = users
+            else:
+                return grouped
+
         params = {"role_ids": role_ids}
         return await self._request("GET", "/users-by-roles", params=params, **kwargs)
+
+    async def get_member_ids(
+        self,
+        all_of: Iterable[int] = (),
+        any_of: Iterable[int] = (),
+        none_of: Iterable[int] = (),
+        **kwargs,
+    ) -> List[int]:
+        """Ids of users holding every role of all_of, one of any_of and none of none_of
+
+        Answered from the membership index when running, otherwise computed from
+        one ``/users-by-roles`` call.
+        """
+        all_of, any_of, none_of = list(all_of), list(any_of), list(none_of)
+        if self.membership is not None and self.membership.ready and not kwargs:
+            return self.membership.members(all_of, any_of, none_of)
+
+        if not all_of and not any_of:
+            raise ValueError("At least one of all_of or any_of is required")
+        grouped = await self.get_users_by_roles(
+            list(dict.fromkeys(all_of + any_of + none_of)), **kwargs
+        )
+        members: Dict[int, Set[int]] = {
+            int(role_id): {user["id"] for user in users} for role_id, users in grouped.items()
+        }
+
+        result: Optional[Set[int]] = None
+        for role_id in all_of:
+            ids = members.get(role_id, set())
+            result = ids if result is None else result & ids
+        if any_of:
+            union = set().union(*(members.get(role_id, set()) for role_id in any_of))
+            result = union if result is None else result & union
+        for role_id in none_of:
+            result -= members.get(role_id, set())
+        return sorted(result)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
 from uaproject_backend_schemas.models.schemas.transaction import TransactionType
 from uaproject_backend_schemas.models.transaction import Transaction
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
         TransactionSchemaResponse,
         TransactionSchemaUpdate,
     )
+
+    from uap_backend.replica.aggregates import MaterializedAggregates
 else:
     TransactionSchemaCreate = Transaction.schemas.create
     TransactionSchemaResponse = Transaction.schemas.response
@@ -27,23 +29,41 @@ class TransactionCRUDService(
         TransactionFilter,
     ]
 ):
+    # Materialized summaries, attached by MaterializedAggregates.start()
+    aggregates: Optional["MaterializedAggregates"] = None
+
     def __init__(self):
         super().__init__("/transactions", "transaction")
 
     async def get_transaction_statistics(
         self, transaction_type: Optional[TransactionType] = None, **kwargs
     ) -> Dict[str, Any]:
-        """Get transaction statistics"""
+        """Get transaction statistics, answered by the materialized view when running"""
+        if self.aggregates is not None and self.aggregates.ready and not kwargs:
+            statistics = self.aggregates.statistics(transaction_type)
+            if statistics is not None:
+                return statistics
         params = {"transaction_type": transaction_type} if transaction_type else {}
-        return await self._request("GET", "/statistics", params=params, **kwargs)
+        response = await self._request("GET", "/statistics", params=params, **kwargs)
+        if self.aggregates is not None and not kwargs:
+            query = "type_statistics" if transaction_type else "statistics"
+            self.aggregates.observe(query, response)
+        return response
 
     async def get_service_details(self, transaction_id: int, **kwargs) -> Dict[str, Any]:
         """Get service details for a specific transaction"""
         return await self._request("GET", f"/details/{transaction_id}/service", **kwargs)
 
     async def get_user_summary(self, user_id: int, **kwargs) -> Dict[str, Any]:
-        """Get transaction summary for user"""
-        return await self._request("GET", f"/{user_id}/summary", **kwargs)
+        """Get transaction summary for user, answered by the materialized view when running"""
+        if self.aggregates is not None and self.aggregates.ready and not kwargs:
+            summary = self.aggregates.user_summary(user_id)
+            if summary is not None:
+                return summary
+        response = await self._request("GET", f"/{user_id}/summary", **kwargs)
+        if self.aggregates is not None and not kwargs:
+            self.aggregates.observe("user_summary", response)
+        return response
 
     async def get_by_service(self, service_id: int, **kwargs) -> List[Dict[str, Any]]:
         """Get transactions by service ID"""
@@ -53,6 +73,18 @@ class TransactionCRUDService(
         """Get transactions by type"""
         return await self._request("GET", f"/type/{transaction_type}", **kwargs)
 
+    async def stream_by_service(self, service_id: int, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Stream transactions by service ID without loading the whole list"""
+        async for item in self._stream(f"/service/{service_id}", **kwargs):
+            yield item
+
+    async def stream_by_type(
+        self, transaction_type: str, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream transactions by type without loading the whole list"""
+        async for item in self._stream(f"/type/{transaction_type}", **kwargs):
+            yield item
+
     async def create_donatello_transaction(self, data: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         """Create transaction from Donatello webhook"""
         return await self._request("POST", "/donatello", data=data, **kwargs)
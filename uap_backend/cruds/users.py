@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from uaproject_backend_schemas.base import SortOrder
 from uaproject_backend_schemas.models.schemas.user import SearchMode
@@ -25,16 +25,34 @@ __all__ = ["UserCRUDService"]
 
 
 class UserCRUDService(BaseCRUD[UserSchemaResponse, UserSchemaCreate, UserSchemaUpdate, UserFilter]):
+    # Search response keys a local replica can fill in
+    local_search_keys = frozenset({"items", "data", "total", "skip", "limit"})
+
+    # Keys of the last API search response, () for a plain list, None if unknown
+    _search_envelope: Optional[Tuple[str, ...]] = None
+
     def __init__(self):
         super().__init__("/users", "user")
 
     async def get_by_discord_id(self, user_id: int, **kwargs) -> Optional[UserSchemaResponse]:
         """Get user by Discord ID"""
+        if self.replica is not None and self.replica.can_lookup("discord_id") and not kwargs:
+            user = self.replica.lookup_one("discord_id", user_id)
+            if user is not None:
+                return user
         users = await self.get_many(filters=UserFilter(discord_id=user_id), **kwargs)
         return users[0] if users else None
 
     async def get_by_nickname(self, nickname: str, **kwargs) -> Optional[UserSchemaResponse]:
         """Get user by Minecraft nickname"""
+        if (
+            self.replica is not None
+            and self.replica.can_lookup("minecraft_nickname")
+            and not kwargs
+        ):
+            user = self.replica.lookup_one("minecraft_nickname", nickname)
+            if user is not None:
+                return user
         users = await self.get_many(filters=UserFilter(minecraft_nickname=nickname), **kwargs)
         return users[0] if users else None
 
@@ -50,7 +68,37 @@ class UserCRUDService(BaseCRUD[UserSchemaResponse, UserSchemaCreate, UserSchemaU
         search_mode: Optional[SearchMode] = None,
         **kwargs,
     ):
-        """Search users by nickname with advanced options"""
+        """Search users by nickname with advanced options
+
+        Served from a local UserIndex replica when one is running, no remote-only
+        option (``filters``, ``search_mode``, extra kwargs) is used and an earlier
+        API response showed an envelope the replica can fill in. Nicknames are
+        matched by substring, or by trigram similarity when ``similar`` is given,
+        as the API does.
+        """
+        if (
+            self.replica is not None
+            and self.replica.can_search()
+            and self._search_envelope is not None
+            and filters is None
+            and search_mode is None
+            and not kwargs
+        ):
+            store = self.replica.store
+            if similar is None:
+                users = store.substring_search(nickname)
+            else:
+                users = [
+                    user
+                    for _, user in store.similarity_search(nickname, threshold=similar, limit=None)
+                ]
+            sort_field = getattr(sort_by, "value", sort_by)
+            users.sort(
+                key=lambda user: (user.get(sort_field) is None, user.get(sort_field)),
+                reverse=order == SortOrder.DESC,
+            )
+            return self._search_response(users[skip : skip + limit], len(users), skip, limit)
+
         params = {
             "skip": skip,
             "limit": limit,
@@ -64,4 +112,42 @@ class UserCRUDService(BaseCRUD[UserSchemaResponse, UserSchemaCreate, UserSchemaU
         elif similar is not None:
             params["similar"] = similar
 
-        return await self._request("GET", "/list/search", params=params, **kwargs)
+        response = await self._request("GET", "/list/search", params=params, **kwargs)
+        self._remember_search_envelope(response)
+        return response
+
+    def _remember_search_envelope(self, response: Any) -> None:
+        """Record the keys of a search response if local results can reproduce them"""
+        if isinstance(response, list):
+            self._search_envelope = ()
+        elif (
+            isinstance(response, dict)
+            and response.keys() <= self.local_search_keys
+            and ("items" in response or "data" in response)
+        ):
+            self._search_envelope = tuple(response)
+        else:
+            self._search_envelope = None
+
+    def _search_response(
+        self, users: List[Dict[str, Any]], total: int, skip: int, limit: int
+    ) -> Any:
+        """Local results in the envelope of the API's search responses"""
+        if not self._search_envelope:
+            return users
+        values = {"items": users, "data": users, "total": total, "skip": skip, "limit": limit}
+        return {key: values[key] for key in self._search_envelope}
+
+    async def autocomplete_nickname(
+        self, prefix: str, limit: int = 25, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Users whose nickname starts with prefix, answered locally when possible"""
+        if self.replica is not None and self.replica.can_search():
+            return self.replica.store.prefix_search(prefix, limit=limit)
+        response = await self.search_by_nickname(prefix, limit=limit, **kwargs)
+        prefix = prefix.lower()
+        return [
+            user
+            for user in self._extract_items(response)
+            if (user.get("minecraft_nickname") or "").lower().startswith(prefix)
+        ]
@@ -51,6 +51,7 @@ class WebhookCRUDService(
         name: str,
         triggers: List[Dict[str, Any]],
         auth_config: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
         **kwargs,
     ) -> WebhookSchemaResponse:
         """Ensure webhook exists with current configuration"""
@@ -66,6 +67,10 @@ class WebhookCRUDService(
             "auth_config": auth_config or {},
         }
 
+        # Advertise that the endpoint accepts JSON array / NDJSON batches
+        if batch_size and batch_size > 1:
+            webhook_data["batch_size"] = batch_size
+
         if existing_webhook:
             # Update existing webhook
             return await self.update(existing_webhook["id"], webhook_data, **kwargs)
@@ -1,20 +1,129 @@
+"""Library logging with cached loggers and an opt-in, queue-backed output handler
+
+Library loggers only carry a ``NullHandler`` and propagate to the application's
+logging configuration. ``configure_logging()`` attaches the library's own output
+handler, optionally behind a queue listener so writes happen off the event loop.
+"""
+
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple, Union
+
+from uap_backend.core.config import settings
+
+LIBRARY_LOGGER = "uap_backend"
+
+_lock = threading.Lock()
+_loggers: Dict[str, logging.Logger] = {}
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+
+logging.getLogger(LIBRARY_LOGGER).addHandler(logging.NullHandler())
+
+
+class SamplingFilter(logging.Filter):
+    """Let through one record out of every ``every`` for each message template
+
+    Records that pass carry ``sample_rate`` and ``sample_count`` attributes so
+    formatters can show how many records were folded into them.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (str(record.msg), record.levelno)
+        seen = self._counters.get(key, 0)
+        self._counters[key] = seen + 1
+        if seen % self.every:
+            return False
+        record.sample_rate = self.every
+        record.sample_count = seen + 1
+        return True
+
+
+def _build_output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+    return handler
+
+
+def get_logger(
+    name: str, level: Optional[int] = None, sample_every: Optional[int] = None
+) -> logging.Logger:
+    """Get a cached library logger
+
+    ``sample_every`` keeps only one record out of N per message template, which is
+    meant for high-volume warnings such as request retries.
+    """
+    cached = _loggers.get(name)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        if name in _loggers:
+            return _loggers[name]
+
+        logger = logging.getLogger(name)
+        if level is not None:
+            logger.setLevel(level)
+        if sample_every and sample_every > 1:
+            logger.addFilter(SamplingFilter(sample_every))
+
+        _loggers[name] = logger
+        return logger
+
+
+def configure_logging(
+    level: Optional[Union[int, str]] = None, use_queue: Optional[bool] = None
+) -> logging.Handler:
+    """Attach the library's own stdout handler to the ``uap_backend`` logger
+
+    Opt-in for applications that do not configure logging themselves. With
+    ``use_queue`` (LOG_ASYNC by default) records go through a QueueListener so
+    stdout writes happen off the event loop. Records still propagate to the
+    root logger.
+    """
+    global _handler, _listener
+
+    with _lock:
+        library_logger = logging.getLogger(LIBRARY_LOGGER)
+        library_logger.setLevel(level if level is not None else settings.LOG_LEVEL)
+        if _handler is not None:
+            return _handler
 
+        output = _build_output_handler()
+        if settings.LOG_ASYNC if use_queue is None else use_queue:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            _listener = QueueListener(log_queue, output, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+            _handler = QueueHandler(log_queue)
+        else:
+            _handler = output
+        library_logger.addHandler(_handler)
+        return _handler
 
-class CustomLogger(logging.Logger):
-    def __init__(self, name: str, level: int = logging.INFO):
-        super().__init__(name, level)
 
-        formatter = logging.Formatter(
-            "%(levelname)s:     %(message)s"
-        )
+def shutdown_logging() -> None:
+    """Flush queued records and switch the library handler to synchronous output"""
+    global _handler, _listener
 
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(formatter)
-        handler.setLevel(level)
+    with _lock:
+        if _listener is None:
+            return
 
-        self.addHandler(handler)
+        _listener.stop()
+        output = _listener.handlers[0]
+        _listener = None
 
-def get_logger(name: str, level: int = logging.INFO) -> CustomLogger:
-    return CustomLogger(name, level)
+        library_logger = logging.getLogger(LIBRARY_LOGGER)
+        library_logger.removeHandler(_handler)
+        library_logger.addHandler(output)
+        _handler = output
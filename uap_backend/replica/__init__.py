@@ -0,0 +1,21 @@
+"""
+Local read replicas for read-heavy consumers.
+
+Keeps API collections mirrored in process memory, bootstrapped through the CRUD
+services and kept current by webhook events.
+"""
+
+from .aggregates import MaterializedAggregates
+from .collection import CollectionReplica
+from .roles import RoleMembershipIndex
+from .store import IndexedStore, ReplicaStore
+from .users import UserIndex
+
+__all__ = [
+    "CollectionReplica",
+    "IndexedStore",
+    "MaterializedAggregates",
+    "ReplicaStore",
+    "RoleMembershipIndex",
+    "UserIndex",
+]
@@ -0,0 +1,423 @@
+"""Materialized balance and transaction aggregates maintained from webhook events"""
+
+import asyncio
+import copy
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from uap_backend.core.config import settings
+from uap_backend.core.limiter import Priority
+from uap_backend.logger import get_logger
+from uap_backend.webhooks.registry import WebhookRegistry
+
+if TYPE_CHECKING:
+    from uap_backend.cruds.balances import BalanceCRUDService
+    from uap_backend.cruds.transactions import TransactionCRUDService
+
+logger = get_logger(__name__)
+
+ZERO = Decimal(0)
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Exact amount, so totals built in any order compare equal"""
+    return ZERO if value is None else Decimal(str(value))
+
+
+def _as_record(record: Any) -> Any:
+    return record.model_dump() if hasattr(record, "model_dump") else record
+
+
+def _amount_like(sample: Any, amount: Decimal) -> Any:
+    """Amount as the JSON type the API used for ``sample``"""
+    if isinstance(sample, str):
+        return str(amount)
+    if isinstance(sample, int) and amount == amount.to_integral_value():
+        return int(amount)
+    return float(amount)
+
+
+def render_like(template: Any, values: Dict[str, Any]) -> Any:
+    """Local figures in the schema of an API response, or None if it has fields
+    the view cannot compute
+
+    ``values`` maps field names to computed figures, ``by_type`` to per-type
+    values rendered like the template's buckets. A bare scalar template stands
+    for ``total``.
+    """
+    if not isinstance(template, dict):
+        return _amount_like(template, values["total"])
+
+    rendered = {}
+    for key, sample in template.items():
+        if key not in values:
+            return None
+        value = values[key]
+        if key == "by_type":
+            if not isinstance(sample, dict) or (value and not sample):
+                return None
+            bucket_template = next(iter(sample.values()), None)
+            buckets = {}
+            for transaction_type, bucket in value.items():
+                buckets[transaction_type] = render_like(bucket_template, bucket)
+                if buckets[transaction_type] is None:
+                    return None
+            rendered[key] = buckets
+        elif isinstance(value, Decimal):
+            rendered[key] = _amount_like(sample, value)
+        elif isinstance(sample, (dict, list)):
+            return None
+        else:
+            rendered[key] = value
+    return rendered
+
+
+class _Totals:
+    """Count and sum of amounts, overall and per transaction type"""
+
+    __slots__ = ("count", "total", "by_type")
+
+    def __init__(self):
+        self.count = 0
+        self.total = ZERO
+        self.by_type: Dict[Any, List] = {}
+
+    def add(self, transaction_type: Any, amount: Decimal, sign: int = 1) -> None:
+        self.count += sign
+        self.total += sign * amount
+        bucket = self.by_type.setdefault(transaction_type, [0, ZERO])
+        bucket[0] += sign
+        bucket[1] += sign * amount
+        if bucket[0] == 0:
+            del self.by_type[transaction_type]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "by_type": {
+                str(transaction_type): {"count": count, "total": total}
+                for transaction_type, (count, total) in self.by_type.items()
+            },
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, _Totals)
+            and self.count == other.count
+            and self.total == other.total
+            and self.by_type == other.by_type
+        )
+
+
+class _AggregateState:
+    """Per-row contributions and the totals derived from them
+
+    Rows are remembered by id so redelivered or out-of-order events replace a
+    row's contribution instead of counting it twice.
+    """
+
+    def __init__(self):
+        self.balances: Dict[Any, Tuple[Any, Decimal]] = {}
+        self.balance_totals: Dict[Any, Decimal] = {}
+        self.transactions: Dict[Any, Tuple[Any, Any, Decimal]] = {}
+        self.user_totals: Dict[Any, _Totals] = {}
+        self.statistics = _Totals()
+
+    def set_balance(self, balance_id: Any, user_id: Any, amount: Decimal) -> None:
+        self.remove_balance(balance_id)
+        self.balances[balance_id] = (user_id, amount)
+        self._add_to_total(user_id, amount)
+
+    def remove_balance(self, balance_id: Any) -> None:
+        previous = self.balances.pop(balance_id, None)
+        if previous is not None:
+            user_id, amount = previous
+            self._add_to_total(user_id, -amount)
+
+    def _add_to_total(self, user_id: Any, amount: Decimal) -> None:
+        # Zero totals are not stored, so two states with equal figures compare equal
+        total = self.balance_totals.get(user_id, ZERO) + amount
+        if total:
+            self.balance_totals[user_id] = total
+        else:
+            self.balance_totals.pop(user_id, None)
+
+    def set_transaction(
+        self, transaction_id: Any, user_id: Any, transaction_type: Any, amount: Decimal
+    ) -> None:
+        self.remove_transaction(transaction_id)
+        self.transactions[transaction_id] = (user_id, transaction_type, amount)
+        self.user_totals.setdefault(user_id, _Totals()).add(transaction_type, amount)
+        self.statistics.add(transaction_type, amount)
+
+    def remove_transaction(self, transaction_id: Any) -> None:
+        previous = self.transactions.pop(transaction_id, None)
+        if previous is None:
+            return
+        user_id, transaction_type, amount = previous
+        totals = self.user_totals[user_id]
+        totals.add(transaction_type, amount, sign=-1)
+        if not totals.count:
+            del self.user_totals[user_id]
+        self.statistics.add(transaction_type, amount, sign=-1)
+
+
+class MaterializedAggregates:
+    """Balance totals, per-user transaction summaries and global transaction
+    statistics kept in memory
+
+    Both collections are read once at low priority, then ``balance.*`` and
+    ``transaction.*`` events are applied as deltas, so every aggregate is a dict
+    lookup. A periodic reconciliation recomputes the view from the API and
+    replaces it, logging the users whose figures drifted.
+
+    Once started, ``BalanceCRUDService.get_user_total``,
+    ``TransactionCRUDService.get_user_summary`` and
+    ``get_transaction_statistics`` called without extra options are answered
+    from the view. API responses are returned untouched; the first one of each
+    query is kept as a template and local answers are rendered in its schema,
+    with amounts in the JSON type the API used. Until a template is seen, or if
+    it has fields the view does not compute (anything beyond ``user_id``,
+    ``transaction_type``, ``count``, ``total`` and ``by_type``), the API is asked.
+
+    Example:
+        aggregates = MaterializedAggregates(BalanceCRUDService(), TransactionCRUDService())
+        await aggregates.start()
+        await TransactionCRUDService().get_user_summary(1)  # from the API, kept as template
+        summary = await TransactionCRUDService().get_user_summary(42)  # served locally
+    """
+
+    def __init__(
+        self,
+        balances: "BalanceCRUDService",
+        transactions: "TransactionCRUDService",
+        user_field: str = "user_id",
+        amount_field: str = "amount",
+        type_field: str = "transaction_type",
+        page_size: Optional[int] = None,
+        reconcile_interval: Optional[float] = None,
+    ):
+        self.balances = balances
+        self.transactions = transactions
+        self.user_field = user_field
+        self.amount_field = amount_field
+        self.type_field = type_field
+        self.page_size = page_size or settings.REPLICA_PAGE_SIZE
+        self.reconcile_interval = (
+            reconcile_interval
+            if reconcile_interval is not None
+            else settings.REPLICA_RECONCILE_INTERVAL
+        )
+        self.ready = False
+        self._state = _AggregateState()
+        self._handlers: List[Tuple[str, Callable[..., Any]]] = []
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._templates: Dict[str, Any] = {}
+
+    # Lifecycle
+    async def start(self) -> None:
+        """Subscribe to events, seed the view and start reconciliation"""
+        self.subscribe()
+        await self.bootstrap()
+        self.balances.aggregates = self
+        self.transactions.aggregates = self
+
+        if self.reconcile_interval > 0 and self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop reconciliation, unsubscribe and detach from the CRUD services"""
+        for service in (self.balances, self.transactions):
+            if service.aggregates is self:
+                service.aggregates = None
+        self.ready = False
+        self.unsubscribe()
+
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
+    def subscribe(self) -> None:
+        """Register webhook handlers applying balance and transaction deltas"""
+        if self._handlers:
+            return
+
+        def make_handlers(scope: str) -> List[Tuple[str, Callable[..., Any]]]:
+            async def on_upsert(payload):
+                self.apply(f"{scope}.upsert", payload)
+
+            async def on_update(before, after):
+                self.apply(f"{scope}.upsert", after)
+
+            async def on_delete(payload):
+                self.apply(f"{scope}.delete", payload)
+
+            return [
+                (f"{scope}.create", on_upsert),
+                (f"{scope}.update", on_update),
+                (f"{scope}.delete", on_delete),
+            ]
+
+        self._handlers = [
+            *make_handlers(self.balances.model_name),
+            *make_handlers(self.transactions.model_name),
+        ]
+        for scope, handler in self._handlers:
+            WebhookRegistry.register_handler(scope)(handler)
+
+    def unsubscribe(self) -> None:
+        """Remove the webhook handlers registered by subscribe()"""
+        for scope, handler in self._handlers:
+            WebhookRegistry.unregister_handler(scope, handler)
+        self._handlers = []
+
+    # Synchronisation
+    async def _compute(self) -> _AggregateState:
+        state = _AggregateState()
+        balance_fields = ("id", self.user_field, self.amount_field)
+        async for balance in self.balances.iter_all(
+            page_size=self.page_size, priority=Priority.LOW, fields=balance_fields
+        ):
+            self._apply_to(state, f"{self.balances.model_name}.upsert", _as_record(balance))
+
+        transaction_fields = (*balance_fields, self.type_field)
+        async for transaction in self.transactions.iter_all(
+            page_size=self.page_size, priority=Priority.LOW, fields=transaction_fields
+        ):
+            self._apply_to(
+                state, f"{self.transactions.model_name}.upsert", _as_record(transaction)
+            )
+        return state
+
+    async def bootstrap(self) -> None:
+        """Seed the view from the API, replaying events received meanwhile"""
+        self._pending = []
+        try:
+            state = await self._compute()
+        except BaseException:
+            self._pending = None
+            raise
+
+        pending, self._pending = self._pending, None
+        for event, record in pending:
+            self._apply_to(state, event, record)
+        self._state = state
+
+        self.ready = True
+        logger.info(
+            "Aggregates seeded from %s balances and %s transactions",
+            len(state.balances),
+            len(state.transactions),
+        )
+
+    async def reconcile(self) -> int:
+        """Recompute the view from the API and swap it in, returning how many users drifted"""
+        self._pending = []
+        try:
+            state = await self._compute()
+        except BaseException:
+            self._pending = None
+            raise
+
+        pending, self._pending = self._pending, None
+        for event, record in pending:
+            self._apply_to(state, event, record)
+
+        current = self._state
+        drifted = {
+            user_id
+            for user_id in state.balance_totals.keys() | current.balance_totals.keys()
+            if state.balance_totals.get(user_id) != current.balance_totals.get(user_id)
+        }
+        drifted.update(
+            user_id
+            for user_id in state.user_totals.keys() | current.user_totals.keys()
+            if state.user_totals.get(user_id) != current.user_totals.get(user_id)
+        )
+        if drifted:
+            logger.warning(
+                "Aggregates drifted for %s users (e.g. %s), replacing the view",
+                len(drifted),
+                sorted(drifted, key=str)[:10],
+            )
+        self._state = state
+        return len(drifted)
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error("Aggregate reconciliation failed: %s", e)
+
+    def apply(self, event: str, record: Any) -> None:
+        """Apply a ``<scope>.upsert`` or ``<scope>.delete`` event to the view"""
+        record = _as_record(record)
+        if not isinstance(record, dict) or "id" not in record:
+            logger.warning("Ignoring %s event without id", event)
+            return
+
+        if self._pending is not None:
+            self._pending.append((event, record))
+        self._apply_to(self._state, event, record)
+
+    def _apply_to(self, state: _AggregateState, event: str, record: Dict[str, Any]) -> None:
+        scope, action = event.rsplit(".", 1)
+        obj_id = record["id"]
+        if scope == self.balances.model_name:
+            if action == "delete":
+                state.remove_balance(obj_id)
+            else:
+                state.set_balance(
+                    obj_id, record.get(self.user_field), to_decimal(record.get(self.amount_field))
+                )
+        elif action == "delete":
+            state.remove_transaction(obj_id)
+        else:
+            transaction_type = record.get(self.type_field)
+            state.set_transaction(
+                obj_id,
+                record.get(self.user_field),
+                getattr(transaction_type, "value", transaction_type),
+                to_decimal(record.get(self.amount_field)),
+            )
+
+    # Queries
+    def observe(self, query: str, response: Any) -> None:
+        """Keep an API response of ``query`` as the template for local answers"""
+        self._templates[query] = copy.deepcopy(response)
+
+    def _render(self, query: str, values: Dict[str, Any]) -> Any:
+        template = self._templates.get(query)
+        return None if template is None else render_like(template, values)
+
+    def user_total(self, user_id: Any) -> Any:
+        """Sum of the user's balances, or None without a usable template"""
+        total = self._state.balance_totals.get(user_id, ZERO)
+        return self._render("user_total", {"user_id": user_id, "total": total})
+
+    def user_summary(self, user_id: Any) -> Any:
+        """Count and sum of the user's transactions, overall and per type, or None
+        without a usable template"""
+        totals = self._state.user_totals.get(user_id) or _Totals()
+        return self._render("user_summary", {"user_id": user_id, **totals.as_dict()})
+
+    def statistics(self, transaction_type: Any = None) -> Any:
+        """Count and sum of all transactions, optionally of one type only, or None
+        without a usable template"""
+        statistics = self._state.statistics.as_dict()
+        if transaction_type is None:
+            return self._render("statistics", statistics)
+
+        key = str(getattr(transaction_type, "value", transaction_type))
+        bucket = statistics["by_type"].get(key, {"count": 0, "total": ZERO})
+        return self._render(
+            "type_statistics", {**bucket, "transaction_type": key, "by_type": {key: bucket}}
+        )
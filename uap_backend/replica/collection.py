@@ -0,0 +1,202 @@
+"""Local read replica of an API collection kept current by webhook events"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from uap_backend.core.config import settings
+from uap_backend.core.limiter import Priority
+from uap_backend.logger import get_logger
+from uap_backend.webhooks.registry import WebhookRegistry
+
+from .store import IndexedStore, ReplicaStore
+
+if TYPE_CHECKING:
+    from uap_backend.cruds.base import BaseCRUD
+
+logger = get_logger(__name__)
+
+
+class CollectionReplica:
+    """Mirror of a CRUD collection served from an in-process store
+
+    The replica bootstraps with keyset-paginated ``iter_all``, then applies
+    ``<model>.create/update/delete`` webhook events. A periodic reconciliation
+    compares the local size with ``count()`` and re-bootstraps on drift.
+
+    Example:
+        users = CollectionReplica(UserCRUDService(), indexes=["discord_id"])
+        await users.start()
+        user = await UserCRUDService().get_by_discord_id(1234)  # served locally
+    """
+
+    def __init__(
+        self,
+        service: "BaseCRUD",
+        store: Optional[ReplicaStore] = None,
+        indexes: Iterable[str] = (),
+        scope_prefix: Optional[str] = None,
+        page_size: Optional[int] = None,
+        reconcile_interval: Optional[float] = None,
+    ):
+        self.service = service
+        self.store = store if store is not None else IndexedStore(indexes)
+        self.scope_prefix = scope_prefix or service.model_name
+        self.page_size = page_size or settings.REPLICA_PAGE_SIZE
+        self.reconcile_interval = (
+            reconcile_interval
+            if reconcile_interval is not None
+            else settings.REPLICA_RECONCILE_INTERVAL
+        )
+        self.ready = False
+        self._handlers: List[Tuple[str, Callable[..., Any]]] = []
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    # Lifecycle
+    async def start(self) -> None:
+        """Subscribe to events, load the collection and start reconciliation"""
+        self.subscribe()
+        await self.bootstrap()
+        self.service.replica = self
+
+        if self.reconcile_interval > 0 and self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop reconciliation, unsubscribe and detach from the CRUD service"""
+        if self.service.replica is self:
+            self.service.replica = None
+        self.ready = False
+        self.unsubscribe()
+
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
+    def subscribe(self) -> None:
+        """Register webhook handlers applying collection events to the store"""
+        if self._handlers:
+            return
+
+        async def on_create(payload):
+            self.apply("create", payload)
+
+        async def on_update(before, after):
+            self.apply("update", after)
+
+        async def on_delete(payload):
+            self.apply("delete", payload)
+
+        self._handlers = [
+            (f"{self.scope_prefix}.create", on_create),
+            (f"{self.scope_prefix}.update", on_update),
+            (f"{self.scope_prefix}.delete", on_delete),
+        ]
+        for scope, handler in self._handlers:
+            WebhookRegistry.register_handler(scope)(handler)
+
+    def unsubscribe(self) -> None:
+        """Remove the webhook handlers registered by subscribe()"""
+        for scope, handler in self._handlers:
+            WebhookRegistry.unregister_handler(scope, handler)
+        self._handlers = []
+
+    # Synchronisation
+    async def _fetch_all(self) -> List[Dict[str, Any]]:
+        # Keyset pages: deletes during the walk cannot shift rows past the cursor
+        return [
+            record
+            async for record in self.service.iter_all(
+                page_size=self.page_size, priority=Priority.LOW
+            )
+        ]
+
+    async def bootstrap(self) -> int:
+        """Load the whole collection, replaying events received meanwhile"""
+        self._pending = []
+        try:
+            records = await self._fetch_all()
+        except BaseException:
+            self._pending = None
+            raise
+
+        pending, self._pending = self._pending, None
+
+        # Swap contents without awaiting so readers never see a partial store
+        self.store.clear()
+        for record in records:
+            self.store.upsert(record)
+        for action, record in pending:
+            self._apply_to_store(action, record)
+
+        self.ready = True
+        logger.info(
+            "Replica of %s loaded with %s records", self.service.model_name, len(self.store)
+        )
+        return len(self.store)
+
+    def apply(self, action: str, record: Any) -> None:
+        """Apply a create/update/delete event to the store"""
+        if hasattr(record, "model_dump"):
+            record = record.model_dump()
+        if not isinstance(record, dict) or self.store.key not in record:
+            logger.warning("Ignoring %s.%s event without id", self.scope_prefix, action)
+            return
+
+        if self._pending is not None:
+            self._pending.append((action, record))
+        self._apply_to_store(action, record)
+
+    def _apply_to_store(self, action: str, record: Dict[str, Any]) -> None:
+        if action == "delete":
+            self.store.remove(record[self.store.key])
+        else:
+            self.store.upsert(record)
+
+    async def reconcile(self) -> int:
+        """Compare with the remote count and reload on drift, returning the drift"""
+        remote_count = await self.service.count(priority=Priority.LOW)
+        drift = remote_count - len(self.store)
+        if drift:
+            logger.warning(
+                "Replica of %s drifted by %s records, reloading", self.service.model_name, drift
+            )
+            await self.bootstrap()
+        return drift
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error("Replica reconciliation for %s failed: %s", self.scope_prefix, e)
+
+    # Reads
+    def get(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        record = self.store.get(obj_id)
+        if record is None and isinstance(obj_id, str) and obj_id.isdigit():
+            # Ids taken from paths or route parameters arrive as strings
+            record = self.store.get(int(obj_id))
+        return record
+
+    def lookup(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        return self.store.lookup(field, value)
+
+    def lookup_one(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        records = self.store.lookup(field, value)
+        return records[0] if records else None
+
+    def can_lookup(self, field: str) -> bool:
+        return self.ready and self.store.has_index(field)
+
+    def can_search(self) -> bool:
+        """Whether the store answers nickname similarity and prefix searches (UserIndex)"""
+        return self.ready and hasattr(self.store, "similarity_search")
+
+    def __len__(self) -> int:
+        return len(self.store)
@@ -0,0 +1,294 @@
+"""Local role membership index backed by integer bitmaps"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from uap_backend.core.config import settings
+from uap_backend.core.limiter import Priority
+from uap_backend.logger import get_logger
+from uap_backend.webhooks.registry import WebhookRegistry
+
+if TYPE_CHECKING:
+    from uap_backend.cruds.base import BaseCRUD
+    from uap_backend.cruds.roles import RoleCRUDService
+
+logger = get_logger(__name__)
+
+# Positions of the set bits of every byte value, for fast bitmap decoding
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Positions of the set bits of ``bitmap`` in ascending order"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def bitmap_of(ids: Iterable[int]) -> int:
+    bitmap = 0
+    for obj_id in ids:
+        bitmap |= 1 << obj_id
+    return bitmap
+
+
+class RoleMembershipIndex:
+    """Which users hold which roles, kept locally as one bitmap per role
+
+    Bit ``n`` of a role's bitmap is set when the user with id ``n`` holds the
+    role, so "A and B but not C" is ``a & b & ~c`` over machine words. The index
+    bootstraps from ``/roles/{id}/users``, follows ``role.*`` events and the role
+    list carried by ``user.*`` events, and is periodically reconciled.
+
+    Example:
+        membership = RoleMembershipIndex(RoleCRUDService(), users=UserCRUDService())
+        await membership.start()
+        moderators = membership.members(all_of=[MOD], none_of=[BANNED])
+    """
+
+    def __init__(
+        self,
+        roles: "RoleCRUDService",
+        users: Optional["BaseCRUD"] = None,
+        roles_field: str = "roles",
+        page_size: Optional[int] = None,
+        reconcile_interval: Optional[float] = None,
+    ):
+        self.roles = roles
+        self.users = users
+        self.roles_field = roles_field
+        self.page_size = page_size or settings.REPLICA_PAGE_SIZE
+        self.reconcile_interval = (
+            reconcile_interval
+            if reconcile_interval is not None
+            else settings.REPLICA_RECONCILE_INTERVAL
+        )
+        self.ready = False
+        self._bitmaps: Dict[int, int] = {}
+        self._handlers: List[Tuple[str, Callable[..., Any]]] = []
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    # Lifecycle
+    async def start(self) -> None:
+        """Subscribe to events, load memberships and start reconciliation"""
+        self.subscribe()
+        await self.bootstrap()
+        self.roles.membership = self
+
+        if self.reconcile_interval > 0 and self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop reconciliation, unsubscribe and detach from the role service"""
+        if self.roles.membership is self:
+            self.roles.membership = None
+        self.ready = False
+        self.unsubscribe()
+
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
+    def subscribe(self) -> None:
+        """Register webhook handlers for role and user events"""
+        if self._handlers:
+            return
+
+        async def on_role_create(payload):
+            self.apply("role.create", payload)
+
+        async def on_role_delete(payload):
+            self.apply("role.delete", payload)
+
+        async def on_user_change(payload):
+            self.apply("user.update", payload)
+
+        async def on_user_update(before, after):
+            self.apply("user.update", after)
+
+        async def on_user_delete(payload):
+            self.apply("user.delete", payload)
+
+        self._handlers = [
+            ("role.create", on_role_create),
+            ("role.delete", on_role_delete),
+            ("user.create", on_user_change),
+            ("user.update", on_user_update),
+            ("user.delete", on_user_delete),
+        ]
+        for scope, handler in self._handlers:
+            WebhookRegistry.register_handler(scope)(handler)
+
+    def unsubscribe(self) -> None:
+        """Remove the webhook handlers registered by subscribe()"""
+        for scope, handler in self._handlers:
+            WebhookRegistry.unregister_handler(scope, handler)
+        self._handlers = []
+
+    # Synchronisation
+    async def _fetch_role_ids(self) -> List[int]:
+        return [
+            role["id"]
+            async for role in self.roles.iter_all(page_size=self.page_size, priority=Priority.LOW)
+        ]
+
+    async def _fetch_bitmaps(self) -> Dict[int, int]:
+        bitmaps = {}
+        for role_id in await self._fetch_role_ids():
+            members = await self.roles.get_users_by_role(role_id, priority=Priority.LOW)
+            bitmaps[role_id] = bitmap_of(user["id"] for user in members)
+        return bitmaps
+
+    async def _fetch_replayed(self) -> Dict[int, int]:
+        """Every role's members, with the events received while fetching replayed on top"""
+        self._pending = []
+        try:
+            bitmaps = await self._fetch_bitmaps()
+        except BaseException:
+            self._pending = None
+            raise
+
+        pending, self._pending = self._pending, None
+        for event, payload in pending:
+            self._apply(bitmaps, event, payload)
+        return bitmaps
+
+    async def bootstrap(self) -> int:
+        """Load every role's members, replaying events received meanwhile"""
+        self._bitmaps = await self._fetch_replayed()
+        self.ready = True
+        logger.info("Role membership index loaded for %s roles", len(self._bitmaps))
+        return len(self._bitmaps)
+
+    async def reconcile(self) -> int:
+        """Compare every role with the API and replace drifted bitmaps, returning their count"""
+        remote = await self._fetch_replayed()
+        drifted = [
+            role_id
+            for role_id in remote.keys() | self._bitmaps.keys()
+            if remote.get(role_id) != self._bitmaps.get(role_id)
+        ]
+        if drifted:
+            logger.warning("Role membership drifted for roles %s, reloading", sorted(drifted))
+            self._bitmaps = remote
+        return len(drifted)
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error("Role membership reconciliation failed: %s", e)
+
+    def apply(self, event: str, payload: Any) -> None:
+        """Apply a role or user event to the bitmaps"""
+        if hasattr(payload, "model_dump"):
+            payload = payload.model_dump()
+        if not isinstance(payload, dict) or "id" not in payload:
+            logger.warning("Ignoring %s event without id", event)
+            return
+
+        if self._pending is not None:
+            self._pending.append((event, payload))
+        self._apply(self._bitmaps, event, payload)
+
+    def _apply(self, bitmaps: Dict[int, int], event: str, payload: Dict[str, Any]) -> None:
+        obj_id = payload["id"]
+        if event == "role.create":
+            bitmaps.setdefault(obj_id, 0)
+        elif event == "role.delete":
+            bitmaps.pop(obj_id, None)
+        elif event == "user.delete":
+            self._set_user_roles(bitmaps, obj_id, ())
+        elif self.roles_field in payload:
+            self._set_user_roles(bitmaps, obj_id, self._role_ids(payload[self.roles_field]))
+
+    @staticmethod
+    def _role_ids(roles: Any) -> List[int]:
+        return [role["id"] if isinstance(role, dict) else role for role in roles or ()]
+
+    @staticmethod
+    def _set_user_roles(bitmaps: Dict[int, int], user_id: int, role_ids: Iterable[int]) -> None:
+        bit = 1 << user_id
+        role_ids = set(role_ids)
+        for role_id in role_ids - bitmaps.keys():
+            bitmaps[role_id] = 0
+        for role_id, bitmap in bitmaps.items():
+            if role_id in role_ids:
+                bitmaps[role_id] = bitmap | bit
+            elif bitmap & bit:
+                bitmaps[role_id] = bitmap & ~bit
+
+    # Queries
+    def bitmap(
+        self,
+        all_of: Iterable[int] = (),
+        any_of: Iterable[int] = (),
+        none_of: Iterable[int] = (),
+    ) -> int:
+        """Bitmap of users holding every role of ``all_of``, at least one of
+        ``any_of`` (if given) and none of ``none_of``"""
+        all_of, any_of = list(all_of), list(any_of)
+        if not all_of and not any_of:
+            raise ValueError("At least one of all_of or any_of is required")
+
+        result = -1
+        for role_id in all_of:
+            result &= self._bitmaps.get(role_id, 0)
+        if any_of:
+            union = 0
+            for role_id in any_of:
+                union |= self._bitmaps.get(role_id, 0)
+            result &= union
+        for role_id in none_of:
+            result &= ~self._bitmaps.get(role_id, 0)
+        return result
+
+    def members(
+        self,
+        all_of: Iterable[int] = (),
+        any_of: Iterable[int] = (),
+        none_of: Iterable[int] = (),
+    ) -> List[int]:
+        """User ids matching the role expression, ascending"""
+        return list(iter_bits(self.bitmap(all_of, any_of, none_of)))
+
+    def count(
+        self,
+        all_of: Iterable[int] = (),
+        any_of: Iterable[int] = (),
+        none_of: Iterable[int] = (),
+    ) -> int:
+        return self.bitmap(all_of, any_of, none_of).bit_count()
+
+    def has_role(self, user_id: int, role_id: int) -> bool:
+        return bool(self._bitmaps.get(role_id, 0) >> user_id & 1)
+
+    def roles_of(self, user_id: int) -> List[int]:
+        return [role_id for role_id, bitmap in self._bitmaps.items() if bitmap >> user_id & 1]
+
+    def has_role_data(self, role_id: int) -> bool:
+        return self.ready and role_id in self._bitmaps
+
+    def resolve_users(self, user_ids: Iterable[int]) -> Optional[List[Dict[str, Any]]]:
+        """User records from the users replica, None if any of them is not available"""
+        replica = self.users.replica if self.users is not None else None
+        if replica is None or not replica.ready:
+            return None
+
+        users = []
+        for user_id in user_ids:
+            user = replica.get(user_id)
+            if user is None:
+                return None
+            users.append(user)
+        return users
@@ -0,0 +1,119 @@
+"""In-memory record stores for local read replicas"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union
+
+Normalizer = Callable[[Any], Any]
+
+
+class ReplicaStore(ABC):
+    """Storage backend a CollectionReplica keeps in sync with the API"""
+
+    key: str = "id"
+
+    @abstractmethod
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert or replace a record"""
+
+    @abstractmethod
+    def remove(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        """Remove a record by ID, returning it if it was present"""
+
+    @abstractmethod
+    def get(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        """Get a record by ID"""
+
+    @abstractmethod
+    def lookup(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Get all records whose indexed field equals value"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all records"""
+
+    def has_index(self, field: str) -> bool:
+        """Check whether lookup() is supported for a field"""
+        return False
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Dict[str, Any]]: ...
+
+
+class IndexedStore(ReplicaStore):
+    """Dictionary-backed store with secondary hash indexes
+
+    Indexes are given as field names, or as a mapping of field name to a
+    normalizer applied to both stored values and lookup values (e.g. ``str.lower``).
+    """
+
+    def __init__(
+        self,
+        indexes: Union[Iterable[str], Mapping[str, Optional[Normalizer]]] = (),
+        key: str = "id",
+    ):
+        self.key = key
+        if not isinstance(indexes, Mapping):
+            indexes = dict.fromkeys(indexes)
+        self._normalizers: Dict[str, Optional[Normalizer]] = dict(indexes)
+        self._records: Dict[Any, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[Any, Set[Any]]] = {field: {} for field in indexes}
+
+    def _index_value(self, field: str, value: Any) -> Any:
+        normalizer = self._normalizers[field]
+        if value is None or normalizer is None:
+            return value
+        return normalizer(value)
+
+    def _unindex(self, obj_id: Any, record: Dict[str, Any]) -> None:
+        for field, index in self._indexes.items():
+            value = self._index_value(field, record.get(field))
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(obj_id)
+                if not ids:
+                    del index[value]
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        obj_id = record[self.key]
+        previous = self._records.get(obj_id)
+        if previous is not None:
+            self._unindex(obj_id, previous)
+
+        self._records[obj_id] = record
+        for field, index in self._indexes.items():
+            value = self._index_value(field, record.get(field))
+            if value is not None:
+                index.setdefault(value, set()).add(obj_id)
+
+    def remove(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        record = self._records.pop(obj_id, None)
+        if record is not None:
+            self._unindex(obj_id, record)
+        return record
+
+    def get(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        return self._records.get(obj_id)
+
+    def lookup(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        index = self._indexes.get(field)
+        if index is None:
+            raise KeyError(f"Field '{field}' is not indexed")
+        ids = index.get(self._index_value(field, value), ())
+        return [self._records[obj_id] for obj_id in ids]
+
+    def has_index(self, field: str) -> bool:
+        return field in self._indexes
+
+    def clear(self) -> None:
+        self._records.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._records.values())
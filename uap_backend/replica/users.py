@@ -0,0 +1,252 @@
+"""Compact user store with discord_id and fuzzy nickname indexes"""
+
+import json
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .store import ReplicaStore
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a lowercased word padded like pg_trgm (two spaces before, one after)"""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class UserIndex(ReplicaStore):
+    """Array-backed user store answering nickname searches locally
+
+    Each user occupies a row. The full record is kept as compact JSON bytes and
+    decoded on read; the indexed columns live in flat arrays. ``discord_id`` and
+    ``id`` are hash indexes, nicknames are kept in a sorted column for prefix
+    search and in a trigram index (posting lists of row numbers) for similarity
+    search. 100k users take a few tens of MB instead of the hundreds full dicts
+    would need.
+
+    Example:
+        users = CollectionReplica(UserCRUDService(), store=UserIndex())
+        await users.start()
+        await UserCRUDService().autocomplete_nickname("ste")  # served locally
+    """
+
+    # Above this many unsorted nicknames the sorted column is rebuilt in one go
+    REBUILD_THRESHOLD = 256
+
+    def __init__(
+        self,
+        key: str = "id",
+        nickname_field: str = "minecraft_nickname",
+        discord_field: str = "discord_id",
+    ):
+        self.key = key
+        self.nickname_field = nickname_field
+        self.discord_field = discord_field
+        self.clear()
+
+    def clear(self) -> None:
+        self._rows: Dict[Any, int] = {}
+        self._payloads: List[Optional[bytes]] = []
+        self._nicknames: List[Optional[str]] = []  # lowercased, per row
+        self._trigram_counts = array("H")
+        self._free: List[int] = []
+        self._by_discord: Dict[Any, int] = {}
+        self._sorted_nicknames: List[str] = []
+        self._sorted_rows = array("i")
+        self._unsorted: Set[int] = set()  # rows not yet placed in the sorted column
+        self._postings: Dict[str, array] = {}
+
+    # Row management
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        self._payloads.append(None)
+        self._nicknames.append(None)
+        self._trigram_counts.append(0)
+        return len(self._payloads) - 1
+
+    def _index_nickname(self, row: int, nickname: str) -> None:
+        self._nicknames[row] = nickname
+        # Placed lazily so a bootstrap costs one sort instead of n insertions
+        self._unsorted.add(row)
+
+        grams = trigrams(nickname)
+        self._trigram_counts[row] = min(len(grams), 0xFFFF)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = array("i", (row,))
+            else:
+                posting.append(row)
+
+    def _unindex_nickname(self, row: int) -> None:
+        nickname = self._nicknames[row]
+        if nickname is None:
+            return
+        self._nicknames[row] = None
+
+        if row in self._unsorted:
+            self._unsorted.discard(row)
+        else:
+            position = bisect_left(self._sorted_nicknames, nickname)
+            while self._sorted_rows[position] != row:
+                position += 1
+            del self._sorted_nicknames[position]
+            del self._sorted_rows[position]
+
+        for gram in trigrams(nickname):
+            posting = self._postings[gram]
+            posting.remove(row)
+            if not posting:
+                del self._postings[gram]
+
+    def _release(self, row: int, record: Dict[str, Any]) -> None:
+        self._unindex_nickname(row)
+        discord_id = record.get(self.discord_field)
+        if discord_id is not None and self._by_discord.get(discord_id) == row:
+            del self._by_discord[discord_id]
+
+    # ReplicaStore
+    def upsert(self, record: Dict[str, Any]) -> None:
+        obj_id = record[self.key]
+        row = self._rows.get(obj_id)
+        if row is None:
+            row = self._allocate()
+            self._rows[obj_id] = row
+        else:
+            self._release(row, self._decode(row))
+
+        self._payloads[row] = json.dumps(record, separators=(",", ":"), default=str).encode()
+        discord_id = record.get(self.discord_field)
+        if discord_id is not None:
+            self._by_discord[discord_id] = row
+        nickname = record.get(self.nickname_field)
+        if nickname:
+            self._index_nickname(row, nickname.lower())
+
+    def remove(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        row = self._rows.pop(obj_id, None)
+        if row is None:
+            return None
+        record = self._decode(row)
+        self._release(row, record)
+        self._payloads[row] = None
+        self._free.append(row)
+        return record
+
+    def get(self, obj_id: Any) -> Optional[Dict[str, Any]]:
+        row = self._rows.get(obj_id)
+        return self._decode(row) if row is not None else None
+
+    def lookup(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        if field == self.key:
+            record = self.get(value)
+            return [record] if record is not None else []
+        if field == self.discord_field:
+            row = self._by_discord.get(value)
+            return [self._decode(row)] if row is not None else []
+        if field == self.nickname_field:
+            return [self._decode(row) for row in self._exact_rows(str(value).lower())]
+        raise KeyError(f"Field '{field}' is not indexed")
+
+    def has_index(self, field: str) -> bool:
+        return field in (self.key, self.discord_field, self.nickname_field)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for payload in self._payloads:
+            if payload is not None:
+                yield json.loads(payload)
+
+    # Nickname search
+    def _decode(self, row: int) -> Dict[str, Any]:
+        return json.loads(self._payloads[row])
+
+    def _ensure_sorted(self) -> None:
+        if not self._unsorted:
+            return
+
+        if len(self._unsorted) > self.REBUILD_THRESHOLD:
+            rows = sorted(
+                (row for row, nickname in enumerate(self._nicknames) if nickname is not None),
+                key=self._nicknames.__getitem__,
+            )
+            self._sorted_nicknames = [self._nicknames[row] for row in rows]
+            self._sorted_rows = array("i", rows)
+        else:
+            for row in self._unsorted:
+                nickname = self._nicknames[row]
+                position = bisect_left(self._sorted_nicknames, nickname)
+                self._sorted_nicknames.insert(position, nickname)
+                self._sorted_rows.insert(position, row)
+        self._unsorted.clear()
+
+    def _exact_rows(self, nickname: str) -> List[int]:
+        self._ensure_sorted()
+        rows = []
+        position = bisect_left(self._sorted_nicknames, nickname)
+        while (
+            position < len(self._sorted_nicknames)
+            and self._sorted_nicknames[position] == nickname
+        ):
+            rows.append(self._sorted_rows[position])
+            position += 1
+        return rows
+
+    def prefix_search(self, prefix: str, limit: int = 25) -> List[Dict[str, Any]]:
+        """Users whose nickname starts with ``prefix`` (case-insensitive), alphabetically"""
+        self._ensure_sorted()
+        prefix = prefix.lower()
+        results = []
+        position = bisect_left(self._sorted_nicknames, prefix)
+        while (
+            len(results) < limit
+            and position < len(self._sorted_nicknames)
+            and self._sorted_nicknames[position].startswith(prefix)
+        ):
+            results.append(self._decode(self._sorted_rows[position]))
+            position += 1
+        return results
+
+    def substring_search(self, query: str) -> List[Dict[str, Any]]:
+        """Users whose nickname contains ``query`` (case-insensitive), in no particular order"""
+        query = query.lower()
+        return [
+            self._decode(row)
+            for row, nickname in enumerate(self._nicknames)
+            if nickname is not None and query in nickname
+        ]
+
+    def similarity_search(
+        self, query: str, threshold: float = 0.3, limit: Optional[int] = 25
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Users ranked by trigram similarity of their nickname to ``query``
+
+        Similarity is the Jaccard index of the trigram sets, as in pg_trgm.
+        """
+        query_grams = trigrams(query.lower())
+        shared: Counter = Counter()
+        for gram in query_grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                shared.update(posting)
+
+        # score <= shared / len(query_grams), so rows sharing too few trigrams can't qualify
+        query_size = len(query_grams)
+        min_shared = max(1, math.ceil(threshold * query_size - 1e-9))
+        counts = self._trigram_counts
+        scored = []
+        for row, count in shared.items():
+            if count < min_shared:
+                continue
+            score = count / (query_size + counts[row] - count)
+            if score >= threshold:
+                scored.append((score, self._nicknames[row], row))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        if limit is not None:
+            scored = scored[:limit]
+        return [(score, self._decode(row)) for score, _, row in scored]
@@ -0,0 +1,16 @@
+"""
+Large file transfers against presigned storage URLs.
+
+Files are memory-mapped and moved in parts, concurrently, with per-part
+retries, checksums and progress callbacks. Downloads resume after interruption.
+"""
+
+from .base import TransferProgress
+from .download import FileDownloader
+from .upload import FileUploader
+
+__all__ = [
+    "FileDownloader",
+    "FileUploader",
+    "TransferProgress",
+]
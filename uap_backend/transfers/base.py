@@ -0,0 +1,115 @@
+"""Shared pieces of the upload and download engines"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from uap_backend.core.config import settings
+from uap_backend.core.errors import TransferError
+from uap_backend.core.transport import Transport, TransportError, TransportResponse
+from uap_backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class TransferProgress:
+    """Byte and part counters of a running transfer"""
+
+    total_bytes: int
+    parts_total: int
+    done_bytes: int = 0
+    parts_done: int = 0
+    started: float = field(default_factory=time.monotonic)
+    # Bytes already transferred by an earlier, resumed run
+    resumed_bytes: int = 0
+
+    @property
+    def fraction(self) -> float:
+        return self.done_bytes / self.total_bytes if self.total_bytes else 1.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return (self.done_bytes - self.resumed_bytes) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current rate, None before anything was transferred"""
+        rate = self.bytes_per_second
+        return (self.total_bytes - self.done_bytes) / rate if rate > 0 else None
+
+
+ProgressCallback = Callable[[TransferProgress], Any]
+
+
+def split_parts(size: int, part_size: int) -> List[Tuple[int, int]]:
+    """(start, end) byte ranges covering ``size`` bytes, the last one possibly shorter"""
+    if size == 0:
+        return [(0, 0)]
+    return [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+
+
+def record_field(record: Any, name: str) -> Any:
+    return record.get(name) if isinstance(record, dict) else getattr(record, name, None)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff between attempts, as used by HTTPClient"""
+    delay = settings.RETRY_DELAY * settings.RETRY_BACKOFF_FACTOR**attempt
+    return min(delay, settings.MAX_RETRY_DELAY)
+
+
+async def send_with_retries(
+    transport: Transport,
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    content: Optional[Any] = None,
+    expected: Iterable[int] = (200, 201, 204),
+    timeout: Optional[float] = None,
+) -> TransportResponse:
+    """Send one part request, retrying connection errors and retryable statuses"""
+    expected = set(expected)
+    timeout = timeout or settings.TRANSFER_PART_TIMEOUT
+    for attempt in range(settings.MAX_RETRIES + 1):
+        try:
+            response = await transport.request(
+                method, url, headers=headers, content=content, timeout=timeout
+            )
+        except TransportError as e:
+            error = TransferError(url, str(e))
+        else:
+            if response.status in expected:
+                return response
+            error = TransferError(url, f"Unexpected status {response.status}", response.status)
+            if response.status not in settings.RETRYABLE_STATUS_CODES:
+                raise error
+
+        if attempt == settings.MAX_RETRIES:
+            raise error
+        delay = retry_delay(attempt)
+        logger.warning("Transfer part failed, retrying in %ss: %s", delay, error)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def run_bounded(jobs: Iterable[Callable[[], Awaitable[T]]], concurrency: int) -> List[T]:
+    """Run jobs with at most ``concurrency`` in flight, cancelling the rest on failure"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await job()
+
+    tasks = [asyncio.create_task(run(job)) for job in jobs]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
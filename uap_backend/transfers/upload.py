@@ -0,0 +1,209 @@
+"""Parallel multipart uploads of memory-mapped files"""
+
+import asyncio
+import base64
+import hashlib
+import math
+import mmap
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from uap_backend.core.config import settings
+from uap_backend.core.errors import TransferError
+from uap_backend.core.transport import Transport, build_transport
+from uap_backend.logger import get_logger
+
+from .base import (
+    ProgressCallback,
+    TransferProgress,
+    record_field,
+    run_bounded,
+    send_with_retries,
+    split_parts,
+)
+
+if TYPE_CHECKING:
+    from uap_backend.cruds.files import FileCRUDService
+
+logger = get_logger(__name__)
+
+
+def content_md5(data: Union[bytes, memoryview]) -> str:
+    """Base64 MD5 digest, as expected in a Content-MD5 header"""
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+def _release(view: memoryview) -> None:
+    try:
+        view.release()
+    except BufferError:
+        # Still exported by a transport, freed when that reference goes away
+        pass
+
+
+def _drop_pages(mapped: mmap.mmap, start: int, end: int) -> None:
+    """Let the kernel reclaim the pages of a sent part so RSS stays flat"""
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return
+    start -= start % mmap.PAGESIZE
+    try:
+        mapped.madvise(mmap.MADV_DONTNEED, start, end - start)
+    except (OSError, ValueError):
+        pass
+
+
+class FileUploader:
+    """Uploads files to the presigned URLs handed out by ``request_upload``
+
+    The file is memory-mapped and each part is sent as a zero-copy view of the
+    mapping whose pages are released once sent, so resident memory stays small
+    whatever the file size. When the upload record lists one presigned URL per
+    part (``part_urls``, with an optional ``part_size``), parts are uploaded
+    ``concurrency`` at a time and the returned ETags are passed to
+    ``confirm_upload``; otherwise the whole file is PUT to ``upload_url``. Every part carries a Content-MD5 header so storage
+    rejects corrupted parts, and failed parts are retried on their own.
+
+    Example:
+        async with FileUploader() as uploader:
+            file = await uploader.upload("backup.tar.zst", {"filename": "backup.tar.zst"})
+    """
+
+    url_field = "upload_url"
+    parts_field = "part_urls"
+    part_size_field = "part_size"
+
+    def __init__(
+        self,
+        service: Optional["FileCRUDService"] = None,
+        transport: Optional[Transport] = None,
+        concurrency: Optional[int] = None,
+        checksum: bool = True,
+    ):
+        if service is None:
+            from uap_backend.cruds.files import FileCRUDService
+
+            service = FileCRUDService()
+        self.service = service
+        # Presigned URLs carry their own credentials, so no API headers are sent
+        self.transport = transport or build_transport({})
+        self.concurrency = concurrency or settings.TRANSFER_CONCURRENCY
+        self.checksum = checksum
+
+    async def upload(
+        self,
+        path: Union[str, os.PathLike],
+        upload_request: Any,
+        progress: Optional[ProgressCallback] = None,
+        confirm: bool = True,
+    ) -> Dict[str, Any]:
+        """Request an upload, send the file and confirm it
+
+        Returns the confirmed file record, or the upload record when ``confirm``
+        is False.
+        """
+        record = await self.service.request_upload(upload_request)
+        file_id = record_field(record, "id")
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            targets = self._plan(record, size)
+            state = TransferProgress(total_bytes=size, parts_total=len(targets))
+            logger.info(
+                "Uploading %s (%s bytes) as file %s in %s parts",
+                path,
+                size,
+                file_id,
+                len(targets),
+            )
+
+            # Zero-length files cannot be mapped
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            view = memoryview(mapped) if mapped is not None else memoryview(b"")
+            try:
+                jobs = [
+                    partial(
+                        self._upload_part, mapped, view, number, url, start, end, state, progress
+                    )
+                    for number, (url, start, end) in enumerate(targets, start=1)
+                ]
+                etags = await run_bounded(jobs, self.concurrency)
+            finally:
+                _release(view)
+                if mapped is not None:
+                    try:
+                        mapped.close()
+                    except BufferError:
+                        # A transport still holds a part; the mapping goes away with it
+                        pass
+
+        if not confirm:
+            return record
+        if record_field(record, self.parts_field):
+            parts = [
+                {"part_number": number, "etag": etag} for number, etag in enumerate(etags, start=1)
+            ]
+            return await self.service.confirm_upload(file_id, data={"parts": parts})
+        return await self.service.confirm_upload(file_id)
+
+    def _plan(self, record: Any, size: int) -> List[Tuple[str, int, int]]:
+        """(url, start, end) of every part the upload record asks for"""
+        part_urls = record_field(record, self.parts_field)
+        if not part_urls:
+            url = record_field(record, self.url_field)
+            if not url:
+                raise TransferError(
+                    str(record_field(record, "id")), "Upload record has no upload URL"
+                )
+            return [(url, 0, size)]
+
+        part_size = record_field(record, self.part_size_field) or math.ceil(
+            size / len(part_urls)
+        )
+        ranges = split_parts(size, part_size)
+        if len(ranges) != len(part_urls):
+            raise TransferError(
+                part_urls[0],
+                f"File of {size} bytes needs {len(ranges)} parts, "
+                f"the upload record has {len(part_urls)}",
+            )
+        return [(url, start, end) for url, (start, end) in zip(part_urls, ranges)]
+
+    async def _upload_part(
+        self,
+        mapped: Optional[mmap.mmap],
+        view: memoryview,
+        number: int,
+        url: str,
+        start: int,
+        end: int,
+        state: TransferProgress,
+        progress: Optional[ProgressCallback],
+    ) -> Optional[str]:
+        part = view[start:end]
+        try:
+            headers = {"Content-Length": str(end - start)}
+            if self.checksum:
+                # Hashing megabytes releases the GIL, keep it off the event loop
+                headers["Content-MD5"] = await asyncio.to_thread(content_md5, part)
+            response = await send_with_retries(self.transport, "PUT", url, headers, part)
+        finally:
+            _release(part)
+        if mapped is not None:
+            _drop_pages(mapped, start, end)
+
+        state.done_bytes += end - start
+        state.parts_done += 1
+        logger.debug("Uploaded part %s/%s of %s bytes", number, state.parts_total, end - start)
+        if progress is not None:
+            progress(state)
+        return response.headers.get("ETag")
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
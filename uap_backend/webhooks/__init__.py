@@ -10,8 +10,10 @@ from .decorators import (
     on_update,
     webhook_handler,
 )
+from .dispatch import CallingConvention, CompiledHandler, DispatchEntry, DispatchTable
 from .handlers import WebhookHandlerResponse, WebhookManager
 from .registry import HandlerInfo, WebhookRegistry
+from .validation import PayloadDiff
 
 __all__ = [
     # Core classes
@@ -19,6 +21,11 @@ __all__ = [
     "WebhookManager",
     "HandlerInfo",
     "WebhookHandlerResponse",
+    "DispatchTable",
+    "DispatchEntry",
+    "CompiledHandler",
+    "CallingConvention",
+    "PayloadDiff",
     
     # Decorators
     "webhook_handler",
@@ -0,0 +1,165 @@
+"""Precompiled webhook dispatch table"""
+
+from __future__ import annotations
+
+import inspect
+from collections import OrderedDict
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple, Type
+
+WILDCARD = "*"
+
+# Actions the API emits for every model
+SCOPE_ACTIONS = ("create", "update", "delete")
+
+# Concrete scopes matched through wildcard patterns kept resolved at any time
+RESOLVED_CACHE_SIZE = 1024
+
+
+class CallingConvention(str, Enum):
+    """How a handler expects to receive the event payload"""
+
+    PAYLOAD = "payload"  # handler(payload=...)
+    BEFORE_AFTER = "before_after"  # handler(before=..., after=...)
+    AUTO = "auto"  # chosen per event from the payload shape
+
+
+def resolve_calling_convention(handler: Callable[..., Any]) -> CallingConvention:
+    """Resolve the calling convention from the handler signature"""
+    try:
+        parameters = inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        return CallingConvention.AUTO
+
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        return CallingConvention.AUTO
+
+    takes_payload = "payload" in parameters
+    takes_diff = "before" in parameters and "after" in parameters
+    if takes_diff and not takes_payload:
+        return CallingConvention.BEFORE_AFTER
+    if takes_payload and not takes_diff:
+        return CallingConvention.PAYLOAD
+    return CallingConvention.AUTO
+
+
+def is_wildcard_scope(scope: str) -> bool:
+    return WILDCARD in scope.split(".")
+
+
+def scope_matches(pattern: str, scope: str) -> bool:
+    """Check a scope such as ``user.update`` against ``user.*`` or ``*.update``"""
+    pattern_parts = pattern.split(".")
+    scope_parts = scope.split(".")
+    if len(pattern_parts) != len(scope_parts):
+        return False
+    return all(p == WILDCARD or p == s for p, s in zip(pattern_parts, scope_parts))
+
+
+class CompiledHandler:
+    """Handler with its calling convention and validation model resolved up front"""
+
+    __slots__ = ("handler", "name", "convention", "model", "order")
+
+    def __init__(
+        self,
+        handler: Callable[..., Any],
+        name: str,
+        model: Optional[Type[Any]] = None,
+        order: int = 0,
+    ):
+        self.handler = handler
+        self.name = name
+        self.convention = resolve_calling_convention(handler)
+        self.model = model
+        self.order = order
+
+    def invoke(self, payload: Any, diff: Optional[Tuple[Any, Any]] = None):
+        """Call the handler with the payload shaped for its calling convention
+
+        ``diff`` carries the (before, after) pair when the event is an update.
+        """
+        if self.convention is CallingConvention.PAYLOAD:
+            return self.handler(payload=payload)
+        if diff is not None:
+            return self.handler(before=diff[0], after=diff[1])
+        if self.convention is CallingConvention.BEFORE_AFTER:
+            return self.handler(before=None, after=payload)
+        return self.handler(payload=payload)
+
+
+class DispatchEntry:
+    """Everything needed to dispatch one scope"""
+
+    __slots__ = ("scope", "handlers", "models")
+
+    def __init__(self, scope: str, handlers: Tuple[CompiledHandler, ...]):
+        self.scope = scope
+        self.handlers = handlers
+        self.models: Tuple[Type[Any], ...] = tuple(
+            dict.fromkeys(h.model for h in handlers if h.model is not None)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.handlers)
+
+    def __len__(self) -> int:
+        return len(self.handlers)
+
+
+class DispatchTable:
+    """Immutable scope -> handlers mapping with wildcard scopes merged in
+
+    Concrete scopes known at build time are resolved eagerly. Scopes that only
+    match wildcard patterns are resolved on first use and kept in a bounded LRU,
+    since scope strings come from the sender.
+    """
+
+    def __init__(self, compiled: Mapping[str, Iterable[CompiledHandler]]):
+        wildcards = tuple(
+            (pattern, tuple(handlers))
+            for pattern, handlers in compiled.items()
+            if is_wildcard_scope(pattern)
+        )
+        self._wildcards = wildcards
+
+        entries: Dict[str, DispatchEntry] = {}
+        for scope, handlers in compiled.items():
+            if not is_wildcard_scope(scope):
+                entries[scope] = self._build_entry(scope, tuple(handlers))
+
+        self._entries = MappingProxyType(entries)
+        self._resolved: OrderedDict[str, DispatchEntry] = OrderedDict()
+
+    def _build_entry(self, scope: str, handlers: Tuple[CompiledHandler, ...]) -> DispatchEntry:
+        merged = list(handlers)
+        for pattern, wildcard_handlers in self._wildcards:
+            if scope_matches(pattern, scope):
+                merged.extend(wildcard_handlers)
+        merged.sort(key=lambda h: h.order)
+        return DispatchEntry(scope, tuple(merged))
+
+    def resolve(self, scope: str) -> DispatchEntry:
+        entry = self._entries.get(scope)
+        if entry is not None:
+            return entry
+
+        entry = self._resolved.get(scope)
+        if entry is not None:
+            self._resolved.move_to_end(scope)
+            return entry
+
+        entry = self._build_entry(scope, ())
+        if entry:
+            self._resolved[scope] = entry
+            if len(self._resolved) > RESOLVED_CACHE_SIZE:
+                self._resolved.popitem(last=False)
+        return entry
+
+    @property
+    def scopes(self) -> Tuple[str, ...]:
+        return tuple(self._entries)
+
+    def __contains__(self, scope: str) -> bool:
+        return bool(self.resolve(scope))
@@ -1,6 +1,9 @@
 import hashlib
 import hmac
-from typing import Any, Dict, Optional
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
 
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -10,16 +13,19 @@ from uap_backend.core.config import settings
 from uap_backend.logger import get_logger
 
 from .registry import WebhookRegistry
+from .validation import is_diff_payload, validate_event
 
 logger = get_logger(__name__)
 
 security = HTTPBearer()
 
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
 
 class WebhookHandlerResponse(BaseModel):
     success: bool
     message: str
-    data: Optional[Dict[str, Any]] = None
+    data: Optional[Any] = None
 
     @classmethod
     def create(cls, success: bool, message: str, data: Any = None) -> "WebhookHandlerResponse":
@@ -30,65 +36,195 @@ class WebhookHandlerResponse(BaseModel):
 
 
 class WebhookManager:
-    def __init__(self, app: FastAPI):
+    def __init__(self, app: FastAPI, auto_register: bool = False, endpoint_path: str = "/webhook"):
         self.app = app
         self.registry = WebhookRegistry()
+        self.endpoint_path = endpoint_path
+        self._auth_token = settings.CALLBACK_SECRET.encode()
+        self._signature_mac = hmac.new(
+            (settings.WEBHOOK_SECRET or settings.CALLBACK_SECRET).encode(),
+            digestmod=hashlib.sha256,
+        )
         self._setup_webhook_handler()
 
+        if auto_register:
+            self.app.add_event_handler("startup", self._auto_register_webhook)
+
     def _setup_webhook_handler(self) -> None:
-        @self.app.post("/webhook", response_model=WebhookHandlerResponse)
+        @self.app.post(self.endpoint_path, response_model=WebhookHandlerResponse)
         async def webhook_handler(
             request: Request,
             credentials: HTTPAuthorizationCredentials = Depends(security),
         ) -> WebhookHandlerResponse:
-            if credentials.credentials != settings.CALLBACK_SECRET:
+            if not hmac.compare_digest(credentials.credentials.encode(), self._auth_token):
                 raise HTTPException(status_code=401, detail="Invalid authorization token")
-            return await self.handle_webhook(request)
 
-    async def handle_webhook(self, request: Request) -> WebhookHandlerResponse:
-        payload_dict = await request.json()
+            # The signature covers the whole body, so only unsigned NDJSON is streamed
+            body = None
+            if settings.WEBHOOK_VERIFY_SIGNATURE or not self._is_ndjson(request):
+                body = await request.body()
+            if settings.WEBHOOK_VERIFY_SIGNATURE:
+                self._verify_webhook_signature(request.headers, body)
+            return await self.handle_webhook(request, body)
+
+    async def handle_webhook(
+        self, request: Request, body: Optional[bytes] = None
+    ) -> WebhookHandlerResponse:
+        if self._is_ndjson(request):
+            lines = self._split_lines(body) if body is not None else self._stream_lines(request)
+            return await self._handle_batch(self._parse_ndjson(lines))
+
+        if body is None:
+            body = await request.body()
 
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON in webhook payload")
+
+        if isinstance(payload, list):
+            return await self._handle_batch(self._iter_events(payload))
+        if not isinstance(payload, dict):
+            raise HTTPException(status_code=400, detail="Webhook payload must be an object")
+
+        scope = payload.get("scope")
+        results = await self._dispatch_event(payload, body)
+        return WebhookHandlerResponse.create(
+            success=True, message=f"Successfully processed {scope} event", data=results
+        )
+
+    async def _dispatch_event(
+        self, payload_dict: Dict[str, Any], raw: Optional[bytes] = None
+    ) -> List[Any]:
+        """Run all handlers registered for a single event and collect their results"""
         # Extract scope/event type from payload
         scope = payload_dict.get("scope")
         if not scope:
             raise HTTPException(status_code=400, detail="Missing 'scope' in webhook payload")
 
-        handler_infos = self.registry.get_handlers(scope)
+        entry = self.registry.resolve(scope)
 
-        if not handler_infos:
+        if not entry:
             raise HTTPException(
                 status_code=404, detail=f"No handler registered for event type: {scope}"
             )
 
+        payload_data = payload_dict.get("payload", {})
+        is_diff = is_diff_payload(payload_data)
+        validated, errors = validate_event(entry, payload_dict, raw)
         results = []
+        rejected = []
 
-        for handler_info in handler_infos:
-            try:
-                # Check if payload has before/after structure (update events)
-                payload_data = payload_dict.get("payload", {})
-
-                if (
-                    isinstance(payload_data, dict)
-                    and "before" in payload_data
-                    and "after" in payload_data
-                ):
-                    # Handle before/after payload (update events)
-                    result = await handler_info.handler(
-                        before=payload_data["before"], after=payload_data["after"]
-                    )
-                else:
-                    # Handle single payload (create/delete events)
-                    result = await handler_info.handler(payload=payload_data)
-
-                results.append(result)
+        for handler in entry.handlers:
+            if handler.model is None:
+                value = payload_data
+                diff = (payload_data["before"], payload_data["after"]) if is_diff else None
+            elif handler.model in validated:
+                value = validated[handler.model]
+                diff = (value.before, value.after) if is_diff else None
+            else:
+                # Payload did not match the model this handler declared
+                rejected.append(handler.model)
+                continue
 
+            try:
+                results.append(await handler.invoke(value, diff))
             except Exception as e:
-                logger.exception(f"Error processing webhook for {scope}: {e}")
+                logger.exception("Error processing webhook for %s: %s", scope, e)
+
+        if rejected:
+            logger.warning(
+                "Event %s for %s skipped by %s handler(s) after failed validation",
+                payload_dict.get("id"),
+                scope,
+                len(rejected),
+            )
+            problems = [
+                f"{model.__name__} {'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for model in dict.fromkeys(rejected)
+                if model in errors
+                for error in errors[model].errors(include_url=False)
+            ]
+            raise HTTPException(
+                status_code=422,
+                detail=f"Payload for {scope} failed validation: {'; '.join(problems)}",
+            )
+        return results
+
+    async def _handle_batch(
+        self, events: AsyncIterator[Tuple[Any, Optional[bytes]]]
+    ) -> WebhookHandlerResponse:
+        """Dispatch a batch of events in order, reporting a result for each one"""
+        results = []
+        failed = 0
+
+        async for event, raw in events:
+            scope = event.get("scope") if isinstance(event, dict) else None
+            try:
+                if isinstance(event, HTTPException):
+                    # An NDJSON line that could not be decoded
+                    raise event
+                if not isinstance(event, dict):
+                    raise HTTPException(status_code=400, detail="Webhook event must be a JSON object")
+                data = await self._dispatch_event(event, raw)
+                results.append({"scope": scope, "success": True, "data": data})
+            except HTTPException as e:
+                failed += 1
+                results.append({"scope": scope, "success": False, "error": e.detail})
 
         return WebhookHandlerResponse.create(
-            success=True, message=f"Successfully processed {scope} event", data=results
+            success=failed == 0,
+            message=f"Processed {len(results) - failed}/{len(results)} batched events",
+            data=results,
         )
 
+    @staticmethod
+    def _is_ndjson(request: Request) -> bool:
+        content_type = request.headers.get("content-type", "")
+        return content_type.split(";", 1)[0].strip() in NDJSON_CONTENT_TYPES
+
+    @staticmethod
+    async def _iter_events(events: List[Any]) -> AsyncIterator[Tuple[Any, Optional[bytes]]]:
+        for event in events:
+            yield event, None
+
+    @staticmethod
+    async def _split_lines(body: bytes) -> AsyncIterator[bytes]:
+        for line in body.splitlines():
+            yield line
+
+    @staticmethod
+    async def _stream_lines(request: Request) -> AsyncIterator[bytes]:
+        """Split the request stream into lines without buffering the whole body"""
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer.extend(chunk)
+            start = 0
+            while (end := buffer.find(b"\n", start)) != -1:
+                yield bytes(buffer[start:end])
+                start = end + 1
+            del buffer[:start]
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    async def _parse_ndjson(
+        lines: AsyncIterator[bytes],
+    ) -> AsyncIterator[Tuple[Any, Optional[bytes]]]:
+        """Decode NDJSON lines; undecodable lines are yielded as HTTPExceptions"""
+        number = 0
+        async for line in lines:
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError as e:
+                detail = f"Invalid JSON on line {number}: {e}"
+                yield HTTPException(status_code=400, detail=detail), None
+            else:
+                yield event, line
+
     async def _auto_register_webhook(self):
         """Auto-register webhook on startup"""
         if hasattr(self.app, "webhook_endpoint_url") and self.app.webhook_endpoint_url:
@@ -101,28 +237,38 @@ class WebhookManager:
             )
 
             if success:
-                logger.info(f"Webhook auto-registered at {endpoint_url}")
+                logger.info("Webhook auto-registered at %s", endpoint_url)
             else:
-                logger.warning(f"Failed to auto-register webhook at {endpoint_url}")
+                logger.warning("Failed to auto-register webhook at %s", endpoint_url)
         else:
             logger.info("No webhook endpoint URL configured, skipping auto-registration")
 
-    async def _verify_webhook_signature(self, request: Request) -> None:
-        """Verify HMAC signature for webhook security"""
-        signature = request.headers.get(settings.WEBHOOK_SIGNATURE_HEADER)
+    def _verify_webhook_signature(self, headers: Mapping[str, str], body: bytes) -> None:
+        """Verify HMAC signature and timestamp freshness for webhook security
+
+        The signature covers ``"{timestamp}." + body``, so a captured request
+        cannot be replayed with a rewritten or dropped timestamp header.
+        """
+        signature = headers.get(settings.WEBHOOK_SIGNATURE_HEADER)
         if not signature:
             raise HTTPException(status_code=401, detail="Missing webhook signature")
 
-        payload = await request.body()
-        secret = settings.WEBHOOK_SECRET or settings.CALLBACK_SECRET
+        timestamp = headers.get(settings.WEBHOOK_TIMESTAMP_HEADER)
+        if not timestamp:
+            raise HTTPException(status_code=401, detail="Missing webhook timestamp")
+        if not self._is_fresh_timestamp(timestamp):
+            raise HTTPException(status_code=401, detail="Stale webhook timestamp")
 
-        if not self._verify_hmac_signature(payload, signature, secret):
+        if not self._verify_hmac_signature(timestamp, body, signature):
             raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
-    def _verify_hmac_signature(self, payload: bytes, signature: str, secret: str) -> bool:
-        """Verify HMAC signature"""
+    def _verify_hmac_signature(self, timestamp: str, payload: bytes, signature: str) -> bool:
+        """Verify HMAC signature using the precomputed key state"""
         try:
-            expected = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+            mac = self._signature_mac.copy()
+            mac.update(f"{timestamp}.".encode())
+            mac.update(payload)
+            expected = mac.hexdigest()
 
             # Handle different signature formats
             if signature.startswith("sha256="):
@@ -130,5 +276,24 @@ class WebhookManager:
 
             return hmac.compare_digest(expected, signature)
         except Exception as e:
-            logger.error(f"Error verifying webhook signature: {e}")
+            logger.error("Error verifying webhook signature: %s", e)
             return False
+
+    def _is_fresh_timestamp(self, timestamp: str) -> bool:
+        """Check that the webhook timestamp is within the allowed tolerance"""
+        tolerance = settings.WEBHOOK_TIMESTAMP_TOLERANCE
+        if tolerance <= 0:
+            return True
+
+        try:
+            sent_at = float(timestamp)
+        except ValueError:
+            try:
+                sent_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                return False
+
+        # Accept both seconds and milliseconds since epoch
+        if sent_at > 1e12:
+            sent_at /= 1000
+        return abs(time.time() - sent_at) <= tolerance
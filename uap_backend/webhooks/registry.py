@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 import asyncio
-import inspect
+import itertools
 import socket
-from typing import Any, Callable, Coroutine, Dict, Generic, List, Optional, Set, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from pydantic import BaseModel
 from uaproject_backend_schemas.models.schemas.webhook import WebhookStatus
@@ -12,11 +25,23 @@ from uap_backend.core.config import settings
 from uap_backend.cruds.webhooks import WebhookCRUDService
 from uap_backend.logger import get_logger
 
+from .dispatch import (
+    SCOPE_ACTIONS,
+    WILDCARD,
+    CompiledHandler,
+    DispatchEntry,
+    DispatchTable,
+    is_wildcard_scope,
+    scope_matches,
+)
+
 T = TypeVar("T", bound=BaseModel)
 logger = get_logger(__name__)
 
 
 class HandlerInfo(Generic[T]):
+    _order = itertools.count()
+
     def __init__(
         self,
         handler: Callable[[T], Coroutine[Any, Any, Dict[str, Any]]],
@@ -30,11 +55,23 @@ class HandlerInfo(Generic[T]):
         self.bound_instance = None
         self.defined_in_class = class_name
         self.webhook_metadata = webhook_metadata or {}
+        self.order = next(self._order)
+
+    @property
+    def is_dispatchable(self) -> bool:
+        """Plain functions are callable as-is, methods only once bound to an instance"""
+        return self.defined_in_class is None or self.bound_instance is not None
+
+    def compile(self) -> CompiledHandler:
+        return CompiledHandler(self.handler, self.handler_name, self.model, self.order)
 
 
 class WebhookRegistry:
     _instance: Optional["WebhookRegistry"] = None
     _handlers: Dict[str, List[HandlerInfo[Any]]] = {}
+    _handlers_by_class: Dict[str, List[Tuple[str, HandlerInfo[Any]]]] = {}
+    _compiled: Dict[str, Tuple[CompiledHandler, ...]] = {}
+    _dispatch_table: Optional[DispatchTable] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -44,13 +81,7 @@ class WebhookRegistry:
     @classmethod
     def register_handler(cls, event_type: str, validation_model: Optional[Type[T]] = None):
         def decorator(func: Callable[[T], Coroutine[Any, Any, Dict[str, Any]]]):
-            frame = inspect.currentframe().f_back
-            class_name = None
-            while frame:
-                if "self" in frame.f_locals and frame.f_code.co_name == func.__name__:
-                    class_name = frame.f_locals["self"].__class__.__name__
-                    break
-                frame = frame.f_back
+            class_name = cls._owner_class_name(func)
 
             if event_type not in cls._handlers:
                 cls._handlers[event_type] = []
@@ -58,40 +89,83 @@ class WebhookRegistry:
             # Extract webhook metadata from function if available
             webhook_metadata = getattr(func, "_webhook_metadata", {})
 
-            cls._handlers[event_type].append(
-                HandlerInfo(
-                    handler=func,
-                    model=validation_model,
-                    class_name=class_name,
-                    webhook_metadata=webhook_metadata,
-                )
+            handler_info = HandlerInfo(
+                handler=func,
+                model=validation_model,
+                class_name=class_name,
+                webhook_metadata=webhook_metadata,
             )
+            cls._handlers[event_type].append(handler_info)
+            if class_name is not None:
+                cls._handlers_by_class.setdefault(class_name, []).append(
+                    (event_type, handler_info)
+                )
+
+            cls._recompile_scopes({event_type})
             return func
 
         return decorator
 
+    @classmethod
+    def unregister_handler(cls, event_type: str, func: Callable[..., Any]) -> bool:
+        """Remove a handler registered for an event type, returning whether it was found"""
+        handler_infos = cls._handlers.get(event_type, [])
+        removed = [info for info in handler_infos if info.handler == func]
+        if not removed:
+            return False
+
+        remaining = [info for info in handler_infos if info not in removed]
+        if remaining:
+            cls._handlers[event_type] = remaining
+        else:
+            del cls._handlers[event_type]
+        for class_name, class_handlers in list(cls._handlers_by_class.items()):
+            cls._handlers_by_class[class_name] = [
+                (scope, info) for scope, info in class_handlers if info not in removed
+            ]
+
+        cls._recompile_scopes({event_type})
+        return True
+
+    @staticmethod
+    def _owner_class_name(func: Callable[..., Any]) -> Optional[str]:
+        """Name of the class a handler is defined in, None for plain functions"""
+        owner, _, _ = getattr(func, "__qualname__", "").rpartition(".")
+        if not owner or owner.endswith("<locals>"):
+            return None
+        return owner.rpartition(".")[2]
+
     @classmethod
     def bind_handlers(cls, instance):
         instance_class_name = instance.__class__.__name__
-        _, duplicate_handler_names = cls._find_duplicate_handlers(instance_class_name)
+        _, duplicate_handler_names = cls._find_duplicate_handlers(instance)
         cls._log_duplicate_handlers(instance_class_name, duplicate_handler_names)
         bound_handlers = cls._bind_instance_handlers(instance, instance_class_name)
         cls._log_bound_handlers(bound_handlers, instance_class_name)
         if bound_handlers:
-            cls._include_scopes_to_webhook([event_type for event_type, _ in bound_handlers])
+            cls._recompile_scopes({event_type for event_type, _ in bound_handlers})
+            scopes = cls._concrete_scopes(event_type for event_type, _ in bound_handlers)
+            if scopes:
+                cls._include_scopes_to_webhook(scopes)
 
     @classmethod
-    def _find_duplicate_handlers(cls, instance_class_name: str) -> tuple[Set[str], Set[str]]:
+    def _class_handlers(cls, instance) -> List[Tuple[str, HandlerInfo[Any]]]:
+        """Handlers declared on the instance class or any of its bases"""
+        class_handlers = []
+        for klass in type(instance).__mro__:
+            class_handlers.extend(cls._handlers_by_class.get(klass.__name__, ()))
+        return class_handlers
+
+    @classmethod
+    def _find_duplicate_handlers(cls, instance) -> tuple[Set[str], Set[str]]:
         handler_names_seen: Set[str] = set()
         duplicate_handler_names: Set[str] = set()
 
-        for handler_infos in cls._handlers.values():
-            for handler_info in handler_infos:
-                if handler_info.defined_in_class == instance_class_name:
-                    handler_name = handler_info.handler_name
-                    if handler_name in handler_names_seen:
-                        duplicate_handler_names.add(handler_name)
-                    handler_names_seen.add(handler_name)
+        for _, handler_info in cls._class_handlers(instance):
+            handler_name = handler_info.handler_name
+            if handler_name in handler_names_seen:
+                duplicate_handler_names.add(handler_name)
+            handler_names_seen.add(handler_name)
 
         return handler_names_seen, duplicate_handler_names
 
@@ -99,45 +173,102 @@ class WebhookRegistry:
     def _log_duplicate_handlers(cls, instance_class_name: str, duplicate_handler_names: Set[str]):
         if duplicate_handler_names:
             logger.warning(
-                f"Duplicate handler names found in {instance_class_name}: {duplicate_handler_names}"
+                "Duplicate handler names found in %s: %s",
+                instance_class_name,
+                duplicate_handler_names,
             )
 
     @classmethod
     def _bind_instance_handlers(cls, instance, instance_class_name: str) -> List[tuple]:
         bound_handlers = []
 
-        for event_type, handler_infos in cls._handlers.items():
-            for handler_info in handler_infos:
-                if (
-                    handler_info.defined_in_class is None
-                    or handler_info.defined_in_class == instance_class_name
-                ):
-                    handler_name = handler_info.handler_name
-                    bound_handler = getattr(instance, handler_name, None)
-
-                    if bound_handler is None:
-                        logger.warning(
-                            f"Cannot bind handler for {event_type}, method {handler_name} not found in {instance}"
-                        )
-                    else:
-                        if (
-                            handler_info.bound_instance is not None
-                            and handler_info.bound_instance != instance
-                        ):
-                            logger.warning(
-                                f"Handler {handler_name} for {event_type} already bound to {handler_info.bound_instance.__class__.__name__}, "
-                                f"now binding to {instance_class_name}. This might lead to unexpected behavior."
-                            )
-
-                        handler_info.handler = bound_handler
-                        handler_info.bound_instance = instance
-                        handler_info.defined_in_class = instance_class_name
-                        bound_handlers.append((event_type, handler_name))
+        for event_type, handler_info in cls._class_handlers(instance):
+            handler_name = handler_info.handler_name
+            bound_handler = getattr(instance, handler_name, None)
+
+            if bound_handler is None:
+                logger.warning(
+                    "Cannot bind handler for %s, method %s not found in %s",
+                    event_type,
+                    handler_name,
+                    instance,
+                )
+                continue
+
+            if handler_info.bound_instance is not None and handler_info.bound_instance != instance:
+                logger.warning(
+                    "Handler %s for %s already bound to %s, now binding to %s. "
+                    "This might lead to unexpected behavior.",
+                    handler_name,
+                    event_type,
+                    handler_info.bound_instance.__class__.__name__,
+                    instance_class_name,
+                )
+
+            handler_info.handler = bound_handler
+            handler_info.bound_instance = instance
+            bound_handlers.append((event_type, handler_name))
 
         return bound_handlers
 
     @classmethod
-    def _include_scopes_to_webhook(cls, scope: str):
+    def _recompile_scopes(cls, scopes: Set[str]):
+        """Recompile only the affected scopes and drop the frozen table"""
+        for scope in scopes:
+            if scope not in cls._handlers:
+                cls._compiled.pop(scope, None)
+                continue
+            cls._compiled[scope] = tuple(
+                handler_info.compile()
+                for handler_info in cls._handlers[scope]
+                if handler_info.is_dispatchable
+            )
+        cls._dispatch_table = None
+
+    @classmethod
+    def freeze(cls) -> DispatchTable:
+        """Build the immutable dispatch table from the compiled scopes"""
+        if cls._dispatch_table is None:
+            cls._dispatch_table = DispatchTable(cls._compiled)
+        return cls._dispatch_table
+
+    @classmethod
+    def resolve(cls, event_type: str) -> DispatchEntry:
+        """Get the precompiled handlers for an event type, wildcards included"""
+        return (cls._dispatch_table or cls.freeze()).resolve(event_type)
+
+    @classmethod
+    def _concrete_scopes(cls, event_types: Iterable[str]) -> List[str]:
+        """Expand wildcard scopes into the concrete scopes the API can deliver
+
+        ``user.*`` becomes one scope per action and ``*.delete`` one scope per model
+        that has a concrete handler. Patterns matching no known model are skipped.
+        """
+        models = list(
+            dict.fromkeys(
+                scope.split(".")[0] for scope in cls._handlers if not is_wildcard_scope(scope)
+            )
+        )
+        scopes = []
+        for event_type in event_types:
+            if not is_wildcard_scope(event_type):
+                scopes.append(event_type)
+                continue
+
+            model_part = event_type.split(".")[0]
+            candidates = [
+                f"{model}.{action}"
+                for model in (models if model_part == WILDCARD else [model_part])
+                for action in SCOPE_ACTIONS
+            ]
+            expanded = [scope for scope in candidates if scope_matches(event_type, scope)]
+            if not expanded:
+                logger.warning("Wildcard scope %s matches no known model, skipping it", event_type)
+            scopes.extend(expanded)
+        return list(dict.fromkeys(scopes))
+
+    @classmethod
+    def _include_scopes_to_webhook(cls, scope: List[str]):
         loop = asyncio.get_running_loop()
         if loop is not None:
             loop.create_task(cls._ainclude_scopes_to_webhook(scope))
@@ -162,7 +293,7 @@ class WebhookRegistry:
     @classmethod
     def _log_bound_handlers(cls, bound_handlers: List[tuple], instance_class_name: str):
         for event_type, handler_name in bound_handlers:
-            logger.info(f"{event_type} -> {instance_class_name}.{handler_name}")
+            logger.info("%s -> %s.%s", event_type, instance_class_name, handler_name)
 
     @classmethod
     def get_handlers(cls, event_type: str) -> List[HandlerInfo[Any]]:
@@ -178,6 +309,7 @@ class WebhookRegistry:
         endpoint_url: str,
         webhook_name: Optional[str] = None,
         auth_config: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
     ) -> bool:
         """Automatically register webhook based on discovered handlers"""
         if not cls._handlers:
@@ -185,8 +317,8 @@ class WebhookRegistry:
             return False
 
         # Extract event types from registered handlers
-        event_types = list(cls._handlers.keys())
-        logger.info(f"Auto-registering webhook for events: {event_types}")
+        event_types = cls._concrete_scopes(cls._handlers)
+        logger.info("Auto-registering webhook for events: %s", event_types)
 
         # Build trigger configuration from handlers
         triggers = cls._build_triggers_from_handlers()
@@ -206,25 +338,23 @@ class WebhookRegistry:
                 name=webhook_name,
                 triggers=triggers,
                 auth_config=auth_config,
+                batch_size=batch_size if batch_size is not None else settings.WEBHOOK_BATCH_SIZE,
             )
 
-            logger.info(f"Webhook auto-registered successfully: {webhook.get('id')}")
+            logger.info("Webhook auto-registered successfully: %s", webhook.get("id"))
             return True
 
         except Exception as e:
-            logger.error(f"Failed to auto-register webhook: {e}")
+            logger.error("Failed to auto-register webhook: %s", e)
             return False
 
     @classmethod
     def _build_triggers_from_handlers(cls) -> List[Dict[str, Any]]:
         """Build webhook triggers from registered handlers"""
         triggers = []
+        seen: Set[str] = set()
 
-        for event_type, handler_infos in cls._handlers.items():
-            # Extract model name from event type (e.g., "user.create" -> "User")
-            model_name = cls._extract_model_name(event_type)
-            webhook_event = cls._map_to_webhook_event(event_type)
-
+        for pattern, handler_infos in cls._handlers.items():
             # Check if any handler has specific webhook metadata
             handler_metadata = {}
             for handler_info in handler_infos:
@@ -232,26 +362,39 @@ class WebhookRegistry:
                     handler_metadata.update(handler_info.webhook_metadata)
                     break
 
-            trigger = {
-                "model_name": model_name,
-                "events": [webhook_event],
-                "include_all_fields": handler_metadata.get("include_all_fields", True),
-                "include_metadata": handler_metadata.get("include_metadata", True),
-                "respect_permissions": handler_metadata.get("respect_permissions", True),
-            }
-
-            # Add conditions if specified
-            if handler_metadata.get("conditions"):
-                trigger["conditions"] = handler_metadata["conditions"]
-
-            # Add field mapping if specified
-            if handler_metadata.get("field_mapping"):
-                trigger["field_mapping"] = handler_metadata["field_mapping"]
-
-            triggers.append(trigger)
+            for event_type in cls._concrete_scopes([pattern]):
+                if event_type in seen:
+                    continue
+                seen.add(event_type)
+                triggers.append(cls._build_trigger(event_type, handler_metadata))
 
         return triggers
 
+    @classmethod
+    def _build_trigger(cls, event_type: str, handler_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Webhook trigger subscribing to one concrete event type"""
+        # Extract model name from event type (e.g., "user.create" -> "User")
+        model_name = cls._extract_model_name(event_type)
+        webhook_event = cls._map_to_webhook_event(event_type)
+
+        trigger = {
+            "model_name": model_name,
+            "events": [webhook_event],
+            "include_all_fields": handler_metadata.get("include_all_fields", True),
+            "include_metadata": handler_metadata.get("include_metadata", True),
+            "respect_permissions": handler_metadata.get("respect_permissions", True),
+        }
+
+        # Add conditions if specified
+        if handler_metadata.get("conditions"):
+            trigger["conditions"] = handler_metadata["conditions"]
+
+        # Add field mapping if specified
+        if handler_metadata.get("field_mapping"):
+            trigger["field_mapping"] = handler_metadata["field_mapping"]
+
+        return trigger
+
     @classmethod
     def _extract_model_name(cls, event_type: str) -> str:
         """Extract model name from event type"""
@@ -0,0 +1,65 @@
+"""Cached payload validation for webhook events"""
+
+from functools import lru_cache
+from typing import Any, Dict, Generic, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from uap_backend.logger import get_logger
+
+from .dispatch import DispatchEntry
+
+M = TypeVar("M")
+logger = get_logger(__name__)
+
+
+class PayloadDiff(BaseModel, Generic[M]):
+    """Validated before/after payload of an update event"""
+
+    before: Optional[M] = None
+    after: Optional[M] = None
+
+
+class _Event(BaseModel, Generic[M]):
+    payload: M
+
+
+@lru_cache(maxsize=None)
+def event_adapter(model: Type[Any], is_diff: bool) -> TypeAdapter:
+    """Get the compiled adapter validating a whole event envelope against a model"""
+    payload_type = PayloadDiff[model] if is_diff else model
+    return TypeAdapter(_Event[payload_type])
+
+
+def is_diff_payload(payload: Any) -> bool:
+    return isinstance(payload, dict) and "before" in payload and "after" in payload
+
+
+def validate_event(
+    entry: DispatchEntry, event: Dict[str, Any], raw: Optional[bytes] = None
+) -> Tuple[Dict[Type[Any], Any], Dict[Type[Any], ValidationError]]:
+    """Validate an event once per model declared by the scope handlers
+
+    Validation runs straight from the raw JSON bytes when they are available, and
+    every handler that declared the same model shares the validated object.
+    """
+    validated: Dict[Type[Any], Any] = {}
+    errors: Dict[Type[Any], ValidationError] = {}
+    if not entry.models:
+        return validated, errors
+
+    is_diff = is_diff_payload(event.get("payload"))
+    for model in entry.models:
+        adapter = event_adapter(model, is_diff)
+        try:
+            if raw is not None:
+                validated[model] = adapter.validate_json(raw).payload
+            else:
+                validated[model] = adapter.validate_python(event).payload
+        except ValidationError as e:
+            logger.warning(
+                "Payload for %s failed %s validation: %s", entry.scope, model.__name__, e
+            )
+            errors[model] = e
+
+    return validated, errors